@@ -0,0 +1,317 @@
+"""
+Run from top-level folder as module:
+
+$ python -m benchmarks (-h for options)
+
+Generates synthetic workbooks (10k, 100k and 1M data rows by default),
+then times every public Xlsx method, plus loading and saving, and
+records the peak memory allocated during each call with tracemalloc.
+Results are written as JSON for comparing releases.
+
+Requirements:
+python 3.6+
+
+openpyxl==3.0.6
+numpy (optional, for to_columns/from_columns)
+
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import sys
+import tempfile
+import time
+import traceback
+import tracemalloc
+from pathlib import Path
+
+import openpyxl
+
+import xlclass
+from xlclass import Xlsx
+
+SIZES = (10_000, 100_000, 1_000_000)
+
+HEADERS = ["Letters", "Strings", "Integers", "Dates", "Currency", "Names", "Prices"]
+COLORS = ["Red", "Blue", "Purple", "Green", "Yellow"]
+START_DATE = datetime.datetime(2020, 1, 1)
+
+
+def generate_rows(rows: int):
+    """Yields (key, row_dict) pairs of synthetic data in the layout of
+    tests/_test.xlsx, plus 'Last, First' names and dirty price strings.
+    """
+    for i in range(rows):
+        yield f"{i:07d}", {
+            "Letters": f"K{i:07d}",
+            "Strings": COLORS[i % len(COLORS)],
+            "Integers": i,
+            "Dates": START_DATE + datetime.timedelta(days=i % 3650),
+            "Currency": (i % 10_000) * 1.25,
+            "Names": f"Last{i % 100}, First{i % 37}",
+            "Prices": f"${i % 5000:,}.{i % 100:02d} USD",
+        }
+
+
+class Context:
+    """Files and objects shared by the benchmark cases of one size."""
+
+    def __init__(self, rows: int, folder: Path):
+        self.rows = rows
+        self.folder = folder
+        self.path = folder / f"bench_{rows}.xlsx"
+        self.csv = folder / f"bench_{rows}.csv"
+        self.out = folder / f"bench_{rows}_out.xlsx"
+        # Key of a row in the middle of the sheet
+        self.key = f"K{rows // 2:07d}"
+        self.xl = None
+        self.arrays = None
+
+
+def _consume(iterable) -> int:
+    count = 0
+    for _item in iterable:
+        count += 1
+    return count
+
+
+def _load(ctx):
+    ctx.xl = Xlsx(ctx.path)
+
+
+def _load_read_only(ctx):
+    xl = Xlsx(ctx.path, mode="r")
+    _consume(xl.iter_rows_chunked())
+    xl.close()
+
+
+def _aopen(ctx):
+    asyncio.run(Xlsx.aopen(ctx.path, mode="r")).close()
+
+
+def _create_streaming(ctx):
+    xl = Xlsx.create_streaming(ctx.path, "Bench")
+    xl.write_dictionary_to_sheet(generate_rows(ctx.rows), headers=HEADERS, bold=True)
+    xl.save()
+
+
+def _to_columns(ctx):
+    ctx.arrays = ctx.xl.to_columns(["C", "E"], startrow=2)
+
+
+def _need_arrays(ctx):
+    if ctx.arrays is None:
+        _to_columns(ctx)
+
+
+def _need_csv(ctx):
+    if not ctx.csv.exists():
+        ctx.xl.to_csv(ctx.csv)
+
+
+def _need_index(ctx):
+    if "A" not in ctx.xl._indexes:
+        ctx.xl.build_index("A")
+
+
+def _asave(ctx):
+    async def save():
+        await ctx.xl.asave(ctx.out, snapshot=True)
+
+    asyncio.run(save())
+
+
+# (name, function(ctx)) in the order they run. Cases share ctx.xl, so
+# the methods that change or remove cells run after the ones that read
+# them, and the row removals run last.
+CASES = [
+    ("create_streaming", _create_streaming),
+    ("load", _load),
+    ("load_read_only", _load_read_only),
+    ("aopen", _aopen),
+    ("generate_headers_attribute", lambda ctx: ctx.xl.generate_headers_attribute()),
+    ("generate_list", lambda ctx: ctx.xl.generate_list(startrow=2)),
+    ("generate_dictionary",
+     lambda ctx: ctx.xl.generate_dictionary(["B", "C", "E"], keycol="A")),
+    ("iter_records", lambda ctx: _consume(ctx.xl.iter_records(keycol="A"))),
+    ("iter_rows_chunked", lambda ctx: _consume(ctx.xl.iter_rows_chunked())),
+    ("get_matching_value", lambda ctx: ctx.xl.get_matching_value("A", ctx.key, "C")),
+    ("search_matching_value",
+     lambda ctx: ctx.xl.search_matching_value("Integers", ctx.key)),
+    ("build_index", lambda ctx: ctx.xl.build_index("A")),
+    ("get_matching_value (indexed)",
+     lambda ctx: ctx.xl.get_matching_value("A", ctx.key, "C")),
+    ("set_matching_value",
+     lambda ctx: ctx.xl.set_matching_value("A", ctx.key, "B", "Orange")),
+    ("drop_index", lambda ctx: ctx.xl.drop_index()),
+    ("to_csv", lambda ctx: ctx.xl.to_csv(ctx.csv)),
+    ("to_columns", _to_columns),
+    ("from_columns", lambda ctx: Xlsx.from_columns(ctx.arrays)),
+    ("copy_sheet_data",
+     lambda ctx: Xlsx().copy_sheet_data(ctx.xl, {"A": "A", "C": "B", "E": "C"})),
+    ("copy_sheet_data_by_headers",
+     lambda ctx: Xlsx().copy_sheet_data_by_headers(
+         ctx.xl, ctx.xl.headers, ["Letters", "Integers"])),
+    ("copy_csv_data", lambda ctx: Xlsx().copy_csv_data(ctx.csv, infer_types=True)),
+    ("write_dictionary_to_sheet",
+     lambda ctx: Xlsx().write_dictionary_to_sheet(dict(generate_rows(ctx.rows)))),
+    ("name_headers", lambda ctx: ctx.xl.name_headers({"H": "Extra"}, bold=True)),
+    ("set_cell_size", lambda ctx: ctx.xl.set_cell_size({"A": 12, 1: 20})),
+    ("verify_length", lambda ctx: ctx.xl.verify_length("A", 8, "yellow", startrow=2)),
+    ("verify_length (conditional)",
+     lambda ctx: ctx.xl.verify_length("A", 8, "yellow", startrow=2, conditional=True)),
+    ("find_and_highlight_rows",
+     lambda ctx: ctx.xl.find_and_highlight_rows("B", "Red", startrow=2)),
+    ("highlight_rows", lambda ctx: ctx.xl.highlight_rows(2, alternate=True)),
+    ("set_bold_rows", lambda ctx: ctx.xl.set_bold_rows(1, 2)),
+    ("set_sheet_font_style", lambda ctx: ctx.xl.set_sheet_font_style()),
+    ("add_cell_borders", lambda ctx: ctx.xl.add_cell_borders()),
+    ("apply_styles", lambda ctx: ctx.xl.apply_styles(2, fill="gray", border="thin")),
+    ("find_replace",
+     lambda ctx: ctx.xl.find_replace("B", {"Blue": "Navy", "Green": "Lime"})),
+    ("move_values", lambda ctx: ctx.xl.move_values("B", "H", ["Navy", "Lime"], 2)),
+    ("reverse_text", lambda ctx: ctx.xl.reverse_text("F", startrow=2)),
+    ("remove_non_numbers", lambda ctx: ctx.xl.remove_non_numbers("G", startrow=2)),
+    ("clean",
+     lambda ctx: ctx.xl.clean({"A": "alnum", "F": ["whitespace", "strip:."]}, 2)),
+    ("number_type_fix", lambda ctx: ctx.xl.number_type_fix("C", "f", startrow=2)),
+    ("coerce",
+     lambda ctx: ctx.xl.coerce({"C": int, "E": float, "D": "date"}, startrow=2)),
+    ("format_date", lambda ctx: ctx.xl.format_date("D", startrow=2)),
+    ("format_currency", lambda ctx: ctx.xl.format_currency("E", startrow=2)),
+    ("format_currency (by_column)",
+     lambda ctx: ctx.xl.format_currency("E", startrow=2, by_column=True)),
+    ("set_number_format", lambda ctx: ctx.xl.set_number_format("C", "#,##0", 2)),
+    ("transform",
+     lambda ctx: ctx.xl.transform()
+     .find_replace("B", {"Navy": "Blue"})
+     .reverse_text("F", startrow=2)
+     .format_currency("E", startrow=2)
+     .run()),
+    ("sort_rows",
+     lambda ctx: ctx.xl.sort_rows([("E", "numeric", "desc"), "A"], startrow=2)),
+    ("sort_and_replace", lambda ctx: ctx.xl.sort_and_replace("A", startrow=2)),
+    ("save", lambda ctx: ctx.xl.save(ctx.out)),
+    ("asave", _asave),
+    ("remove_rows", lambda ctx: ctx.xl.remove_rows(lambda row: row[1] == "Red", 2)),
+    ("find_remove_row", lambda ctx: ctx.xl.find_remove_row("B", "Purple", 2)),
+    ("close", lambda ctx: ctx.xl.close()),
+]
+
+# {case name: function(ctx)} run untimed before a case, to make the input
+# it would otherwise take from an earlier case when that one didn't run
+SETUP = {
+    "get_matching_value (indexed)": _need_index,
+    "from_columns": _need_arrays,
+    "copy_csv_data": _need_csv,
+}
+
+# Public methods that don't process sheet data, so have no case
+NOT_BENCHMARKED = {"stats"}
+
+
+def run_case(name: str, function, ctx: Context, memory: bool) -> dict:
+    """Runs one benchmark case (after its untimed setup, if any) and
+    returns its result record.
+    """
+    error = None
+    setup = SETUP.get(name)
+    if setup is not None:
+        setup(ctx)
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        function(ctx)
+    except Exception:
+        error = traceback.format_exc(limit=2)
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "rows": ctx.rows,
+        "method": name,
+        "seconds": round(seconds, 6),
+        "peak_bytes": peak,
+        "error": error,
+    }
+
+
+def untimed_methods() -> list:
+    """Returns the public Xlsx methods without a benchmark case (other
+    than NOT_BENCHMARKED).
+    """
+    covered = {name.split(" ")[0] for name, _function in CASES}
+    public = {
+        name
+        for name in vars(Xlsx)
+        if not name.startswith("_") and callable(getattr(Xlsx, name))
+    }
+
+    return sorted(public - covered - NOT_BENCHMARKED)
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Time and memory-profile the Xlsx methods on synthetic "
+        "workbooks and write the results as JSON.",
+    )
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=list(SIZES),
+        help="Data rows of each synthetic workbook. (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--methods", nargs="+", default=None,
+        help="Only run these cases (load and create_streaming always run).",
+    )
+    parser.add_argument(
+        "--no-memory", dest="memory", action="store_false",
+        help="Skip tracemalloc, which slows the timed calls down.",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=Path("benchmark_results.json"),
+        help="JSON file to write. (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    missing = untimed_methods()
+    if missing:
+        print(f"No benchmark case for: {', '.join(missing)}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for rows in args.rows:
+            ctx = Context(rows, Path(folder))
+            for name, function in CASES:
+                if args.methods and name not in args.methods and name not in (
+                    "create_streaming",
+                    "load",
+                ):
+                    continue
+                result = run_case(name, function, ctx, args.memory)
+                results.append(result)
+                status = "FAILED" if result["error"] else f"{result['seconds']:.3f}s"
+                print(f"{rows:>9} rows  {name:<30} {status}", flush=True)
+
+    report = {
+        "xlclass": xlclass.__version__,
+        "openpyxl": openpyxl.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "tracemalloc": args.memory,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
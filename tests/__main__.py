@@ -7,17 +7,20 @@ Requirements:
 python 3.6+
 
 openpyxl==3.0.6
-pandas==1.2.2
 xlrd==2.0.1
 
 """
 
+import asyncio
 import datetime
+import io
+import subprocess
+import sys
 import unittest
 from pathlib import Path
 
 import openpyxl
-from xlclass import Xlsx
+from xlclass import Xlsx, batch
 from xlclass.utils import (generate_columns_dictionary,
                            _generate_source_target_columns_dictionary)
 
@@ -26,6 +29,11 @@ test_xlsx = tests_path / "_test.xlsx"
 test_csv = tests_path / "_test.csv"
 test_xls = tests_path / "_test.xls"
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class TestXlsx(unittest.TestCase):
 
@@ -55,6 +63,20 @@ class TestXlsx(unittest.TestCase):
         self.assertEqual(self.xl.ws['E20'].value, 433.0498)
         self.iterate_integers()
 
+    def test_xls_conversion_all_sheets(self):
+        """Test xls -> xlsx conversion of every sheet (no sheetname) and
+        of a list of sheet names, and verify numbers and dates are kept
+        as native values.
+        """
+        self.xl = Xlsx(test_xls)
+        self.assertEqual(self.xl.wb.sheetnames, ['Sheet1'])
+        self.assertEqual(self.xl.ws['A1'].value, 'Letters')
+        self.assertIsInstance(self.xl.ws['C2'].value, int)
+        self.assertEqual(self.xl.ws['D2'].value, datetime.datetime(2020, 5, 20))
+        self.assertEqual(self.xl.ws.max_row, 20)
+        self.xl = Xlsx(test_xls, ['Sheet1'])
+        self.assertEqual(self.xl.ws['E20'].value, 433.0498)
+
     def test_copy_sheet_data(self):
         """Create a temporary blank workbook, copy selected data to the 
         workbook, and test cell data returns as expected.
@@ -65,6 +87,35 @@ class TestXlsx(unittest.TestCase):
         self.assertEqual(self.xl_temp.ws['C20'].value, 1900)
         self.iterate_integers()
 
+    def test_copy_sheet_data_options(self):
+        """Copy filtered rows with their styles, from a default and a
+        read-only source, and test values, compacted rows and styles.
+        """
+        self.xl.ws['B2'].font = openpyxl.styles.Font(bold=True)
+        self.xl.ws['C2'].number_format = '0.000'
+        self.xl_temp = Xlsx()
+        self.xl_temp.copy_sheet_data(
+            self.xl, {'B': 'A', 'C': 'B'}, rows=lambda row: row[0] in 'ACX',
+            styles=True)
+        self.assertEqual(self.xl_temp.ws['A1'].value, 'Red')
+        self.assertEqual(self.xl_temp.ws['A2'].value, 'Purple')
+        self.assertTrue(self.xl_temp.ws['A1'].font.b)
+        self.assertFalse(self.xl_temp.ws['A2'].font.b)
+        self.assertEqual(self.xl_temp.ws['B1'].number_format, '0.000')
+
+        self.xl.ws['C3'].font = openpyxl.styles.Font(bold=True)
+        self.xl.save(tests_path / "_test_copy.xlsx")
+        xl_r = Xlsx(tests_path / "_test_copy.xlsx", mode='r')
+        try:
+            xl_copy = Xlsx()
+            xl_copy.copy_sheet_data(xl_r, {'C': 'A'}, rows={1, 3}, styles=True)
+        finally:
+            xl_r.close()
+            (tests_path / "_test_copy.xlsx").unlink()
+        self.assertEqual(xl_copy.ws['A2'].value, 200)
+        self.assertTrue(xl_copy.ws['A2'].font.b)
+        self.assertIsNone(xl_copy.ws['A3'].value)
+
     def test_copy_csv_data(self):
         """Delete all data from main test workbook, open test csv file and
         copy all data to main workbook, and test cell data returns as 
@@ -77,6 +128,55 @@ class TestXlsx(unittest.TestCase):
         self.assertEqual(self.xl.ws['A11'].value, 'Georgia')
         self.assertEqual(self.xl.ws['B11'].value, '7')
 
+    def test_copy_csv_data_options(self):
+        """Copy csv data with type inference, a column subset and a row
+        limit, and a semicolon delimited file with a sniffed dialect.
+        """
+        self.xl.ws.delete_rows(1, self.xl.ws.max_row)
+        self.xl.copy_csv_data(
+            test_csv, columns=['B', 'A'], limit=6, infer_types=True,
+            chunk_size=2)
+        self.assertEqual(self.xl.ws['A1'].value, 'Number')
+        self.assertEqual(self.xl.ws['B1'].value, 'State')
+        self.assertEqual(self.xl.ws['A2'].value, 1988)
+        self.assertEqual(self.xl.ws['B2'].value, 'California')
+        self.assertEqual(self.xl.ws.max_row, 6)
+
+        sniffed_csv = tests_path / "_test_sniffed.csv"
+        sniffed_csv.write_text(
+            "Name;Date;Price\nAnn;01/02/2021;1.5\nBob;;x\n", encoding='utf-8')
+        try:
+            xl = Xlsx()
+            xl.copy_csv_data(
+                sniffed_csv, encoding='utf-8', dialect='sniff',
+                infer_types=True, chunk_size=1)
+        finally:
+            sniffed_csv.unlink()
+        self.assertEqual(xl.ws['B2'].value, datetime.datetime(2021, 1, 2))
+        self.assertIsNone(xl.ws['B3'].value)
+        # Inferred from the first chunk, so unconvertible values are kept
+        self.assertEqual(xl.ws['C2'].value, 1.5)
+        self.assertEqual(xl.ws['C3'].value, 'x')
+
+    def test_copy_csv_data_inferred_fallback(self):
+        """Verifies that a column inferred from the first chunk is copied
+        as str from its first unconvertible value on, and that numbers
+        with '_' aren't converted.
+        """
+        fallback_csv = tests_path / "_test_fallback.csv"
+        fallback_csv.write_text(
+            "Count,Code\n1,5\n2,1_000\nn/a,7\n4,8\n", encoding='utf-8')
+        try:
+            xl = Xlsx()
+            xl.copy_csv_data(
+                fallback_csv, encoding='utf-8', infer_types=True, chunk_size=2)
+        finally:
+            fallback_csv.unlink()
+        self.assertEqual([xl.ws[f'A{row}'].value for row in range(2, 6)],
+                         [1, 2, 'n/a', '4'])
+        self.assertEqual([xl.ws[f'B{row}'].value for row in range(2, 6)],
+                         ['5', '1_000', '7', '8'])
+
     def test_sort_and_replace(self):
         """Test sort and replace using data in column B as sorting keys, 
         and test cell data returns as expected.
@@ -87,6 +187,44 @@ class TestXlsx(unittest.TestCase):
         self.assertEqual(self.xl.ws['E6'].value, 25.5)
         self.assertEqual(self.xl.ws['C20'].value, 500)
 
+    def test_sort_and_replace_empty_cells(self):
+        """Sorts with an empty key cell and verifies it keeps its place
+        among the text values, keyed as 'none'.
+        """
+        self.xl.ws['B3'] = None
+        self.xl.sort_and_replace('B', startrow=2)
+        self.assertEqual(self.xl.ws['B9'].value, 'NES')
+        self.assertIsNone(self.xl.ws['B10'].value)
+        self.assertEqual(self.xl.ws['B11'].value, 'Orange')
+
+    def test_sort_rows(self):
+        """Sorts on typed keys in place, in chunks, and to a target object,
+        and verifies the row order and that styles move with their rows.
+        """
+        self.xl.ws['B4'].font = openpyxl.styles.Font(bold=True)
+        self.xl.ws['E3'] = None
+        self.xl.sort_rows([('E', 'numeric', 'desc')], startrow=2)
+        self.assertEqual(self.xl.ws['E2'].value, 494949)
+        self.assertEqual(self.xl.ws['E3'].value, 48398.58)
+        self.assertEqual(self.xl.ws['A20'].value, 'B')
+        self.assertTrue(self.xl.ws['B18'].font.b)
+        self.xl.sort_rows([('D', 'date')], startrow=2, chunk_size=3)
+        self.assertEqual(self.xl.generate_list(2, 2)[0][0], 'B')
+        self.assertEqual(self.xl.ws['A20'].value, 'A')
+        self.assertEqual(self.xl.ws['A1'].value, 'Letters')
+
+        xl_ro = Xlsx(test_xlsx, mode="r")
+        xl_temp = Xlsx()
+        xl_ro.sort_rows(
+            [('B', 'text', 'desc'), 'A'], startrow=2, stoprow=10,
+            chunk_size=4, target=xl_temp)
+        xl_ro.close()
+        self.assertEqual(xl_temp.ws['B1'].value, 'Strings')
+        self.assertEqual(xl_temp.ws['B2'].value, 'Yellow')
+        self.assertEqual(xl_temp.ws['B10'].value, 'Blue')
+        self.assertEqual(xl_temp.ws['B11'].value, 'Circle, Square')
+        self.assertEqual(xl_temp.ws.max_row, 20)
+
     def test_name_headers(self):
         """Test name headers, and test cell data returns as expected.
         """
@@ -104,6 +242,33 @@ class TestXlsx(unittest.TestCase):
         self.assertEqual(self.xl.get_matching_value('a', 'M', 'B'), 'SNES')
         self.assertEqual(self.xl.get_matching_value('B', 'DS', 'E'), 433.0498)
 
+    def test_build_index(self):
+        """Builds exact and prefix indexes and verifies lookups use them,
+        that writing to the column drops the index, and that indexed
+        lookups work in read-only mode.
+        """
+        self.xl.build_index('B')
+        self.assertEqual(self.xl.get_matching_value('B', 'DS', 'E'), 433.0498)
+        self.assertFalse(self.xl.get_matching_value('B', 'NE', 'A'))
+        self.xl.set_matching_value('B', 'Wii', 'C', 'TEST')
+        self.assertEqual(self.xl.ws['C17'].value, 'TEST')
+        self.assertEqual(self.xl.ws['C18'].value, 1700)
+        self.xl.build_index('b', mode='substring-prefix')
+        self.assertEqual(self.xl.get_matching_value('B', 'Game', 'C'), 1400)
+        self.assertEqual(
+            self.xl.get_matching_value('B', 'Game', 'C', startrow=16), 1500)
+        self.xl.find_replace('B', {'Game': 'Play'})
+        self.assertNotIn('B', self.xl._indexes)
+        self.assertEqual(self.xl.get_matching_value('B', 'cube', 'A'), 'O')
+        xl_ro = Xlsx(test_xlsx, mode="r").build_index('A')
+        self.assertEqual(xl_ro.get_matching_value('A', 'M', 'B'), 'SNES')
+        xl_ro.build_index('A', columns=['E'])
+        self.assertEqual(len(xl_ro._indexes['A'].row_values[14]), 1)
+        self.assertEqual(xl_ro.get_matching_value('A', 'M', 'B'), 'SNES')
+        self.assertEqual(
+            xl_ro.get_matching_value('A', 'M', 'E'), self.xl.ws['E14'].value)
+        xl_ro.close()
+
     def test_set_matching_value(self):
         """Uses the set_matching_value method and then checks that the 
         data from the cell returns as expected.
@@ -120,6 +285,35 @@ class TestXlsx(unittest.TestCase):
         self.assertFalse(self.xl.ws['E19'].value == 29.5)
         self.assertEqual(self.xl.ws['E19'].value, 433.0498)
 
+    def test_remove_rows_dimension_below_data(self):
+        """Removes rows with a resized row below the last data row, and
+        verifies the dimension moves up by every deleted row.
+        """
+        self.xl.ws.row_dimensions[50].height = 20
+        self.xl.find_remove_row('B', 'Red', 2)
+        deleted = 20 - self.xl.ws.max_row
+        self.assertGreater(deleted, 0)
+        self.assertEqual(self.xl.ws.row_dimensions[50 - deleted].height, 20)
+        self.assertNotIn(50, self.xl.ws.row_dimensions)
+
+    def test_remove_rows(self):
+        """Removes rows by row number and by function, and verifies the
+        remaining rows moved up with their values, styles and heights.
+        """
+        self.xl.ws['B5'].font = openpyxl.styles.Font(bold=True)
+        self.xl.ws.row_dimensions[5].height = 30
+        self.xl.remove_rows({2, 4, 19})
+        self.assertEqual(self.xl.ws['B2'].value, 'Blue')
+        self.assertEqual(self.xl.ws['B3'].value, 'Green')
+        self.assertTrue(self.xl.ws['B3'].font.b)
+        self.assertEqual(self.xl.ws.row_dimensions[3].height, 30)
+        self.assertEqual(self.xl.ws['B17'].value, 'DS')
+        self.assertEqual(self.xl.ws.max_row, 17)
+        self.xl.remove_rows(lambda values: values[2] > 1000, startrow=2)
+        self.assertEqual(self.xl.ws.max_row, 9)
+        self.xl.ws.append(['Z'])
+        self.assertEqual(self.xl.ws['A10'].value, 'Z')
+
     def test_find_replace(self):
         """Find and replace the value 'NES' with 'TEST', and then verify
         the cell data returns the new value as expected.
@@ -127,6 +321,26 @@ class TestXlsx(unittest.TestCase):
         self.xl.find_replace('B', {'NES': 'TEST'}, ('AB', 'CD'), startrow=2)
         self.assertEqual(self.xl.ws['B13'].value, 'TEST')
 
+    def test_find_replace_options(self):
+        """Tests find_replace and move_values with the ignore_case and
+        whole_word options, and that finds are replaced in a single pass.
+        """
+        xl = Xlsx()
+        for value in ('RED red', 'redder Red', 'Blue', 'a-b', 'Skip me'):
+            xl.ws.append([value])
+        xl.find_replace('A', {'red': 'Rojo', 'Blue': 'red', 'me': 'you'},
+                        skip=['SKIP ME'], ignore_case=True, whole_word=True)
+        self.assertEqual([row[0].value for row in xl.ws.iter_rows()],
+                         ['Rojo Rojo', 'redder Rojo', 'red', 'a-b', 'Skip me'])
+        xl.find_replace('A', {'a': 'b', 'b': 'c'}, startrow=4)
+        self.assertEqual(xl.ws['A4'].value, 'b-c')
+        xl.move_values('A', 'B', ['ROJO', 'red'], ignore_case=True)
+        self.assertEqual(xl.ws['B1'].value, 'ROJO')
+        self.assertEqual(xl.ws['A1'].value, ' ')
+        self.assertEqual(xl.ws['B3'].value, 'red')
+        xl.move_values('A', 'C', ['red'], whole_word=True)
+        self.assertIsNone(xl.ws['C2'].value)
+
     def test_move_values(self):
         """Test move_values on pair of columns using a tuple of strings to
         look for, then verifies the cell data returns from the target
@@ -143,6 +357,30 @@ class TestXlsx(unittest.TestCase):
         self.xl.verify_length('E', 5,
                               'green', skip=['test1', 'test2'], stoprow=8)
 
+    def test_verify_length_skip_case(self):
+        """Verifies uppercase skip values are skipped in any case, both
+        when filling cells and in the conditional formatting rule.
+        """
+        self.xl.verify_length('B', 3, 'red', skip=['CYAN', 'Blue'], startrow=2)
+        self.assertIsNone(self.xl.ws['B8'].fill.fill_type)
+        self.assertIsNone(self.xl.ws['B3'].fill.fill_type)
+        self.assertEqual(self.xl.ws['B4'].fill.fill_type, 'solid')
+        self.xl.verify_length('A', 1, 'red', skip=['Cyan'], conditional=True)
+        rule = next(iter(self.xl.ws.conditional_formatting)).rules[0]
+        self.assertIn('LOWER(A1)<>"cyan"', rule.formula[0])
+
+    def test_verify_length_zero(self):
+        """Verifies a cell holding 0 isn't highlighted, both when filling
+        cells and by the conditional formatting rule.
+        """
+        self.xl.ws['C2'] = 0
+        self.xl.verify_length('C', 2, 'red', startrow=2)
+        self.assertIsNone(self.xl.ws['C2'].fill.fill_type)
+        self.assertEqual(self.xl.ws['C3'].fill.fill_type, 'solid')
+        self.xl.verify_length('C', 2, 'red', startrow=2, conditional=True)
+        rule = next(iter(self.xl.ws.conditional_formatting)).rules[0]
+        self.assertEqual(rule.formula[0], 'AND(LEN(C2)>0,C2<>0,LEN(C2)<>2)')
+
     def test_find_and_highlight_rows(self):
         """Test that find_and_highlight_rows runs on a specified column. 
         Currently no assert methods.
@@ -152,6 +390,30 @@ class TestXlsx(unittest.TestCase):
         # TODO self.xl.highlight_rows('c', 300, 'green', startrow=2)
         self.xl.find_and_highlight_rows('d', '05/12/20', 'orange', startrow=2)
 
+    def test_conditional_highlighting(self):
+        """Highlights with conditional formatting rules and verifies the
+        rule ranges and formulas, that cells weren't filled, and that the
+        rules are saved.
+        """
+        self.xl.highlight_rows(startrow=2, alternate=True, conditional=True)
+        self.xl.find_and_highlight_rows('B', 'wii*', 'yellow', startrow=2,
+                                        conditional=True)
+        self.xl.verify_length('B', 4, 'red', skip=['cyan'], startrow=2,
+                              conditional=True)
+        rules = {cf.sqref.ranges[0].coord: [rule.formula[0] for rule in cf.rules]
+                 for cf in self.xl.ws.conditional_formatting}
+        self.assertEqual(rules['A2:E20'], ['MOD(ROW()-2,2)=0',
+                                           'ISNUMBER(SEARCH("wii~*",$B2))'])
+        self.assertEqual(rules['B2:B20'],
+                         ['AND(LEN(B2)>0,B2<>0,LEN(B2)<>4,LOWER(B2)<>"cyan")'])
+        self.assertIsNone(self.xl.ws['A2'].fill.fill_type)
+        try:
+            self.xl.save(f'{tests_path / "outfile.xlsx"}')
+            saved = Xlsx(tests_path / "outfile.xlsx")
+            self.assertEqual(len(list(saved.ws.conditional_formatting)), 2)
+        finally:
+            Path(f'{tests_path / "outfile.xlsx"}').unlink(missing_ok=True)
+
     def test_number_type_fix(self):
         """Test that number_type_fix runs on all rows of the specified 
         column. Currently no assert methods. 
@@ -178,6 +440,44 @@ class TestXlsx(unittest.TestCase):
         self.assertIsInstance(self.xl.ws['E15'].value, float)
         self.assertEqual(self.xl.ws['E19'].value, 29.50)
 
+    def test_column_number_formats(self):
+        """Tests set_number_format on each cell, and format_currency with
+        by_column and format_date with keep_dates, which add one
+        conditional formatting rule per column without restyling cells
+        or resizing columns, then verifies the rules after saving and
+        loading.
+        """
+        self.xl.set_number_format('C', '#,##0', startrow=2)
+        self.assertEqual(self.xl.ws['C19'].number_format, '#,##0')
+        self.assertEqual(self.xl.ws['C1'].number_format, 'General')
+        widths = {col: dimension.width
+                  for col, dimension in self.xl.ws.column_dimensions.items()}
+        self.xl.format_currency('E', startrow=2, by_column=True)
+        self.xl.format_date('D', startrow=2, keep_dates=True)
+        self.assertIsInstance(self.xl.ws['D7'].value, datetime.datetime)
+        self.assertEqual(self.xl.ws['E19'].number_format, 'General')
+        self.assertEqual(
+            {col: dimension.width
+             for col, dimension in self.xl.ws.column_dimensions.items()},
+            widths)
+        outfile = tests_path / "_test_formats.xlsx"
+        try:
+            self.xl.save(outfile)
+            xl = Xlsx(outfile)
+        finally:
+            outfile.unlink()
+        formats = {cf.sqref.ranges[0].coord: cf.rules[0].dxf.numFmt.formatCode
+                   for cf in xl.ws.conditional_formatting}
+        self.assertEqual(formats, {'E2:E1048576': '$#,###.00',
+                                   'D2:D1048576': 'mm/dd/yyyy'})
+        self.assertEqual(xl.ws['D7'].value.date(), datetime.date(2019, 4, 25))
+        formatted = Xlsx(test_xlsx).transform().format_currency(
+            'E', startrow=2, stoprow=10, by_column=True).run()
+        self.assertEqual(formatted.ws['E9'].number_format, 'General')
+        self.assertEqual(
+            [cf.sqref.ranges[0].coord
+             for cf in formatted.ws.conditional_formatting], ['E2:E10'])
+
     def test_set_cell_size(self):
         """Test set_cell_size runs on a column width as well as a row
         height. Currently no assert methods.
@@ -205,6 +505,36 @@ class TestXlsx(unittest.TestCase):
         self.assertEqual(_dict['Wii U']['Integers'], 1700)
         self.assertEqual(_dict['DS']['Strings'], 'DS')
 
+    def test_iter_records(self):
+        """Test iter_records with and without datacols/keycol, and verify
+        record keys, row numbers and values match the original file.
+        """
+        records = list(self.xl.iter_records(('e', 'B'), keycol='b'))
+        self.assertEqual(len(records), 19)
+        self.assertEqual(records[6].key, 'Cyan')
+        self.assertEqual(records[6].row, 8)
+        self.assertEqual(records[6]['Currency'], 48398.58)
+        self.assertEqual(records[6].values, (48398.58, 'Cyan'))
+        first = next(self.xl.iter_records())
+        self.assertEqual(first.key, '0002')
+        self.assertEqual(first.as_dict()['Integers'], 100)
+        self.assertEqual(len(first.headers), 5)
+
+    def test_iter_records_missing_headers(self):
+        """Verifies a header row past the end of the sheet raises
+        ValueError, and columns past the end of the headers get None.
+        """
+        xl_r = Xlsx(test_xlsx, mode='r')
+        try:
+            with self.assertRaisesRegex(ValueError, 'Header row 50'):
+                next(xl_r.iter_records(['B'], hdrrow=50))
+        finally:
+            xl_r.close()
+        self.xl.ws['G3'] = 'extra'
+        record = next(self.xl.iter_records(['A', 'G'], datastartrow=3))
+        self.assertEqual(record.headers, ('Letters', None))
+        self.assertEqual(record.values, ('B', 'extra'))
+
     def test_generate_list(self):
         """Test generate_list on main file, then verify that list values
         match expected data from original file. Also verify that trying
@@ -217,6 +547,77 @@ class TestXlsx(unittest.TestCase):
         with self.assertRaises(IndexError):
             _list[11][0]
 
+    def test_iter_rows_chunked(self):
+        """Reads the sheet in chunks of rows and of column arrays, and
+        verifies chunk sizes, selected columns and packed array types.
+        """
+        chunks = list(self.xl.iter_rows_chunked(startrow=2, chunk_size=8))
+        self.assertEqual([len(chunk) for chunk in chunks], [8, 8, 3])
+        self.assertEqual(chunks[0][0], tuple(self.xl.generate_list(2, 2)[0]))
+        chunk = next(self.xl.iter_rows_chunked(2, 5, columns=['C', 'A']))
+        self.assertEqual(chunk, [(100, 'A'), (200, 'B'), (300, 'C'), (400, 'D')])
+        chunk = next(self.xl.iter_rows_chunked(2, 5, columns=['B']))
+        self.assertEqual(chunk[0], ('Red',))
+        arrays = next(self.xl.iter_rows_chunked(2, as_columns=True))
+        self.assertEqual(arrays['C'].typecode, 'q')
+        self.assertEqual(arrays['E'].typecode, 'd')
+        self.assertEqual(arrays['B'][2], 'Purple')
+        self.assertEqual(len(arrays['A']), 19)
+
+    def test_to_csv(self):
+        """Exports selected columns from a read-only object to a tsv file
+        in small chunks and verifies the rows and date formatting.
+        """
+        self.xl.ws['D2'] = datetime.datetime(2021, 3, 4)
+        self.xl.save(tests_path / "_test_to_csv.xlsx")
+        outfile = tests_path / "_test_to_csv.tsv"
+        xl_r = Xlsx(tests_path / "_test_to_csv.xlsx", mode='r')
+        try:
+            xl_r.to_csv(
+                outfile, columns=['D', 'A'], startrow=2, stoprow=4,
+                chunk_size=2, delimiter='\t')
+            lines = outfile.read_text().splitlines()
+        finally:
+            xl_r.close()
+            (tests_path / "_test_to_csv.xlsx").unlink()
+            outfile.unlink()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0], '03/04/2021\tA')
+        self.assertEqual(lines[1].split('\t')[1], 'B')
+
+    @unittest.skipUnless(numpy, "NumPy not installed")
+    def test_to_from_columns(self):
+        """Exports columns to NumPy arrays, verifies the inferred types and
+        null mask, then writes them back and verifies the cell values.
+        """
+        self.xl.ws['C5'] = None
+        self.xl.ws['E6'] = '16.5'
+        arrays = self.xl.to_columns(['A', 'C', 'D', 'E'], startrow=2)
+        self.assertEqual(arrays['A'].dtype, object)
+        self.assertEqual(arrays['C'].dtype, numpy.int64)
+        self.assertEqual(arrays['D'].dtype.kind, 'M')
+        self.assertEqual(arrays['E'].dtype, numpy.float64)
+        self.assertTrue(arrays['C'].mask[3])
+        self.assertEqual(arrays['C'].sum(), 19000 - 400)
+        self.assertEqual(arrays['E'][4], 16.5)
+        arrays = self.xl.to_columns(['C'], dtypes={'c': float}, startrow=2)
+        self.assertEqual(arrays['C'].dtype, numpy.float64)
+
+        arrays = self.xl.to_columns(['C', 'D'], startrow=2)
+        xl_temp = Xlsx.from_columns(
+            {'B': arrays['C'], 'A': arrays['D'] + numpy.timedelta64(1, 'D')},
+            headers={'A': 'Date', 'B': 'Integers'})
+        self.assertEqual(xl_temp.ws['A1'].value, 'Date')
+        self.assertEqual(xl_temp.ws['B2'].value, 100)
+        self.assertIsNone(xl_temp.ws['B5'].value)
+        self.assertEqual(
+            xl_temp.ws['A2'].value, datetime.datetime(2020, 5, 21))
+        xl_temp = Xlsx.from_columns(
+            {'A': arrays['C']}, headers={'A': 'Integers', 'C': 'Notes'})
+        self.assertEqual(xl_temp.ws['C1'].value, 'Notes')
+        self.assertEqual(xl_temp.ws['A2'].value, 100)
+        self.assertEqual(xl_temp.ws.max_column, 3)
+
     def iterate_integers(self, i=100):
         """Iterate through Integers row and check for equality. For use in 
         other test methods.
@@ -273,6 +674,27 @@ class TestXlsx(unittest.TestCase):
         self.xl.add_cell_borders(startrow=2)
         self.xl.add_cell_borders(stoprow=8)
 
+    def test_apply_styles(self):
+        """Verifies the styling methods set the expected styles on the
+        expected rows and register each shared style only once.
+        """
+        self.xl.highlight_rows(startrow=2, stoprow=8, alternate=True,
+                               fillcolor='00ff00')
+        self.assertEqual(self.xl.ws['C4'].fill.fgColor.rgb, '0000ff00')
+        self.assertEqual(self.xl.ws['C5'].fill.fill_type, None)
+        self.assertEqual(self.xl.ws['C8'].fill.fill_type, None)
+        fonts = len(self.xl.wb._fonts)
+        self.xl.set_bold_rows(startrow=3, stoprow=6)
+        self.xl.name_headers({'A': 'TestA'}, bold=True)
+        self.assertEqual(len(self.xl.wb._fonts), fonts + 1)
+        self.assertTrue(self.xl.ws['E5'].font.b)
+        self.assertTrue(self.xl.ws['A1'].font.b)
+        self.assertFalse(self.xl.ws['E6'].font.b)
+        self.xl.apply_styles(startrow=19, border='thick', fill='yellow')
+        self.assertEqual(self.xl.ws['D20'].border.left.style, 'thick')
+        self.assertEqual(self.xl.ws['D20'].fill.fgColor.rgb, '00FFFF00')
+        self.assertIsNone(self.xl.ws['D18'].border.left.style)
+
     def test_reverse_text(self):
         """Tests to make sure one cell is formatted correctly and a couple 
         others are skipped as expected.
@@ -295,6 +717,108 @@ class TestXlsx(unittest.TestCase):
         self.assertEqual(self.xl.ws["E18"].value, 28.5)
         self.assertEqual(self.xl.ws["E5"].value, 15.49)
 
+    def test_clean(self):
+        """Tests clean with several cleaners over two columns in one pass,
+        and that unknown cleaners raise ValueError before any change.
+        """
+        xl = Xlsx()
+        xl.ws.append(['Header', 'Price'])
+        xl.ws.append(['  a   b\t c ', '$1,234.50 USD'])
+        xl.ws.append(['x_y-z!', 42])
+        xl.ws.append([None, 'N/A'])
+        with self.assertRaises(ValueError):
+            xl.clean({'A': 'alnum', 'B': 'letters'})
+        self.assertEqual(xl.ws['A3'].value, 'x_y-z!')
+        xl.clean({'A': ['whitespace', 'strip:!-'], 'B': 'digits'},
+                 startrow=2, skip=['n/a'])
+        self.assertEqual(xl.ws['A2'].value, 'a b c')
+        self.assertEqual(xl.ws['A3'].value, 'x_yz')
+        self.assertEqual(xl.ws['B2'].value, '123450')
+        self.assertEqual(xl.ws['B3'].value, 42)
+        self.assertEqual(xl.ws['B4'].value, 'N/A')
+        self.assertIsNone(xl.ws['A4'].value)
+        xl.clean({'A': 'alnum'}, stoprow=2)
+        self.assertEqual(xl.ws['A1'].value, 'Header')
+        self.assertEqual(xl.ws['A2'].value, 'abc')
+        self.assertEqual(xl.ws['A3'].value, 'x_yz')
+
+    def test_coerce(self):
+        """Tests coerce over three columns, that failures are recorded
+        and highlighted instead of raised, and that repeated date strings
+        are parsed once.
+        """
+        from xlclass.coerce import _parse_date
+
+        xl = Xlsx()
+        xl.ws.append(['Int', 'Float', 'Date'])
+        xl.ws.append(['12', '1.5', '2021-03-04'])
+        xl.ws.append(['x', 2, '2021-03-04'])
+        xl.ws.append([None, 'n/a', datetime.date(2020, 1, 2)])
+        with self.assertRaises(ValueError):
+            xl.coerce({'A': 'complex'})
+        hits = _parse_date.cache_info().hits
+        failures = xl.coerce({'a': int, 'B': float, 'C': 'date:%Y-%m-%d'},
+                             startrow=2, report=True, highlight='yellow')
+        self.assertEqual(xl.ws['A2'].value, 12)
+        self.assertEqual(xl.ws['B2'].value, 1.5)
+        self.assertEqual(xl.ws['B3'].value, 2.0)
+        self.assertEqual(xl.ws['C2'].value, datetime.datetime(2021, 3, 4))
+        self.assertEqual(xl.ws['C4'].value, datetime.datetime(2020, 1, 2))
+        self.assertGreater(_parse_date.cache_info().hits, hits)
+        self.assertEqual([(f.coordinate, f.value) for f in failures],
+                         [('A3', 'x'), ('B4', 'n/a')])
+        self.assertEqual(xl.ws['A3'].value, 'x')
+        self.assertIsNone(xl.ws['A4'].value)
+        self.assertEqual(xl.ws['A3'].fill.fgColor.rgb,
+                         xl.ws['B4'].fill.fgColor.rgb)
+        self.assertNotEqual(xl.ws['A3'].fill, xl.ws['A2'].fill)
+        self.assertIs(xl.coerce({'A': int}, startrow=2), xl)
+
+    def test_coerce_lossy_values(self):
+        """Tests that coerce records bools and numbers with a fraction as
+        failures for int columns instead of truncating them.
+        """
+        xl = Xlsx()
+        for value in (2.7, True, '3.5', 4.0, '5.0', '6', False):
+            xl.ws.append([value, value])
+        failures = xl.coerce({'A': int, 'B': float}, report=True,
+                             highlight='red')
+        self.assertEqual([row[0].value for row in xl.ws.iter_rows()],
+                         [2.7, True, '3.5', 4, 5, 6, False])
+        self.assertEqual(xl.ws['B3'].value, 3.5)
+        self.assertEqual([f.coordinate for f in failures],
+                         ['A1', 'A2', 'B2', 'A3', 'A7', 'B7'])
+        self.assertEqual(xl.ws['A1'].fill.fgColor.rgb,
+                         xl.ws['A3'].fill.fgColor.rgb)
+        self.assertNotEqual(xl.ws['A1'].fill, xl.ws['A4'].fill)
+
+    def test_transform(self):
+        """Runs the same chain of steps with the individual methods and as
+        a single transform pass, and verifies every cell value and number
+        format matches.
+        """
+        xl = Xlsx(test_xlsx)
+        self.xl.find_replace('B', {'NES': 'TEST', 'Red': 'Rojo'}, startrow=2)
+        self.xl.move_values('B', 'F', ('Gameboy', 'Rojo'))
+        self.xl.reverse_text('B', startrow=10)
+        self.xl.remove_non_numbers('E', startrow=3, stoprow=18, skip=['15.49'])
+        self.xl.number_type_fix('C', 'f', startrow=2)
+        self.xl.format_currency('E', startrow=2, stoprow=19)
+        result = xl.transform().find_replace(
+            'B', {'NES': 'TEST', 'Red': 'Rojo'}, startrow=2).move_values(
+            'B', 'F', ('Gameboy', 'Rojo')).reverse_text(
+            'B', startrow=10).digits_only(
+            'E', startrow=3, stoprow=18, skip=['15.49']).to_float(
+            'C', startrow=2).format_currency('E', startrow=2, stoprow=19).run()
+        self.assertIs(result, xl)
+        for row, expected in zip(xl.ws.iter_rows(), self.xl.ws.iter_rows()):
+            self.assertEqual([cell.value for cell in row],
+                             [cell.value for cell in expected])
+            self.assertEqual([cell.number_format for cell in row],
+                             [cell.number_format for cell in expected])
+        self.assertEqual(xl.ws['F15'].value, 'Gameboy')
+        self.assertEqual(xl.ws['E4'].value, '145')
+
     def test_generate_columns_dictionary(self):
         """Tests generate columns dictionary to verify key/value pairs."""
         headers_list = ("header 1", "header 2", "header 3")
@@ -336,6 +860,261 @@ class TestXlsx(unittest.TestCase):
         self.assertEqual(self.xl_temp.ws["B4"].value, "C")
         self.assertEqual(self.xl_temp.ws["A13"].value, "NES")
 
+    def test_read_only_mode(self):
+        """Opens the test file in read-only mode and verifies the read
+        methods return the same data as the default mode and that
+        methods that modify the sheet raise an error.
+        """
+        xl_ro = Xlsx(test_xlsx, mode="r")
+        self.assertEqual(xl_ro.generate_list(), self.xl.generate_list())
+        self.assertEqual(
+            xl_ro.generate_dictionary(('A', 'b', 'e'), keycol='b'),
+            self.xl.generate_dictionary(('A', 'b', 'e'), keycol='b'))
+        self.assertEqual(xl_ro.get_matching_value('a', 'M', 'B'), 'SNES')
+        self.assertEqual(xl_ro.search_matching_value('Strings', 'L'), 'NES')
+        self.assertEqual(
+            xl_ro.generate_headers_attribute().headers["Currency"], "E")
+        with self.assertRaises(io.UnsupportedOperation):
+            xl_ro.find_replace('B', {'NES': 'TEST'})
+        with self.assertRaises(io.UnsupportedOperation):
+            xl_ro.save(f'{tests_path / "outfile.xlsx"}')
+        xl_ro.close()
+
+    def test_write_dictionary_to_sheet(self):
+        """Writes a nested dictionary with missing keys and a generator of
+        (key, row_dict) pairs to blank objects, and verifies each value is
+        written under its own header.
+        """
+        data = {'r1': {'A': 1, 'B': 2}, 'r2': {'B': 3, 'C': 4}}
+        xl_temp = Xlsx().write_dictionary_to_sheet(data, header_row=2)
+        self.assertEqual(
+            xl_temp.generate_list(startrow=2),
+            [['A', 'B', 'C'], [1, 2, None], [None, 3, 4]])
+        xl_temp = Xlsx().write_dictionary_to_sheet(
+            ((key, row) for key, row in data.items()), headers=['C', 'B'])
+        self.assertEqual(
+            xl_temp.generate_list(),
+            [['C', 'B', 'A'], [None, 2, 1], [4, 3, None]])
+
+    def test_create_streaming(self):
+        """Writes a header row, dictionary data and csv data to a
+        write-only object, saves it, and verifies the saved cell values,
+        header style and column width.
+        """
+        outfile = tests_path / "outstream.xlsx"
+        xl_w = Xlsx.create_streaming(outfile, "Streamed")
+        xl_w.set_cell_size({'A': 30})
+        xl_w.write_dictionary_to_sheet(
+            {'r1': {'Name': 'Red', 'Num': 1}, 'r2': {'Num': 2}}, bold=True)
+        xl_w.copy_csv_data(test_csv)
+        with self.assertRaises(io.UnsupportedOperation):
+            xl_w.generate_list()
+        try:
+            xl_w.save()
+            saved = Xlsx(outfile)
+        finally:
+            outfile.unlink(missing_ok=True)
+
+        self.assertEqual(saved.ws.title, 'Streamed')
+        self.assertEqual(saved.ws['A1'].value, 'Name')
+        self.assertTrue(saved.ws['B1'].font.b)
+        self.assertEqual(saved.ws['B3'].value, 2)
+        self.assertIsNone(saved.ws['A3'].value)
+        self.assertEqual(saved.ws['A4'].value, 'State')
+        self.assertEqual(saved.ws['A14'].value, 'Georgia')
+        self.assertEqual(saved.ws.column_dimensions['A'].width, 30)
+
+    def test_create_streaming_empty_first_row(self):
+        """Verifies write-only objects raise ValueError when the headers
+        would be read from an empty first row, instead of dropping it and
+        moving every later row up.
+        """
+        outfile = tests_path / "outstream_empty.xlsx"
+        xl_w = Xlsx.create_streaming(outfile)
+        with self.assertRaises(ValueError):
+            xl_w.write_dictionary_to_sheet(
+                iter([('r1', {}), ('r2', {'Num': 2})]))
+        xl_w = Xlsx.create_streaming(outfile)
+        xl_w.write_dictionary_to_sheet({'r1': {}, 'r2': {'Num': 2}})
+        self.assertEqual(xl_w._rows_written, 3)
+        self.assertFalse(outfile.exists())
+
+    def test_batch_run(self):
+        """Runs a pipeline over two copies of the test file and a missing
+        file in worker processes, and verifies the saved output, step
+        results and recorded error.
+        """
+        savedir = tests_path / "_batch"
+        savedir.mkdir(exist_ok=True)
+        sources = [savedir / "_in1.xlsx", savedir / "_in2.xlsx"]
+        for source in sources:
+            self.xl.save(source)
+        try:
+            results = batch.run(
+                sources + [savedir / "_missing.xlsx"],
+                [("find_replace", ("B", {"Red": "Rojo"})),
+                 ("get_matching_value", ("A", "B", "C"))],
+                workers=2, savedir=savedir)
+            saved = Xlsx(savedir / "_in2.xlsx")
+        finally:
+            for path in savedir.iterdir():
+                path.unlink()
+            savedir.rmdir()
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[1].results, [None, 200])
+        self.assertEqual(len(results[1].step_seconds), 2)
+        self.assertIn('FileNotFoundError', results[2].error)
+        self.assertEqual(saved.ws['B2'].value, 'Rojo')
+        with self.assertRaises(ValueError):
+            batch.run([], ['not_a_method'])
+
+    def test_aopen_asave(self):
+        """Loads two workbooks at once with a single worker, saves a
+        snapshot, changes the object while it is written, and verifies
+        the saved file has the values from when asave was called.
+        """
+        from xlclass import aio
+        outfile = tests_path / "_test_asave.xlsx"
+        max_workers = aio.MAX_WORKERS
+
+        async def load_and_save():
+            aio.set_max_workers(1)
+            xl, xl_r = await asyncio.gather(
+                Xlsx.aopen(test_xlsx), Xlsx.aopen(test_xlsx, mode='r'))
+            xl_r.close()
+            saving = xl.asave(outfile, snapshot=True)
+            xl.ws['B2'] = 'Changed'
+            await saving
+            return xl
+
+        try:
+            xl = asyncio.run(load_and_save())
+            saved = Xlsx(outfile)
+        finally:
+            aio.set_max_workers(max_workers)
+            outfile.unlink()
+        self.assertEqual(xl.ws['B2'].value, 'Changed')
+        self.assertEqual(saved.ws['B2'].value, 'Red')
+        self.assertEqual(saved.ws['C20'].value, 1900)
+
+    def test_profiling(self):
+        """Profiles method calls (including a generator method), and
+        verifies the recorded counts, the hook, and that objects that
+        aren't profiled keep the original class.
+        """
+        calls = []
+        xl = Xlsx(test_xlsx, profile=calls.append)
+        xl.find_replace('B', {'Red': 'Rojo'}, startrow=2)
+        records = list(xl.iter_records(keycol='A'))
+        stats = xl.stats()
+        self.assertEqual(
+            [call.method for call in stats],
+            ['load', 'find_replace', 'iter_records'])
+        self.assertEqual(stats[1].cells_written, 1)
+        self.assertEqual(stats[1].rows_scanned, 19)
+        self.assertEqual(stats[2].cells_read, 5 * 20)
+        self.assertEqual(len(records), 19)
+        self.assertEqual(calls, stats)
+        self.assertEqual(xl.stats(by_method=True)['find_replace']['calls'], 1)
+        self.assertIsInstance(xl, Xlsx)
+        self.assertIs(type(self.xl), Xlsx)
+        self.assertEqual(self.xl.stats(), [])
+
+    def test_profiling_counts_own_cells(self):
+        """Reads an unprofiled object's cells, and the profiled object's
+        cells from another thread, during a profiled call, and verifies
+        neither is counted in the call's stats.
+        """
+        import threading
+
+        def keep(values):
+            return False
+
+        def keep_reading(values):
+            [cell.value for cell in self.xl.ws['B']]
+            thread = threading.Thread(
+                target=lambda: [cell.value for cell in xl.ws['B']])
+            thread.start()
+            thread.join()
+            return False
+
+        xl = Xlsx(test_xlsx, profile=True)
+        xl.remove_rows(keep, startrow=2)
+        xl.remove_rows(keep_reading, startrow=2)
+        first, second = xl.stats()[1:]
+        self.assertEqual(first.cells_read, second.cells_read)
+        self.assertEqual(first.rows_scanned, second.rows_scanned)
+
+    def test_profiling_threads(self):
+        """Runs profiled calls of two objects in two threads at once, one
+        of them ending while the other still runs, and verifies each is
+        counted as when run alone, that tracemalloc traced the whole of
+        both calls, and that Cell.value is restored after both.
+        """
+        import threading
+        import tracemalloc
+        from openpyxl.cell.cell import Cell
+
+        value_property = Cell.value
+        solo = Xlsx(test_xlsx, profile=True)
+        solo.remove_rows(lambda values: False, startrow=2)
+        both_running = threading.Barrier(2)
+        first_done = threading.Event()
+        tracing = []
+
+        def keep_first(values):
+            if not tracing:
+                tracing.append(tracemalloc.is_tracing())
+                both_running.wait(timeout=5)
+            return False
+
+        def keep_second(values):
+            if len(tracing) < 2:
+                both_running.wait(timeout=5)
+                first_done.wait(timeout=5)
+                tracing.append(tracemalloc.is_tracing())
+            return False
+
+        def run_first():
+            first.remove_rows(keep_first, startrow=2)
+            first_done.set()
+
+        first = Xlsx(test_xlsx, profile=True)
+        second = Xlsx(test_xlsx, profile=True)
+        threads = [
+            threading.Thread(target=run_first),
+            threading.Thread(
+                target=lambda: second.remove_rows(keep_second, startrow=2)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(tracing, [True, True])
+        for xl in (first, second):
+            stats = xl.stats()[1]
+            self.assertEqual(stats.cells_read, solo.stats()[1].cells_read)
+            self.assertEqual(stats.rows_scanned, solo.stats()[1].rows_scanned)
+        self.assertIs(Cell.value, value_property)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_import_time(self):
+        """Imports xlclass in a fresh interpreter and verifies it doesn't
+        import xlrd, numpy or pandas itself (numpy is still loaded where
+        openpyxl imports it).
+        """
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, openpyxl; print(','.join(sorted(sys.modules)));"
+             "import xlclass; print(','.join(sorted(sys.modules)))"],
+            capture_output=True, text=True, check=True,
+            cwd=tests_path.parent,
+        )
+        before, after = (set(line.split(","))
+                         for line in result.stdout.strip().splitlines())
+        for module in ("xlrd", "numpy", "pandas"):
+            self.assertNotIn(module, after - before)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -7,7 +7,6 @@ Requirements:
 * openpyxl==3.0.6
 
 xls support Requirements:
-* pandas==1.2.2
 * xlrd==2.0.1
 """
 
@@ -0,0 +1,126 @@
+"""
+
+Runs the blocking workbook loads and saves of Xlsx.aopen and Xlsx.asave
+in a bounded pool of threads, so they can be awaited from an asyncio
+event loop without blocking it.
+
+"""
+import asyncio
+import copy
+import functools
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from openpyxl.cell.cell import Cell
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.utils.indexed_list import IndexedList
+
+# Maximum number of loads/saves run at once (see set_max_workers)
+MAX_WORKERS = 4
+
+_executor = None
+
+
+def set_max_workers(max_workers: int) -> None:
+    """Sets the number of loads and saves that can run at once. Further
+    calls wait in the queue until a worker thread is free. Loads and
+    saves already running are finished by the previous pool.
+    """
+    global MAX_WORKERS, _executor
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+    previous, _executor = _executor, None
+    MAX_WORKERS = max_workers
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Returns the shared thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=MAX_WORKERS, thread_name_prefix="xlclass"
+        )
+
+    return _executor
+
+
+def _run(func, *args, executor=None) -> asyncio.Future:
+    """Schedules func(*args) on the executor (or the shared pool) and
+    returns a future for the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+
+    return loop.run_in_executor(
+        executor or _get_executor(), functools.partial(func, *args)
+    )
+
+
+async def _aopen(cls, filepath, sheetname, mode: str, executor):
+    """Creates an Xlsx object (cls) in the executor."""
+    return await _run(cls, filepath, sheetname, mode, executor=executor)
+
+
+def _asave(xlsx, savepath, snapshot: bool, executor) -> asyncio.Future:
+    """Starts saving an Xlsx object's workbook in the executor. With
+    snapshot, a copy of the workbook is taken before returning, so the
+    object can be changed while the copy is written.
+    """
+    savepath = savepath or xlsx.path
+    if not savepath:
+        raise ValueError("No savepath passed, and the object has no .path.")
+    wb = xlsx.wb
+    if snapshot:
+        if xlsx.mode == "w":
+            raise io.UnsupportedOperation(
+                "Write-only workbooks can't be saved from a snapshot."
+            )
+        wb = _snapshot_workbook(wb)
+
+    return _run(wb.save, savepath, executor=executor)
+
+
+def _snapshot_workbook(wb):
+    """Returns an independent copy of a workbook for saving. The cells
+    are copied directly (a deepcopy of every Cell is several times
+    slower than saving), and the workbook's IndexedList style
+    collections are rebuilt, since deepcopy leaves them empty.
+    """
+    memo = {}
+    for value in vars(wb).values():
+        if isinstance(value, IndexedList):
+            memo[id(value)] = IndexedList(copy.deepcopy(list(value), memo))
+    # Filled in after the copy, once the new worksheets exist
+    cells = {}
+    for ws in wb.worksheets:
+        memo[id(ws._cells)] = cells[id(ws)] = {}
+
+    snapshot = copy.deepcopy(wb, memo)
+    for ws, new_ws in zip(wb.worksheets, snapshot.worksheets):
+        cells[id(ws)].update(_copy_cells(ws._cells, new_ws))
+
+    return snapshot
+
+
+def _copy_cells(cells: dict, ws) -> dict:
+    """Copies a worksheet's {(row, column): cell} dictionary for ws."""
+    copied = {}
+    for key, cell in cells.items():
+        cell_class = cell.__class__
+        new = cell_class.__new__(cell_class)
+        new.parent = ws
+        new._style = StyleArray(cell._style) if cell._style else None
+        new.row = cell.row
+        new.column = cell.column
+        if cell_class is Cell:
+            new._value = cell._value
+            new.data_type = cell.data_type
+            new._hyperlink = copy.copy(cell._hyperlink) if cell._hyperlink else None
+            new._comment = None
+            if cell._comment:
+                # Copies the comment and binds the copy to the new cell
+                new.comment = cell._comment
+        copied[key] = new
+
+    return copied
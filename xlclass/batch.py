@@ -0,0 +1,185 @@
+"""
+
+Runs the same chain of Xlsx method calls over many workbooks in a pool
+of worker processes.
+
+    from xlclass import batch
+
+    results = batch.run(
+        paths,
+        [
+            ("find_replace", ("B", {"N/A": ""})),
+            ("remove_non_numbers", ("E",), {"startrow": 2}),
+            ("format_currency", ("E",)),
+        ],
+        workers=8,
+    )
+    for result in results:
+        print(result.path, result.seconds, result.error)
+
+"""
+import os
+import time
+import traceback
+import types
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .xlsx_class import Xlsx
+
+
+class BatchResult:
+    """Outcome of running a pipeline over one workbook.
+
+    Attrs:
+        *.path (pathlib.Path): Workbook the pipeline ran on.
+        *.results (list): Return value of each completed step (None for
+            steps returning the Xlsx object itself).
+        *.error (str): Formatted traceback if a step (or loading or
+            saving) failed, otherwise None.
+        *.seconds (float): Total time spent on the workbook.
+        *.step_seconds (list): Time spent on each completed step.
+        *.savepath (pathlib.Path): Where the workbook was saved, or None.
+    """
+
+    __slots__ = ("path", "results", "error", "seconds", "step_seconds", "savepath")
+
+    def __init__(
+        self,
+        path,
+        results: list = None,
+        error: str = None,
+        seconds: float = 0.0,
+        step_seconds: list = None,
+        savepath=None,
+    ):
+        self.path = path
+        self.results = results if results is not None else []
+        self.error = error
+        self.seconds = seconds
+        self.step_seconds = step_seconds if step_seconds is not None else []
+        self.savepath = savepath
+
+    def __repr__(self):
+        status = "failed" if self.error else "ok"
+        return (
+            f"BatchResult(path={str(self.path)!r}, {status}, "
+            f"seconds={self.seconds:.3f})"
+        )
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _parse_pipeline(pipeline) -> list:
+    """Normalizes the pipeline steps to [(method name, args, kwargs)].
+    Each step can be a method name or a (name, args) or (name, args,
+    kwargs) tuple. Raises ValueError for names that aren't public Xlsx
+    methods, before any work is started.
+    """
+    steps = []
+    for step in pipeline:
+        if isinstance(step, str):
+            step = (step,)
+        name = step[0]
+        args = tuple(step[1]) if len(step) > 1 else ()
+        kwargs = dict(step[2]) if len(step) > 2 else {}
+        if name.startswith("_") or not callable(getattr(Xlsx, name, None)):
+            raise ValueError(f"'{name}' is not an Xlsx method.")
+        steps.append((name, args, kwargs))
+
+    return steps
+
+
+def _run_file(path, steps: list, sheetname, mode: str, save: bool, savedir):
+    """Loads one workbook, runs each step, and saves it. Runs in a worker
+    process, so any error is returned as a traceback string instead of
+    being raised.
+    """
+    path = Path(path)
+    result = BatchResult(path)
+    start = time.perf_counter()
+    xl = None
+    try:
+        xl = Xlsx(path, sheetname=sheetname, mode=mode)
+        for name, args, kwargs in steps:
+            step_start = time.perf_counter()
+            value = getattr(xl, name)(*args, **kwargs)
+            if value is xl:
+                value = None
+            elif isinstance(value, types.GeneratorType):
+                value = list(value)
+            result.results.append(value)
+            result.step_seconds.append(time.perf_counter() - step_start)
+        if save and mode != "r":
+            # .xls files are saved as .xlsx
+            result.savepath = Path(savedir or path.parent) / f"{path.stem}.xlsx"
+            xl.save(result.savepath)
+    except Exception:
+        result.error = traceback.format_exc()
+    finally:
+        if xl is not None and mode == "r":
+            xl.close()
+    result.seconds = time.perf_counter() - start
+
+    return result
+
+
+def run(
+    paths,
+    pipeline,
+    workers: int = None,
+    sheetname: str = None,
+    mode: str = "rw",
+    save: bool = True,
+    savedir: str = None,
+    callback=None,
+) -> list:
+    """Runs a pipeline of Xlsx method calls over each workbook in paths,
+    with each workbook handled by one of a pool of worker processes.
+    A failure on one workbook is recorded in its result and doesn't stop
+    the others. Step arguments and return values (other than the Xlsx
+    object itself) must be picklable.
+
+    Args:
+        paths (iterable): Paths of the *.xlsx (or *.xls) files.
+        pipeline (list): Steps to run in order. Each step is a method
+            name, or a (name, args) or (name, args, kwargs) tuple.
+            ex: [("find_replace", ("B", {"N/A": ""})), ("format_currency", ("E",))]
+        workers (int, optional): Number of worker processes. Defaults to
+            None (the number of CPUs).
+        sheetname (str, optional): Sheet to load from each workbook.
+            Defaults to None (active sheet).
+        mode (str, optional): Load mode, 'rw' or 'r'. Defaults to 'rw'.
+        save (bool, optional): Option to save each workbook after the
+            pipeline (not in 'r' mode). Defaults to True.
+        savedir (str/pathlib.Path, optional): Folder to save the
+            workbooks to. Defaults to None (save over the originals;
+            *.xls files are saved next to them as *.xlsx).
+        callback (callable, optional): Called with each BatchResult as
+            soon as its workbook finishes. Defaults to None.
+
+    Returns:
+        list: BatchResult for each path, in the order of paths.
+    """
+    steps = _parse_pipeline(pipeline)
+    paths = [Path(path) for path in paths]
+    results = [None] * len(paths)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(_run_file, path, steps, sheetname, mode, save, savedir): i
+            for i, path in enumerate(paths)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                # The task or its result couldn't be sent between processes
+                result = BatchResult(paths[i], error=traceback.format_exc())
+            results[i] = result
+            if callback is not None:
+                callback(result)
+
+    return results
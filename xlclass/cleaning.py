@@ -0,0 +1,101 @@
+"""
+
+Named text cleaners, run over several columns in one pass by Xlsx.clean.
+
+    xl.clean({"E": "digits", "B": ["whitespace", "strip:$,"]}, startrow=2)
+
+Cleaners:
+    digits: Removes every character that isn't a digit.
+    alnum: Removes every character that isn't a letter or digit.
+    whitespace: Collapses runs of whitespace to one space and strips
+        the ends.
+    strip:<chars>: Removes every character in <chars>. ex: 'strip:$,'
+
+"""
+import re
+from functools import lru_cache, partial
+
+from openpyxl.utils import column_index_from_string
+
+from .matching import _skip_set
+
+_NON_DIGITS = re.compile(r"\D+")
+_NON_ALNUM = re.compile(r"[\W_]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _collapse_whitespace(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+CLEANERS = {
+    "digits": partial(_NON_DIGITS.sub, ""),
+    "alnum": partial(_NON_ALNUM.sub, ""),
+    "whitespace": _collapse_whitespace,
+}
+
+
+@lru_cache(maxsize=None)
+def _cleaner(name: str):
+    """Returns the function(text) -> text for a cleaner name."""
+    if name.startswith("strip:"):
+        table = str.maketrans("", "", name[len("strip:"):])
+        return lambda text: text.translate(table)
+    try:
+        return CLEANERS[name]
+    except KeyError:
+        raise ValueError(
+            f"'{name}' is not a cleaner. "
+            f"Use one of: {', '.join(CLEANERS)}, strip:<chars>."
+        ) from None
+
+
+def _cleaners(names) -> tuple:
+    """Returns the cleaner functions for a name or list of names."""
+    if isinstance(names, str):
+        names = (names,)
+
+    return tuple(_cleaner(name) for name in names)
+
+
+def _clean_value(value, cleaners: tuple, skip=frozenset()):
+    """Runs the cleaners in order on a cell value and returns the new str.
+    Returns value itself if it is empty, in skip (lowercase), or the
+    cleaners don't change it.
+    """
+    if not value:
+        return value
+    text = str(value)
+    if text.lower() in skip:
+        return value
+    new_text = text
+    for cleaner in cleaners:
+        new_text = cleaner(new_text)
+
+    return value if new_text == text else new_text
+
+
+def _clean(xlsx, spec: dict, startrow: int, stoprow: int, skip):
+    """Cleans the columns of spec ({column letter: cleaner name(s)}) from
+    startrow to stoprow (included, or the last row if None). Unknown
+    cleaner names raise ValueError before any cell is changed. Empty
+    cells are skipped without being created.
+    """
+    columns = [
+        (column_index_from_string(col.upper()), _cleaners(names))
+        for col, names in spec.items()
+    ]
+    skip = _skip_set(skip)
+    xlsx._invalidate_indexes(*spec)
+    ws = xlsx.ws
+    lastrow = ws.max_row if stoprow is None else min(stoprow, ws.max_row)
+    cells = ws._cells
+    for row in range(startrow, lastrow + 1):
+        for column, cleaners in columns:
+            cell = cells.get((row, column))
+            if cell is not None:
+                value = _clean_value(cell.value, cleaners, skip)
+                if value is not cell.value:
+                    cell.value = value
+
+    return xlsx
@@ -0,0 +1,270 @@
+"""
+
+Value type conversions shared by the Xlsx methods that convert cell
+values (number_type_fix, format_date, coerce) and read or write typed
+data.
+
+"""
+import datetime
+from functools import lru_cache
+
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+# Date format written by Xlsx.format_date (and read back as a date)
+DATE_FORMAT = "%m/%d/%Y"
+
+# Excel number format displaying dates the same way as DATE_FORMAT
+DATE_NUMBER_FORMAT = "mm/dd/yyyy"
+
+
+def _is_null(value) -> bool:
+    """Empty cells are read as None, or "" from csv/text data."""
+    return value is None or value == ""
+
+
+def _reject_underscores(value) -> None:
+    """int() and float() accept '_' between digits (ex: '1_000'), which
+    isn't a number in csv or cell text.
+    """
+    if isinstance(value, str) and "_" in value:
+        raise ValueError(f"{value!r} isn't a number.")
+
+
+def _to_int(value) -> int:
+    """Converts a value the same way as number_type_fix(numtype='i'),
+    except strs containing '_'.
+    """
+    _reject_underscores(value)
+    return int(value)
+
+
+def _to_float(value) -> float:
+    """Converts a value the same way as number_type_fix(numtype='f'),
+    except strs containing '_'.
+    """
+    _reject_underscores(value)
+    return float(value)
+
+
+def _to_datetime(value, fmt: str = DATE_FORMAT) -> datetime.datetime:
+    """Returns datetime values as is, converts dates to datetimes, and
+    parses str values using fmt (the format written by format_date).
+    """
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, datetime.date):
+        return datetime.datetime.combine(value, datetime.time())
+    return datetime.datetime.strptime(str(value).strip(), fmt)
+
+
+def _is_int(value) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return True
+    if isinstance(value, str):
+        try:
+            _to_int(value)
+            return True
+        except ValueError:
+            return False
+    return False
+
+
+def _is_float(value) -> bool:
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return True
+    if isinstance(value, str):
+        try:
+            _to_float(value)
+            return True
+        except ValueError:
+            return False
+    return False
+
+
+def _is_datetime(value, fmt: str = DATE_FORMAT) -> bool:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return True
+    if isinstance(value, str):
+        try:
+            _to_datetime(value, fmt)
+            return True
+        except ValueError:
+            return False
+    return False
+
+
+# Checked in order, so the narrowest type that fits is chosen
+TYPE_CHECKS = (("int", _is_int), ("float", _is_float), ("datetime", _is_datetime))
+
+CONVERTERS = {"int": _to_int, "float": _to_float, "datetime": _to_datetime}
+
+
+def _infer_type(values) -> str:
+    """Returns the narrowest type ('int', 'float', 'datetime' or
+    'object') that every non-empty value can be converted to. ints (and
+    int strings) are 'int', any other numbers (and number strings) are
+    'float', and datetimes, dates and MM/DD/YYYY strings are 'datetime'.
+    """
+    values = [value for value in values if not _is_null(value)]
+    if not values:
+        return "object"
+    for type_name, check in TYPE_CHECKS:
+        if all(check(value) for value in values):
+            return type_name
+
+    return "object"
+
+
+# Distinct date strings parsed by coerce that are remembered
+DATE_CACHE_SIZE = 10_000
+
+# Target types for coerce that can be passed as the type itself
+TYPE_NAMES = {int: "int", float: "float", str: "str", datetime.datetime: "date"}
+
+
+class CoerceFailure:
+    """A cell value coerce couldn't convert (the cell is left as is).
+
+    Attrs:
+        *.row (int): Row number of the cell.
+        *.col (str): Column letter of the cell.
+        *.value: Cell value that couldn't be converted.
+        *.error (str): Message of the conversion error.
+    """
+
+    __slots__ = ("row", "col", "value", "error")
+
+    def __init__(self, row: int, col: str, value, error: str):
+        self.row = row
+        self.col = col
+        self.value = value
+        self.error = error
+
+    def __repr__(self):
+        return (
+            f"CoerceFailure({self.coordinate}, value={self.value!r}, "
+            f"error={self.error!r})"
+        )
+
+    @property
+    def coordinate(self) -> str:
+        return f"{self.col}{self.row}"
+
+
+def _to_whole_int(value) -> int:
+    """Converts a value to int for coerce, raising ValueError instead of
+    dropping anything: bools, and numbers or number strs with a
+    fraction (ex: 2.7), aren't converted.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"{value!r} is a bool, not an int.")
+    if isinstance(value, int):
+        return value
+    _reject_underscores(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"{value!r} isn't a whole number.")
+
+    return int(number)
+
+
+def _to_number_float(value) -> float:
+    """Converts a value to float for coerce, raising ValueError for
+    bools.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"{value!r} is a bool, not a float.")
+    _reject_underscores(value)
+
+    return float(value)
+
+
+# Converters used by coerce, which reject values that would lose data
+COERCE_CONVERTERS = {"int": _to_whole_int, "float": _to_number_float}
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date(text: str, fmt: str) -> datetime.datetime:
+    return datetime.datetime.strptime(text, fmt)
+
+
+def _date_converter(fmt: str):
+    def convert(value) -> datetime.datetime:
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return _to_datetime(value)
+        return _parse_date(str(value).strip(), fmt)
+
+    return convert
+
+
+def _converter(target):
+    """Returns the function converting values for a coerce target: int
+    (whole numbers only), float, str, or 'int', 'float', 'str', 'date'
+    or 'date:<strptime format>' (strs are parsed as MM/DD/YYYY by
+    default), or any other callable. Raises ValueError for other names.
+    """
+    name = TYPE_NAMES.get(target, target)
+    if not isinstance(name, str):
+        if callable(name):
+            return name
+        raise ValueError(f"{target!r} is not a type to coerce to.")
+    type_name, _sep, fmt = name.partition(":")
+    if type_name in ("date", "datetime"):
+        return _date_converter(fmt or DATE_FORMAT)
+    if type_name == "str" and not fmt:
+        return str
+    if type_name in COERCE_CONVERTERS and not fmt:
+        return COERCE_CONVERTERS[type_name]
+
+    raise ValueError(
+        f"'{name}' is not a type to coerce to. "
+        "Use int, float, str, 'date' or 'date:<format>'."
+    )
+
+
+def _coerce(xlsx, spec: dict, startrow: int, stoprow: int) -> list:
+    """Converts the values of each column of spec ({column letter: target
+    type}) from startrow to stoprow (included, or the last row if None),
+    in one pass over the rows. Empty cells are skipped, and values that
+    can't be converted are left as they are.
+
+    Returns:
+        list: CoerceFailure for each value that couldn't be converted.
+    """
+    columns = [
+        (column_index_from_string(col.upper()), _converter(target))
+        for col, target in spec.items()
+    ]
+    xlsx._invalidate_indexes(*spec)
+    ws = xlsx.ws
+    lastrow = ws.max_row if stoprow is None else min(stoprow, ws.max_row)
+    cells = ws._cells
+    failures = []
+    for row in range(startrow, lastrow + 1):
+        for column, convert in columns:
+            cell = cells.get((row, column))
+            if cell is None:
+                continue
+            value = cell.value
+            if _is_null(value):
+                continue
+            try:
+                new_value = convert(value)
+            except (TypeError, ValueError, OverflowError) as error:
+                failures.append(
+                    CoerceFailure(row, get_column_letter(column), value, str(error))
+                )
+                continue
+            if new_value is not value:
+                cell.value = new_value
+
+    return failures
@@ -0,0 +1,125 @@
+"""
+
+Opt-in lookup index for a single worksheet column, used by
+Xlsx.get_matching_value and Xlsx.set_matching_value in place of a
+linear scan of the column.
+
+"""
+from bisect import bisect_left
+
+from openpyxl.utils import column_index_from_string
+
+INDEX_MODES = ("exact", "substring-prefix")
+
+
+class _ColumnIndex:
+    """Maps the str() of each populated cell in a column to the row
+    numbers containing it.
+
+    mode="exact": a hash table of {value: [rows]}. Matches cells whose
+    value equals the search value.
+    mode="substring-prefix": a sorted list of (value, row) pairs searched
+    with bisect. Matches cells whose value starts with the search value.
+
+    Args:
+        ws (Worksheet): Worksheet (or read-only worksheet) to index.
+        col (str): Column letter to index. ex: 'A'
+        mode (str): 'exact' or 'substring-prefix'.
+        keep_rows (bool): Also keep the values of each indexed row so
+        lookups don't need to go back to the sheet (for read-only
+        worksheets, where every cell access re-parses the file).
+        columns (list): Column letters whose values keep_rows keeps.
+        Defaults to every column of the row. Values of other columns are
+        read from the sheet.
+    """
+
+    def __init__(
+        self,
+        ws,
+        col: str,
+        mode: str = "exact",
+        keep_rows: bool = False,
+        columns: list = None,
+    ):
+        if mode not in INDEX_MODES:
+            raise ValueError(
+                f"Invalid index mode '{mode}'. Use one of: {', '.join(INDEX_MODES)}"
+            )
+        self.mode = mode
+        self.row_values = {} if keep_rows else None
+        colnum = column_index_from_string(col.upper())
+        # {column number: position in the kept values}, or None for all
+        self.kept = None
+
+        if not keep_rows:
+            rows = ws.iter_rows(min_col=colnum, max_col=colnum, values_only=True)
+            position = 0
+        elif columns is None:
+            rows = ws.iter_rows(values_only=True)
+            position = colnum - 1
+        else:
+            kept = sorted({column_index_from_string(c.upper()) for c in columns})
+            self.kept = {number: i for i, number in enumerate(kept)}
+            mincol, maxcol = min(kept + [colnum]), max(kept + [colnum])
+            offsets = [number - mincol for number in kept]
+            rows = ws.iter_rows(min_col=mincol, max_col=maxcol, values_only=True)
+            position = colnum - mincol
+
+        exact, pairs = {}, []
+        for row, row_data in enumerate(rows, 1):
+            value = row_data[position] if len(row_data) > position else None
+            if not value:
+                continue
+            if mode == "exact":
+                exact.setdefault(str(value), []).append(row)
+            else:
+                pairs.append((str(value), row))
+            if keep_rows:
+                if self.kept is not None:
+                    row_data = tuple(
+                        row_data[i] if len(row_data) > i else None for i in offsets
+                    )
+                self.row_values[row] = row_data
+        self._exact = exact
+        self._pairs = sorted(pairs)
+
+    def rows(self, srchval) -> list:
+        """Returns the sorted row numbers of cells matching srchval."""
+        srchval = str(srchval)
+        if self.mode == "exact":
+            return self._exact.get(srchval, [])
+
+        rows = []
+        position = bisect_left(self._pairs, (srchval,))
+        while position < len(self._pairs) and self._pairs[position][0].startswith(
+            srchval
+        ):
+            rows.append(self._pairs[position][1])
+            position += 1
+
+        return sorted(rows)
+
+    def first_row(self, srchval, startrow: int = 1) -> int:
+        """Returns the first matching row number at or after startrow, or
+        None if there isn't one.
+        """
+        for row in self.rows(srchval):
+            if row >= startrow:
+                return row
+
+        return None
+
+    def value(self, ws, row: int, col: str):
+        """Returns the value of the cell in the passed column of an
+        indexed row.
+        """
+        colnum = column_index_from_string(col.upper())
+        if self.row_values is None or (
+            self.kept is not None and colnum not in self.kept
+        ):
+            return ws.cell(row=row, column=colnum).value
+
+        row_data = self.row_values[row]
+        if self.kept is not None:
+            return row_data[self.kept[colnum]]
+        return row_data[colnum - 1] if len(row_data) >= colnum else None
@@ -0,0 +1,185 @@
+"""
+
+Column-major NumPy export/import for Xlsx objects.
+
+Requirements:
+* numpy
+
+"""
+import datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = False
+
+from openpyxl.utils import column_index_from_string
+
+from .coerce import CONVERTERS, _infer_type, _is_null
+from .utils import _column_span
+
+# Accepted dtypes values and the type names they stand for
+DTYPE_NAMES = {
+    "int": "int",
+    int: "int",
+    "float": "float",
+    float: "float",
+    "datetime": "datetime",
+    datetime.datetime: "datetime",
+    "object": "object",
+    object: "object",
+    str: "object",
+}
+
+NUMPY_DTYPES = {
+    "int": "int64",
+    "float": "float64",
+    "datetime": "datetime64[us]",
+    "object": "object",
+}
+
+# Placeholder written under the mask for empty cells
+FILL_VALUES = {"int": 0, "float": float("nan"), "datetime": None, "object": None}
+
+
+def _require_numpy() -> None:
+    if not np:
+        raise ImportError(
+            "NumPy is required for column export/import: pip install numpy"
+        )
+
+
+def _to_columns(
+    xlsx, columns: list, dtypes: dict = None, startrow: int = 1, stoprow: int = None
+) -> dict:
+    """Reads the passed columns in a single pass and converts each one to
+    a NumPy masked array. Each column's type is taken from dtypes, or
+    inferred ('int', 'float', 'datetime' or 'object') using the same
+    conversions as number_type_fix and format_date. Empty cells are
+    masked.
+
+        Args:
+            xlsx (Xlsx): Xlsx object to read.
+            columns (list): Column letters to read. ex: ['C', 'E']
+            dtypes (dict, optional): {column: type} overrides, where type
+            is 'int', 'float', 'datetime' or 'object' (or int, float,
+            datetime.datetime, object/str). Defaults to None.
+            startrow (int, optional): First row to read. Defaults to 1.
+            stoprow (int, optional): Last row to read. Defaults to None.
+
+        Returns:
+            dict: {column letter: numpy.ma.MaskedArray}
+    """
+    _require_numpy()
+    dtypes = {column.upper(): dtype for column, dtype in (dtypes or {}).items()}
+    mincol, maxcol, positions = _column_span(*columns)
+    rows = list(
+        xlsx.ws.iter_rows(
+            min_row=startrow, max_row=stoprow, min_col=mincol, max_col=maxcol,
+            values_only=True,
+        )
+    )
+
+    arrays = {}
+    for column, position in zip(columns, positions):
+        column = column.upper()
+        values = [row[position] if position < len(row) else None for row in rows]
+        if column in dtypes:
+            type_name = DTYPE_NAMES.get(dtypes[column])
+            if type_name is None:
+                raise ValueError(
+                    f"Unsupported dtype {dtypes[column]!r} for column {column}"
+                )
+        else:
+            type_name = _infer_type(values)
+        arrays[column] = _to_masked_array(values, type_name, column, startrow)
+
+    return arrays
+
+
+def _to_masked_array(values: list, type_name: str, column: str, startrow: int):
+    """Converts a list of cell values to a masked array of type_name."""
+    mask = [_is_null(value) for value in values]
+    convert = CONVERTERS.get(type_name)
+    fill = FILL_VALUES[type_name]
+    data = []
+    for row, (value, empty) in enumerate(zip(values, mask), startrow):
+        if empty:
+            data.append(fill)
+            continue
+        try:
+            data.append(convert(value) if convert else value)
+        except (TypeError, ValueError) as error:
+            raise ValueError(
+                f"Can't convert {column}{row} value {value!r} to {type_name}"
+            ) from error
+
+    if type_name == "object":
+        array = np.empty(len(data), dtype=object)
+        array[:] = data
+    else:
+        array = np.array(data, dtype=NUMPY_DTYPES[type_name])
+
+    return np.ma.MaskedArray(array, mask=mask)
+
+
+def _from_columns(
+    xlsx, columns: dict, headers: dict = None, startrow: int = 1
+) -> None:
+    """Writes a dictionary of {column letter: array} to an Xlsx object
+    row by row with ws.append. Masked values, NaN and NaT are written as
+    empty cells. Arrays are converted to Python values in bulk with
+    tolist().
+
+        Args:
+            xlsx (Xlsx): Xlsx object to write to.
+            columns (dict): {column letter: numpy array or sequence}
+            headers (dict, optional): {column letter: header} written to
+            startrow above the data. Defaults to None.
+            startrow (int, optional): First row to write. Defaults to 1.
+    """
+    _require_numpy()
+    numbers = {
+        column: column_index_from_string(column.upper()) for column in columns
+    }
+    width = max(numbers.values(), default=0)
+    values = [
+        (numbers[column] - 1, _to_list(array)) for column, array in columns.items()
+    ]
+
+    while xlsx.ws._current_row < startrow - 1:
+        xlsx.ws.append([])
+    if headers:
+        # Headers can be set for columns without data
+        header_numbers = {
+            column_index_from_string(column.upper()): header
+            for column, header in headers.items()
+        }
+        row = [None] * max(header_numbers)
+        for number, header in header_numbers.items():
+            row[number - 1] = header
+        xlsx.ws.append(row)
+
+    length = max((len(column_values) for _position, column_values in values), default=0)
+    for index in range(length):
+        row = [None] * width
+        for position, column_values in values:
+            if index < len(column_values):
+                row[position] = column_values[index]
+        xlsx.ws.append(row)
+
+
+def _to_list(array) -> list:
+    """Converts an array (or sequence) to a list of Python values with
+    empty cells as None.
+    """
+    array = np.ma.asarray(array)
+    if array.dtype.kind == "M":
+        array = array.astype("datetime64[us]")
+        array = np.ma.masked_where(
+            np.isnat(array.filled(np.datetime64("NaT"))), array
+        )
+    elif array.dtype.kind == "f":
+        array = np.ma.masked_invalid(array)
+
+    return array.tolist()
@@ -0,0 +1,124 @@
+"""
+
+Copies columns of cell values (and optionally styles) from one Xlsx
+object to another.
+
+"""
+from openpyxl.utils import column_index_from_string
+
+from .styles import _style_copier
+
+
+def _copy_sheet_data(
+    xlsx, source, columns: dict, rows=None, styles: bool = False
+) -> None:
+    """Copies the passed source columns to the target columns of an Xlsx
+    object for every row up to source.ws.max_row. Each source column is
+    read once with iter_cols(values_only=True) and written by row and
+    column number. Read-only sources (which can't read by column) are
+    read in a single pass of rows over the span of the source columns.
+
+    If rows is passed, only those rows are copied, and they are written
+    to consecutive target rows starting at row 1.
+
+        Args:
+            xlsx (Xlsx): Xlsx object to copy the values to.
+            source (Xlsx): Xlsx object to copy the values from.
+            columns (dict{str: str}): {source column: target column}
+            letters. ex: {'A': 'C', 'D': 'B'}
+            rows (set/callable, optional): Row numbers to copy, or a
+            function receiving the tuple of values of each full source
+            row and returning True to copy it. Defaults to None (all
+            rows).
+            styles (bool, optional): Also copy each cell's font, fill,
+            border, alignment, protection and number format. Defaults to
+            False.
+    """
+    pairs = [
+        (column_index_from_string(scol.upper()), column_index_from_string(tcol.upper()))
+        for scol, tcol in columns.items()
+    ]
+    if not pairs:
+        return
+    copy_style = None
+    if styles:
+        copy_style = _style_copier(source.ws.parent, xlsx.ws.parent)
+
+    if source.mode == "r":
+        _copy_rows(xlsx.ws, source.ws, pairs, rows, copy_style)
+        return
+
+    max_row = source.ws.max_row
+    kept = None
+    if callable(rows):
+        kept = [
+            row
+            for row, values in enumerate(
+                source.ws.iter_rows(max_row=max_row, values_only=True), 1
+            )
+            if rows(values)
+        ]
+    elif rows is not None:
+        kept = sorted(row for row in rows if 1 <= row <= max_row)
+
+    for scol, tcol in pairs:
+        (column,) = source.ws.iter_cols(
+            min_col=scol, max_col=scol, max_row=max_row, values_only=not styles
+        )
+        if kept is not None:
+            column = [column[row - 1] for row in kept]
+        for row, item in enumerate(column, 1):
+            _write(xlsx.ws, row, tcol, item, copy_style)
+
+
+def _copy_rows(ws, source_ws, pairs: list, rows, copy_style) -> None:
+    """Copies the columns of a read-only source row by row, filtering
+    the rows as they are read.
+    """
+    if callable(rows):
+        # The filter needs the full rows
+        mincol, maxcol = 1, None
+    else:
+        mincol = min(scol for scol, _tcol in pairs)
+        maxcol = max(scol for scol, _tcol in pairs)
+    positions = [(scol - mincol, tcol) for scol, tcol in pairs]
+
+    target_row = 0
+    for row, items in enumerate(
+        source_ws.iter_rows(
+            min_col=mincol, max_col=maxcol, values_only=copy_style is None
+        ),
+        1,
+    ):
+        if callable(rows):
+            values = items if copy_style is None else [cell.value for cell in items]
+            if not rows(tuple(values)):
+                continue
+        elif rows is not None and row not in rows:
+            continue
+        target_row += 1
+        for position, tcol in positions:
+            item = items[position] if position < len(items) else None
+            _write(ws, target_row, tcol, item, copy_style)
+
+
+def _write(ws, row: int, column: int, item, copy_style) -> None:
+    """Writes a value (or a cell's value and style if copy_style is
+    passed) to the target cell. Empty values only clear existing cells,
+    so no empty cells are created.
+    """
+    if copy_style is None:
+        value, style = item, None
+    elif item is None:
+        value, style = None, None
+    else:
+        value, style = item.value, copy_style(item)
+
+    cell = ws._cells.get((row, column))
+    if cell is None:
+        if value is None and style is None:
+            return
+        cell = ws.cell(row=row, column=column)
+    cell.value = value
+    if style is not None:
+        cell._style = style
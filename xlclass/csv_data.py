@@ -0,0 +1,179 @@
+"""
+
+Streams csv file data to an Xlsx object in chunks of rows, with
+optional dialect sniffing, column selection and type inference, and
+streams Xlsx row data out to csv files.
+
+"""
+import csv
+import datetime
+from itertools import chain, islice
+
+from openpyxl.utils import column_index_from_string
+
+from .coerce import CONVERTERS, DATE_FORMAT, _infer_type, _is_null
+
+# Bytes of the file read to sniff the dialect
+SNIFF_SIZE = 64 * 1024
+
+
+def _copy_csv_data(
+    xlsx,
+    source_csv,
+    encoding: str = None,
+    dialect="excel",
+    columns: list = None,
+    limit: int = None,
+    infer_types: bool = False,
+    hdrrows: int = 1,
+    chunk_size: int = 10_000,
+) -> None:
+    """Appends the rows of a csv file to an Xlsx object (below any
+    existing data), reading chunk_size rows at a time so memory use
+    stays flat for any file size when the target is write-only.
+
+    With infer_types, each column's type ('int', 'float', 'datetime' or
+    'object') is inferred from the data rows of the first chunk only,
+    and the later values of the column are converted to it. Once a value
+    can't be converted, it and the rest of the column are written as the
+    original str (rows already written keep their converted values).
+    Values of 'object' columns are written as str, and empty values of
+    typed columns as empty cells.
+
+        Args:
+            xlsx (Xlsx): Xlsx object to append the rows to.
+            source_csv (str/pathlib.Path): Path to the csv file.
+            encoding (str, optional): File encoding. Defaults to None
+            (platform default).
+            dialect (str/csv.Dialect, optional): csv dialect or dialect
+            name, or 'sniff' to detect it from the start of the file.
+            Defaults to 'excel'.
+            columns (list, optional): Column letters of the csv columns
+            to copy, in the order to write them. ex: ['C', 'A']
+            Defaults to None (all columns).
+            limit (int, optional): Maximum number of csv rows (including
+            header rows) to copy. Defaults to None (all rows).
+            infer_types (bool, optional): Convert values to the inferred
+            type of their column. Defaults to False (all values are str).
+            hdrrows (int, optional): Number of header rows at the top of
+            the file, copied as str and left out of type inference.
+            Defaults to 1.
+            chunk_size (int, optional): Number of rows read at a time.
+            Defaults to 10_000.
+    """
+    positions = None
+    if columns is not None:
+        positions = [column_index_from_string(col.upper()) - 1 for col in columns]
+
+    with open(source_csv, "r", encoding=encoding, newline="") as f:
+        if dialect == "sniff":
+            dialect = csv.Sniffer().sniff(f.read(SNIFF_SIZE))
+            f.seek(0)
+        rows = csv.reader(f, dialect)
+        if limit is not None:
+            rows = islice(rows, limit)
+        if positions is not None:
+            rows = (_select(row, positions) for row in rows)
+
+        if infer_types:
+            for row in islice(rows, hdrrows):
+                xlsx._append_row(row)
+            first_chunk = list(islice(rows, chunk_size))
+            converters = _column_converters(first_chunk)
+            rows = (_convert_row(row, converters) for row in chain(first_chunk, rows))
+
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            for row in chunk:
+                xlsx._append_row(row)
+
+
+def _select(row: list, positions: list) -> list:
+    """Returns the values at positions, with "" for any missing value."""
+    return [row[position] if position < len(row) else "" for position in positions]
+
+
+def _column_converters(rows: list) -> list:
+    """Infers the type of each column of rows and returns its converter
+    (None for 'object' columns).
+    """
+    width = max(map(len, rows), default=0)
+    converters = []
+    for position in range(width):
+        type_name = _infer_type(row[position] for row in rows if position < len(row))
+        converters.append(CONVERTERS.get(type_name))
+
+    return converters
+
+
+def _convert_row(row: list, converters: list) -> list:
+    """Converts each value of row with its column's converter, keeping
+    the str value if there is no converter. If a converter fails, it is
+    removed from converters, so the rest of its column is kept as str.
+    """
+    converted = []
+    for position, value in enumerate(row):
+        converter = converters[position] if position < len(converters) else None
+        if converter is None:
+            converted.append(value)
+        elif _is_null(value):
+            converted.append(None)
+        else:
+            try:
+                converted.append(converter(value))
+            except ValueError:
+                converters[position] = None
+                converted.append(value)
+
+    return converted
+
+
+def _write_csv(
+    xlsx,
+    path,
+    columns: list = None,
+    startrow: int = 1,
+    stoprow: int = None,
+    chunk_size: int = 10_000,
+    delimiter: str = ",",
+    date_format: str = DATE_FORMAT,
+    encoding: str = None,
+) -> None:
+    """Writes the cell values of an Xlsx object to a csv file one chunk
+    of rows at a time (see Xlsx.iter_rows_chunked), so only chunk_size
+    rows are held in memory. Dates and datetimes are written with
+    date_format (the format_date format by default) and empty cells as
+    empty fields.
+
+        Args:
+            xlsx (Xlsx): Xlsx object to read values from.
+            path (str/pathlib.Path): Path of the csv file to write.
+            columns (list, optional): Column letters to write, in order.
+            Defaults to None (all columns).
+            startrow (int, optional): First row to write. Defaults to 1.
+            stoprow (int, optional): Last row to write. Defaults to None.
+            chunk_size (int, optional): Number of rows read at a time.
+            Defaults to 10_000.
+            delimiter (str, optional): Field delimiter. ('\\t' for tsv)
+            Defaults to ','.
+            date_format (str, optional): strftime format for dates.
+            Defaults to DATE_FORMAT (MM/DD/YYYY).
+            encoding (str, optional): File encoding. Defaults to None
+            (platform default).
+    """
+    with open(path, "w", encoding=encoding, newline="") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        for chunk in xlsx.iter_rows_chunked(
+            startrow=startrow, stoprow=stoprow, chunk_size=chunk_size, columns=columns
+        ):
+            writer.writerows(
+                [
+                    value.strftime(date_format)
+                    if isinstance(value, datetime.date)
+                    else value
+                    for value in row
+                ]
+                for row in chunk
+            )
@@ -0,0 +1,135 @@
+"""
+
+Compiled string matchers for Xlsx.find_replace and Xlsx.move_values.
+All the strings to find are joined into one alternation regex, which is
+compiled once per mapping/list and cached, so each cell is searched in
+a single pass however many strings there are.
+
+"""
+import re
+from functools import lru_cache, partial
+
+
+def _skip_set(skip) -> frozenset:
+    """Returns the lowercase set of values to skip (cell values are
+    compared to it in lowercase).
+    """
+    return frozenset(str(item).lower() for item in skip or ())
+
+
+def _alternation(strings, whole_word: bool) -> str:
+    """Returns a regex matching any of strings, tried in order. With
+    whole_word, a match can't be next to another letter, digit or '_'.
+    """
+    pattern = "|".join(re.escape(string) for string in strings)
+    if whole_word:
+        return rf"(?<!\w)(?:{pattern})(?!\w)"
+
+    return f"(?:{pattern})"
+
+
+@lru_cache(maxsize=64)
+def _compile_replacer(pairs: tuple, ignore_case: bool, whole_word: bool):
+    pairs = [(find, replace) for find, replace in pairs if find]
+    if not pairs:
+        return None
+    regex = re.compile(
+        _alternation([find for find, _replace in pairs], whole_word),
+        re.IGNORECASE if ignore_case else 0,
+    )
+    lookup = {}
+    for find, replace in pairs:
+        lookup.setdefault(find.lower() if ignore_case else find, replace)
+
+    if ignore_case:
+
+        def replacement(match):
+            return lookup.get(match.group().lower(), match.group())
+
+    else:
+
+        def replacement(match):
+            return lookup[match.group()]
+
+    return partial(regex.subn, replacement)
+
+
+def _replacer(fndrplc: dict, ignore_case: bool = False, whole_word: bool = False):
+    """Returns a cached function(text) -> (new text, replacements made)
+    replacing every find str of fndrplc in a single pass, or None if
+    there's nothing to find. Where several finds match at the same
+    place, the first one in fndrplc is used, and replaced text isn't
+    searched again.
+    """
+    return _compile_replacer(tuple(fndrplc.items()), ignore_case, whole_word)
+
+
+class _Finder:
+    """Finds which of a list of strings, in list order, is in a text."""
+
+    __slots__ = (
+        "vals",
+        "ignore_case",
+        "whole_word",
+        "flags",
+        "index",
+        "regex",
+        "_removers",
+    )
+
+    def __init__(self, vals: tuple, ignore_case: bool, whole_word: bool):
+        self.vals = [item for item in vals if item]
+        self.ignore_case = ignore_case
+        self.whole_word = whole_word
+        self.flags = re.IGNORECASE if ignore_case else 0
+        # Position of each str in vals (matched text -> list index)
+        self.index = {}
+        for i, item in enumerate(self.vals):
+            self.index.setdefault(self._key(item), i)
+        # Zero-width lookahead, so every position a str starts at is
+        # found, including overlapping ones
+        self.regex = re.compile(
+            f"(?=({_alternation(self.vals, whole_word)}))", self.flags
+        )
+        self._removers = {}
+
+    def _key(self, text: str) -> str:
+        return text.lower() if self.ignore_case else text
+
+    def find(self, text: str):
+        """Returns (text with the found str removed, found str) for the
+        first str of vals in text, or None if there isn't one.
+        """
+        first = None
+        for match in self.regex.finditer(text):
+            # At each position the earliest listed str that matches wins,
+            # so the lowest index seen is the first listed str in text
+            i = self.index.get(self._key(match.group(1)))
+            if i is not None and (first is None or i < first):
+                first = i
+                if not first:
+                    break
+        if first is None:
+            return None
+        item = self.vals[first]
+        if not (self.ignore_case or self.whole_word):
+            return text.replace(item, ""), item
+        remover = self._removers.get(item)
+        if remover is None:
+            remover = self._removers[item] = re.compile(
+                _alternation([item], self.whole_word), self.flags
+            )
+
+        return remover.sub("", text), item
+
+
+@lru_cache(maxsize=64)
+def _compile_finder(vals: tuple, ignore_case: bool, whole_word: bool):
+    finder = _Finder(vals, ignore_case, whole_word)
+
+    return finder if finder.vals else None
+
+
+def _finder(vals, ignore_case: bool = False, whole_word: bool = False):
+    """Returns a cached _Finder for vals, or None if vals is empty."""
+    return _compile_finder(tuple(vals), ignore_case, whole_word)
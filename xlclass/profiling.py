@@ -0,0 +1,365 @@
+"""
+
+Opt-in profiling for Xlsx objects. Enabled with Xlsx(..., profile=True)
+(or profile=hook), or for every object by setting the XLCLASS_PROFILE
+environment variable. Each call to a public method of a profiled object
+records its wall time, the rows it scanned, the cells it read and wrote,
+and the peak memory traced while it ran (see Xlsx.stats()).
+
+Profiling swaps the object's class for a subclass with wrapped public
+methods, so objects that aren't profiled run the original methods.
+Cell reads and writes are counted by replacing openpyxl's Cell.value
+property while any profiled call runs. The calls running in each thread
+are tracked separately, and only cells of the profiled object's sheet
+are counted, so other objects' cells (in any thread) aren't counted,
+although they go through the replaced property until the call ends.
+The property is replaced when the first profiled call (in any thread)
+starts and restored when the last one ends, and tracemalloc is started
+and stopped the same way (unless it was already tracing).
+
+"""
+import functools
+import inspect
+import os
+import threading
+import time
+import tracemalloc
+
+from openpyxl.cell.cell import Cell
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+
+# Environment variable enabling profiling for every Xlsx object
+ENV_VAR = "XLCLASS_PROFILE"
+
+# Hooks called with every CallStats record (see add_hook)
+_hooks = []
+
+# Counters of the profiled calls running in each thread (innermost last)
+_local = threading.local()
+
+# Profiled calls running in all threads, and the lock guarding the count
+_running = 0
+_running_lock = threading.Lock()
+
+# Whether the running profiled calls started tracemalloc (so the last
+# one to end stops it)
+_started_tracing = False
+
+_value_property = Cell.value
+_read_only_cells_by_row = ReadOnlyWorksheet._cells_by_row
+
+_profiled_classes = {}
+
+
+class CallStats:
+    """Measurements for one call of a profiled Xlsx method.
+
+    Attrs:
+        *.method (str): Method name ('load' for loading the workbook).
+        *.seconds (float): Wall time of the call.
+        *.rows_scanned (int): Rows of the object's sheet with cells read
+            or written, plus rows streamed from it in read-only mode.
+        *.cells_read (int): Cell values read from the object's sheet.
+        *.cells_written (int): Cell values written to the object's sheet.
+        *.peak_bytes (int): Peak memory traced during the call, above the
+            memory in use when it started. The peak is never reset, so if
+            it wasn't exceeded during the call (possible when other
+            profiled calls overlap it, or tracemalloc was already
+            tracing), the memory still in use when the call ended is
+            used instead, which can be lower than the call's peak.
+    """
+
+    __slots__ = (
+        "method",
+        "seconds",
+        "rows_scanned",
+        "cells_read",
+        "cells_written",
+        "peak_bytes",
+    )
+
+    def __init__(self, method: str):
+        self.method = method
+        self.seconds = 0.0
+        self.rows_scanned = 0
+        self.cells_read = 0
+        self.cells_written = 0
+        self.peak_bytes = 0
+
+    def __repr__(self):
+        return (
+            f"CallStats(method={self.method!r}, seconds={self.seconds:.6f}, "
+            f"rows_scanned={self.rows_scanned}, cells_read={self.cells_read}, "
+            f"cells_written={self.cells_written}, peak_bytes={self.peak_bytes})"
+        )
+
+    def as_dict(self) -> dict:
+        """Returns the measurements as a dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _Counter:
+    """Cell and row counts collected while a profiled call runs."""
+
+    __slots__ = ("xlsx", "cells_read", "cells_written", "rows", "rows_streamed")
+
+    def __init__(self, xlsx):
+        self.xlsx = xlsx
+        self.cells_read = 0
+        self.cells_written = 0
+        self.rows = set()
+        self.rows_streamed = 0
+
+
+def add_hook(hook) -> None:
+    """Adds a function called with the CallStats of every profiled call
+    of any Xlsx object.
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook) -> None:
+    """Removes a function added with add_hook."""
+    _hooks.remove(hook)
+
+
+def _profile_option(profile):
+    """Returns the profile argument of Xlsx(), or True if it wasn't
+    passed and the XLCLASS_PROFILE environment variable is set (to
+    anything but '', '0' or 'false').
+    """
+    if profile is None:
+        return os.environ.get(ENV_VAR, "").lower() not in ("", "0", "false")
+
+    return profile
+
+
+def _active() -> list:
+    """Returns the counters of the profiled calls running in this thread."""
+    try:
+        return _local.active
+    except AttributeError:
+        _local.active = []
+        return _local.active
+
+
+def _counter(ws):
+    """Returns the counter of this thread's innermost profiled call if ws
+    is the profiled object's sheet, otherwise None.
+    """
+    active = _active()
+    if active and ws is getattr(active[-1].xlsx, "ws", None):
+        return active[-1]
+
+    return None
+
+
+def _get_value(cell):
+    counter = _counter(cell.parent)
+    if counter is not None:
+        counter.cells_read += 1
+        counter.rows.add(cell.row)
+    return _value_property.fget(cell)
+
+
+def _set_value(cell, value):
+    counter = _counter(cell.parent)
+    if counter is not None:
+        counter.cells_written += 1
+        counter.rows.add(cell.row)
+    _value_property.fset(cell, value)
+
+
+def _counting_cells_by_row(self, *args, **kwargs):
+    for row in _read_only_cells_by_row(self, *args, **kwargs):
+        counter = _counter(self)
+        if counter is not None:
+            counter.rows_streamed += 1
+            counter.cells_read += len(row)
+        yield row
+
+
+def _start_counting(counter: _Counter) -> None:
+    """Adds a running profiled call. The first one replaces the counted
+    properties and starts tracemalloc if it isn't tracing.
+    """
+    global _running, _started_tracing
+    with _running_lock:
+        if not _running:
+            Cell.value = property(_get_value, _set_value, doc=_value_property.__doc__)
+            ReadOnlyWorksheet._cells_by_row = _counting_cells_by_row
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+        _running += 1
+    _active().append(counter)
+
+
+def _stop_counting() -> None:
+    """Removes a running profiled call. The last one restores the
+    counted properties and stops tracemalloc if the first one started
+    it.
+    """
+    global _running, _started_tracing
+    _active().pop()
+    with _running_lock:
+        _running -= 1
+        if not _running:
+            Cell.value = _value_property
+            ReadOnlyWorksheet._cells_by_row = _read_only_cells_by_row
+            if _started_tracing:
+                tracemalloc.stop()
+                _started_tracing = False
+
+
+class _Measurement:
+    """Measures one profiled call, which can be run in several steps (a
+    generator is measured while each of its items is produced).
+    """
+
+    def __init__(self, xlsx, method: str):
+        self.stats = CallStats(method)
+        self.counter = _Counter(xlsx)
+
+    def run(self, func, *args, **kwargs):
+        _start_counting(self.counter)
+        memory, peak = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.stats.seconds += time.perf_counter() - start
+            end_memory, end_peak = tracemalloc.get_traced_memory()
+            _stop_counting()
+            # The peak is shared with other calls, so it only measures
+            # this one if it was exceeded while it ran
+            used = (end_peak if end_peak > peak else end_memory) - memory
+            self.stats.peak_bytes = max(self.stats.peak_bytes, used)
+
+    def finish(self, xlsx) -> CallStats:
+        """Completes the record and passes it to the object's hook and
+        the global hooks.
+        """
+        stats = self.stats
+        stats.cells_read = self.counter.cells_read
+        stats.cells_written = self.counter.cells_written
+        stats.rows_scanned = len(self.counter.rows) + self.counter.rows_streamed
+        xlsx._profile_stats.append(stats)
+        for hook in [xlsx._profile_hook] + _hooks:
+            if callable(hook):
+                hook(stats)
+
+        return stats
+
+
+def _profiled_call(xlsx, method: str, func, *args, **kwargs):
+    """Runs func(*args, **kwargs) as a profiled call of xlsx. Calls made
+    from inside another profiled call of the same object are counted in
+    the outer call only.
+    """
+    if xlsx._profile_depth:
+        return func(*args, **kwargs)
+    measurement = _Measurement(xlsx, method)
+    xlsx._profile_depth += 1
+    try:
+        return measurement.run(func, *args, **kwargs)
+    finally:
+        xlsx._profile_depth -= 1
+        measurement.finish(xlsx)
+
+
+def _profiled_generator(xlsx, method: str, generator):
+    """Yields the items of a generator method, measuring the time spent
+    producing them. The call is recorded when the generator finishes or
+    is closed.
+    """
+    measurement = _Measurement(xlsx, method)
+    try:
+        while True:
+            xlsx._profile_depth += 1
+            try:
+                item = measurement.run(next, generator)
+            except StopIteration:
+                return
+            finally:
+                xlsx._profile_depth -= 1
+            yield item
+    finally:
+        generator.close()
+        measurement.finish(xlsx)
+
+
+def _wrap(name: str, method):
+    """Wraps a public Xlsx method to record each call."""
+    if inspect.isgeneratorfunction(inspect.unwrap(method)):
+
+        @functools.wraps(method)
+        def generator_wrapper(self, *args, **kwargs):
+            generator = method(self, *args, **kwargs)
+            if self._profile_depth:
+                return generator
+            return _profiled_generator(self, name, generator)
+
+        return generator_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return _profiled_call(self, name, method, self, *args, **kwargs)
+
+    return wrapper
+
+
+def _profiled_class(cls):
+    """Returns the subclass of cls with every public method wrapped,
+    creating it on first use.
+    """
+    profiled = _profiled_classes.get(cls)
+    if profiled is None:
+        namespace = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if not name.startswith("_") and inspect.isfunction(value):
+                    namespace[name] = _wrap(name, value)
+        namespace.pop("stats", None)
+        namespace["__module__"] = cls.__module__
+        profiled = type(cls.__name__, (cls,), namespace)
+        profiled.__qualname__ = f"{cls.__qualname__} (profiled)"
+        _profiled_classes[cls] = profiled
+
+    return profiled
+
+
+def _enable_profiling(xlsx, hook=None) -> None:
+    """Switches an Xlsx object to the profiled subclass of its class.
+    hook, if callable, is called with the CallStats of each call.
+    """
+    if not isinstance(xlsx, tuple(_profiled_classes.values())):
+        xlsx.__class__ = _profiled_class(xlsx.__class__)
+    xlsx._profile_stats = []
+    xlsx._profile_depth = 0
+    xlsx._profile_hook = hook
+
+
+def _summarize(records: list) -> dict:
+    """Totals the CallStats records for each method.
+
+    Returns:
+        dict: {method: {"calls": int, "seconds": float, ...}}
+    """
+    summary = {}
+    for stats in records:
+        totals = summary.setdefault(
+            stats.method,
+            dict.fromkeys(
+                ("calls", "seconds", "rows_scanned", "cells_read", "cells_written"),
+                0,
+            ),
+        )
+        totals["calls"] += 1
+        totals["seconds"] += stats.seconds
+        totals["rows_scanned"] += stats.rows_scanned
+        totals["cells_read"] += stats.cells_read
+        totals["cells_written"] += stats.cells_written
+        totals["peak_bytes"] = max(totals.get("peak_bytes", 0), stats.peak_bytes)
+
+    return summary
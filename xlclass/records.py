@@ -0,0 +1,40 @@
+"""
+
+Lightweight row records yielded by Xlsx.iter_records().
+
+"""
+
+
+class Record:
+    """A single row of sheet data. Holds the row's key, row number and a
+    tuple of values, and shares one tuple of headers with every other
+    record from the same sheet, so no per-row dictionary is built.
+    Values can be read by header: record["Header"].
+
+    Attrs:
+        *.key: Value from the key column (or 4-digit row number string).
+        *.row (int): Row number the values were read from.
+        *.values (tuple): Cell values in the order of the headers.
+        *.headers (tuple): Header values shared by all records.
+    """
+
+    __slots__ = ("key", "row", "values", "headers", "_positions")
+
+    def __init__(
+        self, key, row: int, values: tuple, headers: tuple, positions: dict
+    ):
+        self.key = key
+        self.row = row
+        self.values = values
+        self.headers = headers
+        self._positions = positions
+
+    def __getitem__(self, header):
+        return self.values[self._positions[header]]
+
+    def __repr__(self):
+        return f"Record(key={self.key!r}, row={self.row}, values={self.values!r})"
+
+    def as_dict(self) -> dict:
+        """Returns the record as a {header: value} dictionary."""
+        return dict(zip(self.headers, self.values))
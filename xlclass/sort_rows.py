@@ -0,0 +1,291 @@
+"""
+
+Sorts Xlsx row data on one or more typed key columns.
+
+"""
+import datetime
+import heapq
+import pickle
+import tempfile
+from contextlib import ExitStack
+from itertools import islice
+
+from .utils import _column_span
+
+SORT_TYPES = ("text", "numeric", "date")
+
+# Date formats tried (in order) when sorting str values as dates
+DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d", "%m/%d/%y")
+
+
+class _Descending:
+    """Wraps a key value to reverse its sort order."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __getstate__(self):
+        return self.value
+
+    def __setstate__(self, state):
+        self.value = state
+
+
+def _text_key(value):
+    return (0, str(value).casefold())
+
+
+def _numeric_key(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    try:
+        return (0, float(str(value).replace(",", "")))
+    except ValueError:
+        # Non-numbers sort after all numbers
+        return (1, str(value).casefold())
+
+
+def _date_key(value):
+    if isinstance(value, datetime.datetime):
+        return (0, value)
+    if isinstance(value, datetime.date):
+        return (0, datetime.datetime.combine(value, datetime.time()))
+    text = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return (0, datetime.datetime.strptime(text, fmt))
+        except ValueError:
+            continue
+    # Non-dates sort after all dates
+    return (1, text.casefold())
+
+
+KEY_FUNCTIONS = {"text": _text_key, "numeric": _numeric_key, "date": _date_key}
+
+
+def _parse_sort_keys(keys) -> list:
+    """Normalizes the passed keys to [(column, type, descending)].
+    Each key can be a column letter or a (column, type, direction) tuple
+    with the type and direction optional. ex: ("C", "numeric", "desc")
+    """
+    if isinstance(keys, str):
+        keys = [keys]
+    parsed = []
+    for key in keys:
+        if isinstance(key, str):
+            key = (key,)
+        column = key[0]
+        sort_type = key[1] if len(key) > 1 else "text"
+        direction = key[2] if len(key) > 2 else "asc"
+        if sort_type not in SORT_TYPES:
+            raise ValueError(
+                f"Invalid sort type '{sort_type}'. "
+                f"Use one of: {', '.join(SORT_TYPES)}"
+            )
+        if direction not in ("asc", "desc"):
+            raise ValueError(
+                f"Invalid sort direction '{direction}'. Use 'asc' or 'desc'."
+            )
+        parsed.append((column, sort_type, direction == "desc"))
+
+    return parsed
+
+
+def _row_key_function(keys: list, positions: list, empty_last: bool = True):
+    """Builds a function returning the composite sort key for a tuple of
+    row values. Empty cells sort last in either direction, unless
+    empty_last is False, where they are keyed like any other value
+    (None as the text 'none').
+    """
+    parts = [
+        (position, KEY_FUNCTIONS[sort_type], descending)
+        for (_column, sort_type, descending), position in zip(keys, positions)
+    ]
+
+    def row_key(values):
+        key = []
+        for position, key_function, descending in parts:
+            value = values[position]
+            if empty_last and (value is None or value == ""):
+                key.append((2,))
+                continue
+            rank, sort_value = key_function(value)
+            key.append((rank, _Descending(sort_value) if descending else sort_value))
+        return tuple(key)
+
+    return row_key
+
+
+def _spill(chunk: list, stack: ExitStack):
+    """Sorts a chunk of items and writes it to a temporary file. Returns
+    a generator reading the sorted items back from the file.
+    """
+    chunk.sort()
+    temp = stack.enter_context(tempfile.TemporaryFile())
+    for item in chunk:
+        pickle.dump(item, temp, pickle.HIGHEST_PROTOCOL)
+    temp.seek(0)
+
+    def read():
+        while True:
+            try:
+                yield pickle.load(temp)
+            except EOFError:
+                return
+
+    return read()
+
+
+def _sorted_items(items, chunk_size: int = None, stack: ExitStack = None):
+    """Sorts (key, row, ...) items. If chunk_size is passed and there are
+    more items than that, the items are sorted in chunks that are written
+    to temporary files and merged, so only one chunk is held in memory.
+    """
+    items = iter(items)
+    if not chunk_size:
+        return iter(sorted(items))
+
+    chunk = list(islice(items, chunk_size))
+    readers = []
+    while True:
+        next_chunk = list(islice(items, chunk_size))
+        if not next_chunk and not readers:
+            # Everything fit in one chunk
+            return iter(sorted(chunk))
+        readers.append(_spill(chunk, stack))
+        if not next_chunk:
+            return heapq.merge(*readers)
+        chunk = next_chunk
+
+
+def _sort_rows(
+    xlsx,
+    keys,
+    startrow: int = 1,
+    stoprow: int = None,
+    chunk_size: int = None,
+    target=None,
+    empty_last: bool = True,
+) -> None:
+    """Sorts the rows from startrow to stoprow (inclusive) of an Xlsx
+    object on the passed keys. The sort is stable: rows with equal keys
+    keep their original order.
+
+    Without a target, the Cell objects of the sorted rows are moved to
+    their new rows in place, keeping their values and styles, along
+    with the row dimensions. Only the key values are read into memory
+    (spilled to temporary files in chunks of chunk_size keys if passed).
+
+    With a target Xlsx object (a write-only object for large files), the
+    source can be opened in read-only mode. Whole rows of values are
+    sorted in chunks of chunk_size rows through temporary files and then
+    appended to the target, after the rows above startrow and followed
+    by the rows below stoprow.
+
+        Args:
+            xlsx (Xlsx): Xlsx object to sort.
+            keys (list): Column letters or (column, type, direction)
+            tuples. type is 'text' (case-insensitive), 'numeric' or
+            'date', and direction is 'asc' or 'desc'.
+            startrow (int, optional): First row to sort. Defaults to 1.
+            stoprow (int, optional): Last row to sort. Defaults to None
+            (last row of the sheet).
+            chunk_size (int, optional): Maximum number of rows sorted in
+            memory at once. Defaults to None (sort all rows in memory).
+            target (Xlsx, optional): Xlsx object to append the sorted
+            rows to. Defaults to None (sort in place).
+            empty_last (bool, optional): Sort empty key cells last.
+            Defaults to True.
+    """
+    keys = _parse_sort_keys(keys)
+
+    with ExitStack() as stack:
+        if target is not None:
+            _sort_to_target(
+                xlsx, keys, startrow, stoprow, chunk_size, target, stack, empty_last
+            )
+            return
+
+        stoprow = stoprow or xlsx.ws.max_row
+        mincol, maxcol, positions = _column_span(*(column for column, *_ in keys))
+        row_key = _row_key_function(keys, positions, empty_last)
+        items = (
+            (row_key(values), row)
+            for row, values in enumerate(
+                xlsx.ws.iter_rows(
+                    min_row=startrow, max_row=stoprow, min_col=mincol,
+                    max_col=maxcol, values_only=True,
+                ),
+                startrow,
+            )
+        )
+        order = [row for _key, row in _sorted_items(items, chunk_size, stack)]
+
+    _apply_row_order(xlsx.ws, order, startrow)
+
+
+def _sort_to_target(
+    xlsx, keys, startrow, stoprow, chunk_size, target, stack, empty_last=True
+):
+    """Streams the sheet to the target Xlsx object with the rows from
+    startrow to stoprow sorted. Every row goes through the chunked sort
+    as a (group, key, row, values) item, where the group keeps the rows
+    above startrow first and the rows below stoprow last, so memory use
+    stays bounded however the rows are split.
+    """
+    mincol, _maxcol, positions = _column_span(*(column for column, *_ in keys))
+    # Positions within full rows (which start at column A)
+    positions = [position + mincol - 1 for position in positions]
+    row_key = _row_key_function(keys, positions, empty_last)
+    width = max(positions) + 1
+
+    def items():
+        for row, values in enumerate(xlsx.ws.iter_rows(values_only=True), 1):
+            if row < startrow:
+                yield (0, (), row, values)
+            elif stoprow and row > stoprow:
+                yield (2, (), row, values)
+            else:
+                if len(values) < width:
+                    values = tuple(values) + (None,) * (width - len(values))
+                yield (1, row_key(values), row, values)
+
+    for _group, _key, _row, values in _sorted_items(items(), chunk_size, stack):
+        target._append_row(values)
+
+
+def _apply_row_order(ws, order: list, startrow: int) -> None:
+    """Moves the Cell objects (and row dimensions) of the rows listed in
+    order so that order[0] becomes startrow, order[1] becomes startrow+1,
+    etc.
+    """
+    new_rows = {old: new for new, old in enumerate(order, startrow)}
+    if all(old == new for old, new in new_rows.items()):
+        return
+
+    moved = {}
+    for (row, column), cell in ws._cells.items():
+        new_row = new_rows.get(row)
+        if new_row is not None:
+            cell.row = new_row
+            moved[(new_row, column)] = cell
+        else:
+            moved[(row, column)] = cell
+    ws._cells.clear()
+    ws._cells.update(moved)
+
+    dimensions = [
+        ws.row_dimensions.pop(row)
+        for row in [row for row in ws.row_dimensions if row in new_rows]
+    ]
+    for dimension in dimensions:
+        dimension.index = new_rows[dimension.index]
+        ws.row_dimensions[dimension.index] = dimension
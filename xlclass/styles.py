@@ -0,0 +1,262 @@
+"""
+
+Shared style objects for Xlsx formatting methods. Each distinct Font,
+PatternFill or Border is built once and reused, and is registered with
+the workbook once per styling pass instead of once per cell.
+
+"""
+from functools import lru_cache
+
+from openpyxl.formatting.rule import FormulaRule, Rule
+from openpyxl.styles import Border, Font, PatternFill, Side
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.differential import DifferentialStyle
+from openpyxl.styles.numbers import (
+    BUILTIN_FORMATS_MAX_SIZE,
+    BUILTIN_FORMATS_REVERSE,
+    NumberFormat,
+)
+from openpyxl.utils import column_index_from_string
+
+# Hex codes for the named background fill colors (see COLORS)
+COLOR_CODES = {
+    "red": "FF0000",
+    "green": "00b050",
+    "orange": "FFC000",
+    "yellow": "FFFF00",
+    "gray": "C0C0C0",
+}
+
+# Workbook style collection and StyleArray field for each cell style
+STYLE_ATTRIBUTES = {
+    "font": ("_fonts", "fontId"),
+    "fill": ("_fills", "fillId"),
+    "border": ("_borders", "borderId"),
+}
+
+HEX_DIGITS = set("0123456789abcdefABCDEF")
+
+# Last row of an Excel worksheet
+MAX_ROW = 1_048_576
+
+# Workbook style collection for each StyleArray field copied by
+# _style_copier (numFmtId is handled separately)
+COPIED_STYLE_FIELDS = {
+    "fontId": "_fonts",
+    "fillId": "_fills",
+    "borderId": "_borders",
+    "alignmentId": "_alignments",
+    "protectionId": "_protections",
+}
+
+
+def _color_code(color: str) -> str:
+    """Returns the hex code for a COLORS name or a 6/8 digit hex color
+    (with or without a leading '#'), or None if it isn't either.
+    """
+    code = COLOR_CODES.get(color.lower(), color.lstrip("#"))
+    if len(code) in (6, 8) and set(code) <= HEX_DIGITS:
+        return code
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_fill(color: str) -> PatternFill:
+    """Returns the shared solid PatternFill for a COLORS name ('red',
+    'gray', etc.) or a hex color ('FF0000'). Returns None for any other
+    value.
+    """
+    code = _color_code(color)
+    if code is None:
+        return None
+
+    return PatternFill(fgColor=code, fill_type="solid")
+
+
+@lru_cache(maxsize=None)
+def get_conditional_fill(color: str) -> PatternFill:
+    """Returns the shared solid PatternFill for conditional formatting
+    rules. (Excel reads the background color of differential fills, so
+    both colors are set.) Returns None for unknown colors.
+    """
+    code = _color_code(color)
+    if code is None:
+        return None
+
+    return PatternFill(start_color=code, end_color=code, fill_type="solid")
+
+
+@lru_cache(maxsize=None)
+def get_font(name: str = None, size: float = None, bold: bool = False) -> Font:
+    """Returns the shared Font with the passed name, size and weight."""
+    return Font(name=name, size=size, bold=bold)
+
+
+@lru_cache(maxsize=None)
+def get_border(style: str = "thin") -> Border:
+    """Returns the shared Border with the passed side style on all four
+    sides.
+    """
+    side = Side(style=style)
+
+    return Border(left=side, right=side, top=side, bottom=side)
+
+
+def _number_format_id(wb, number_format: str) -> int:
+    """Returns the id of a number format, adding it to the workbook's
+    custom formats if it isn't a built-in format.
+    """
+    if number_format in BUILTIN_FORMATS_REVERSE:
+        return BUILTIN_FORMATS_REVERSE[number_format]
+
+    return wb._number_formats.add(number_format) + BUILTIN_FORMATS_MAX_SIZE
+
+
+def _apply_styles(ws, cells, **styles) -> None:
+    """Sets the passed styles (font=, fill=, border=, number_format=) on
+    every cell in cells. Each style is added to the workbook's style
+    collections once, and its index is then written to each cell's style
+    array, instead of hashing and registering the style object again for
+    every cell.
+
+    Args:
+        ws (Worksheet): Worksheet the cells belong to.
+        cells (iterable): Cells to style.
+        **styles: Font, PatternFill and/or Border objects, and/or a
+            number format str, to set.
+    """
+    wb = ws.parent
+    updates = []
+    for name, style in styles.items():
+        if style is None:
+            continue
+        if name == "number_format":
+            updates.append(("numFmtId", _number_format_id(wb, style)))
+        else:
+            collection, key = STYLE_ATTRIBUTES[name]
+            updates.append((key, getattr(wb, collection).add(style)))
+    for cell in cells:
+        if not cell._style:
+            cell._style = StyleArray()
+        for key, style_id in updates:
+            setattr(cell._style, key, style_id)
+
+
+def _format_column(
+    ws, col: str, number_format: str, startrow: int = 1, stoprow: int = None
+) -> None:
+    """Sets a number format on the cells with values in a column, from
+    startrow to stoprow (included). Each cell is visited because a cell's
+    own style overrides its column's style, so formatting the column
+    alone wouldn't change how existing values are displayed. Empty cells
+    aren't created.
+    """
+    column = column_index_from_string(col.upper())
+    lastrow = ws.max_row if stoprow is None else min(stoprow, ws.max_row)
+    cells = (ws._cells.get((row, column)) for row in range(startrow, lastrow + 1))
+    _apply_styles(
+        ws,
+        (cell for cell in cells if cell is not None and cell.value),
+        number_format=number_format,
+    )
+
+
+def _add_number_format_rule(
+    ws, col: str, number_format: str, startrow: int = 1, stoprow: int = None
+) -> None:
+    """Adds a single conditional formatting rule displaying the cells of
+    a column, from startrow to stoprow (included, or the last row of the
+    worksheet), with a number format. Conditional formats override the
+    cells' own number formats when displayed, so no cell is visited, and
+    cells added later are covered too. The cells' own styles and the
+    column's dimensions (width, style) are left as they are.
+    """
+    col = col.upper()
+    rule = Rule(
+        type="expression",
+        formula=["TRUE"],
+        dxf=DifferentialStyle(
+            numFmt=NumberFormat(
+                numFmtId=_number_format_id(ws.parent, number_format),
+                formatCode=number_format,
+            )
+        ),
+    )
+    ws.conditional_formatting.add(f"{col}{startrow}:{col}{stoprow or MAX_ROW}", rule)
+
+
+def _style_copier(source_wb, target_wb):
+    """Returns a function returning a copy of a source cell's style array
+    (or None for unstyled empty cells) with its style ids remapped to
+    target_wb's style collections. Each distinct source style array is
+    only remapped once.
+    """
+    cache = {}
+
+    def copy_style(cell):
+        # Cells keep their style array in _style, read-only cells look it up
+        style = getattr(cell, "_style", None) or getattr(cell, "style_array", None)
+        if style is None:
+            return None
+        key = tuple(style)
+        copied = cache.get(key)
+        if copied is None:
+            copied = StyleArray(style)
+            if source_wb is not target_wb:
+                for field, collection in COPIED_STYLE_FIELDS.items():
+                    source_styles = getattr(source_wb, collection)
+                    setattr(
+                        copied,
+                        field,
+                        getattr(target_wb, collection).add(
+                            source_styles[getattr(style, field)]
+                        ),
+                    )
+                if style.numFmtId >= BUILTIN_FORMATS_MAX_SIZE:
+                    number_format = source_wb._number_formats[
+                        style.numFmtId - BUILTIN_FORMATS_MAX_SIZE
+                    ]
+                    copied.numFmtId = (
+                        target_wb._number_formats.add(number_format)
+                        + BUILTIN_FORMATS_MAX_SIZE
+                    )
+            cache[key] = copied
+
+        # Each cell needs its own array (setting a style changes it in place)
+        return StyleArray(copied)
+
+    return copy_style
+
+
+def _row_cells(ws, startrow: int = 1, stoprow: int = 0):
+    """Yields the cells of the populated rows from startrow to just
+    before stoprow (or the last row if stoprow isn't passed).
+    """
+    if not ws._cells or (stoprow and stoprow <= startrow):
+        return
+    for row in ws.iter_rows(
+        min_row=startrow, max_row=stoprow - 1 if stoprow else None
+    ):
+        yield from row
+
+
+def _excel_string(value) -> str:
+    """Returns value as a quoted Excel formula string literal."""
+    return '"{}"'.format(str(value).replace('"', '""'))
+
+
+def _add_highlight_rule(ws, cell_range: str, formula: str, color: str) -> None:
+    """Adds a single conditional formatting rule filling the cells of
+    cell_range where formula is true, instead of filling each cell.
+    Relative references in formula are relative to the top-left cell.
+
+    Args:
+        ws (Worksheet): Worksheet to add the rule to.
+        cell_range (str): Range the rule covers. ex: 'A2:E20'
+        formula (str): Excel formula without the leading '='.
+        color (str): COLORS name or hex color for the fill.
+    """
+    ws.conditional_formatting.add(
+        cell_range, FormulaRule(formula=[formula], fill=get_conditional_fill(color))
+    )
@@ -0,0 +1,264 @@
+"""
+
+Value conversions shared by the Xlsx column cleaning methods, and a
+transform plan that runs several of them in a single pass over the rows.
+
+    xl.transform().find_replace("B", {"N/A": ""}).digits_only("C").to_int(
+        "C"
+    ).format_currency("E", startrow=2).run()
+
+"""
+from openpyxl.utils import column_index_from_string
+
+from .cleaning import _clean_value, _cleaners
+from .matching import _finder, _replacer, _skip_set
+from .styles import _add_number_format_rule, _number_format_id
+
+# Number format set by Xlsx.format_currency
+CURRENCY_FORMAT = "$#,###.00"
+
+NUMBER_TYPES = {"i": int, "f": float}
+
+
+def _find_replace_value(value, replacer, skip=frozenset()):
+    """Replaces the find strings in a cell value with a replacer from
+    matching._replacer (see Xlsx.find_replace). Returns value itself if
+    it is empty, in skip (lowercase), or contains none of the strings.
+    """
+    if not value or replacer is None or str(value).lower() in skip:
+        return value
+    new_value, replaced = replacer(str(value))
+
+    return new_value if replaced else value
+
+
+def _number_value(value, numtype: str):
+    """Converts a non-empty cell value to int ('i') or float ('f') (see
+    Xlsx.number_type_fix). Returns value itself for any other numtype.
+    """
+    converter = NUMBER_TYPES.get(numtype.lower())
+    if not value or converter is None:
+        return value
+
+    return converter(value)
+
+
+def _reverse_text_value(value, separator: str = ","):
+    """Swaps the two parts of a separated str value. ex: 'Last, First' ->
+    'First Last' (see Xlsx.reverse_text). Returns value itself if it
+    isn't a str containing separator.
+    """
+    if not isinstance(value, str) or separator not in value:
+        return value
+    split_value = value.split(separator)
+
+    return f"{split_value[1].strip()} {split_value[0].strip()}"
+
+
+def _move_value(value, finder):
+    """Finds the first of a list of strs in a cell value, with a finder
+    from matching._finder (see Xlsx.move_values).
+
+    Returns:
+        tuple: (value with the found str removed, found str), or None if
+        value is empty or contains none of the strs.
+    """
+    if not value or finder is None:
+        return None
+
+    return finder.find(str(value))
+
+
+class Transform:
+    """Plan of column cleaning steps for an Xlsx object (see
+    Xlsx.transform()). Each step method adds a step and returns the plan,
+    and run() applies every step in one pass over the rows. Every step
+    only reads and writes cells in the row it is applied to, so the
+    results are the same as calling the matching Xlsx methods in order,
+    while each cell is reached once instead of once per method.
+    """
+
+    def __init__(self, xlsx):
+        self.xlsx = xlsx
+        # (function(ws, cell), column, first row, last row or None)
+        self.steps = []
+        # (column, number format, first row, last row or None) added as
+        # conditional formatting rules by run()
+        self.column_formats = []
+
+    def _add(self, function, col: str, startrow: int, stoprow: int = None):
+        self.steps.append((function, col.upper(), startrow, stoprow))
+        return self
+
+    def find_replace(
+        self,
+        col: str,
+        fndrplc: dict,
+        skip: list = None,
+        startrow: int = 1,
+        ignore_case: bool = False,
+        whole_word: bool = False,
+    ):
+        """Same as Xlsx.find_replace."""
+        replacer = _replacer(fndrplc, ignore_case, whole_word)
+        skip = _skip_set(skip)
+
+        def step(ws, cell):
+            _set(cell, _find_replace_value(cell.value, replacer, skip))
+
+        return self._add(step, col, startrow)
+
+    def clean(
+        self,
+        col: str,
+        cleaners,
+        startrow: int = 1,
+        stoprow: int = None,
+        skip: list = None,
+    ):
+        """Same as Xlsx.clean({col: cleaners}, ...)."""
+        cleaners = _cleaners(cleaners)
+        skip = _skip_set(skip)
+
+        def step(ws, cell):
+            _set(cell, _clean_value(cell.value, cleaners, skip))
+
+        return self._add(step, col, startrow, stoprow)
+
+    def digits_only(
+        self, col: str, startrow: int = 1, stoprow: int = None, skip: list = None
+    ):
+        """Same as Xlsx.remove_non_numbers (stoprow isn't changed)."""
+        return self.clean(
+            col, "digits", startrow, stoprow - 1 if stoprow else None, skip
+        )
+
+    def to_int(self, col: str, startrow: int = 1):
+        """Same as Xlsx.number_type_fix(col, 'i')."""
+        return self._number_type(col, "i", startrow)
+
+    def to_float(self, col: str, startrow: int = 1):
+        """Same as Xlsx.number_type_fix(col, 'f')."""
+        return self._number_type(col, "f", startrow)
+
+    def _number_type(self, col: str, numtype: str, startrow: int):
+        def step(ws, cell):
+            _set(cell, _number_value(cell.value, numtype))
+
+        return self._add(step, col, startrow)
+
+    def reverse_text(self, col: str = "A", startrow: int = 1, separator: str = ","):
+        """Same as Xlsx.reverse_text."""
+
+        def step(ws, cell):
+            _set(cell, _reverse_text_value(cell.value, separator))
+
+        return self._add(step, col, startrow)
+
+    def move_values(
+        self,
+        scol: str,
+        tcol: str,
+        vals: list,
+        startrow: int = 1,
+        ignore_case: bool = False,
+        whole_word: bool = False,
+    ):
+        """Same as Xlsx.move_values."""
+        finder = _finder(vals, ignore_case, whole_word)
+        tcol_number = column_index_from_string(tcol.upper())
+        self.xlsx._invalidate_indexes(tcol)
+
+        def step(ws, cell):
+            moved = _move_value(cell.value, finder)
+            if moved is not None:
+                ws.cell(row=cell.row, column=tcol_number).value = moved[1]
+                cell.value = moved[0]
+
+        return self._add(step, scol, startrow)
+
+    def format_currency(
+        self,
+        col: str,
+        startrow: int = 1,
+        stoprow: int = None,
+        by_column: bool = False,
+    ):
+        """Same as Xlsx.format_currency."""
+        if by_column:
+            return self.number_format(
+                col, CURRENCY_FORMAT, startrow, stoprow, by_column=True
+            )
+
+        def step(ws, cell):
+            if cell.value:
+                cell.number_format = CURRENCY_FORMAT
+
+        return self._add(step, col, startrow, stoprow or None)
+
+    def number_format(
+        self,
+        col: str,
+        number_format: str,
+        startrow: int = 1,
+        stoprow: int = None,
+        by_column: bool = False,
+    ):
+        """Same as Xlsx.set_number_format. Without by_column, it is a step
+        setting the format id on each cell with a value (a cell's own
+        style overrides its column's style). With by_column, no step is
+        added and run() adds the column's conditional formatting rule.
+        """
+        if by_column:
+            self.column_formats.append(
+                (col.upper(), number_format, startrow, stoprow or None)
+            )
+            return self
+        format_id = _number_format_id(self.xlsx.wb, number_format)
+
+        def step(ws, cell):
+            if cell.value:
+                cell._style.numFmtId = format_id
+
+        return self._add(step, col, startrow, stoprow or None)
+
+    def run(self):
+        """Applies the steps to each row in order. Only the cells of the
+        steps' columns are looked up, and missing (empty) cells are
+        skipped, since no step changes an empty cell.
+
+        Returns:
+            Xlsx: The Xlsx object.
+        """
+        ws = self.xlsx.ws
+        for col, number_format, startrow, stoprow in self.column_formats:
+            _add_number_format_rule(ws, col, number_format, startrow, stoprow)
+        if not self.steps:
+            return self.xlsx
+        self.xlsx._invalidate_indexes(*(col for _step, col, *_rows in self.steps))
+        steps = [
+            (function, column_index_from_string(col), startrow, stoprow)
+            for function, col, startrow, stoprow in self.steps
+        ]
+        # Every row the steps apply to, up to the last row of the sheet
+        first_row = min(startrow for _step, _col, startrow, _stop in steps)
+        last_row = ws.max_row
+        if all(stoprow is not None for *_rest, stoprow in steps):
+            last_row = min(last_row, max(stoprow for *_rest, stoprow in steps))
+
+        cells = ws._cells
+        for row in range(first_row, last_row + 1):
+            for function, column, startrow, stoprow in steps:
+                if row < startrow or (stoprow is not None and row > stoprow):
+                    continue
+                cell = cells.get((row, column))
+                if cell is not None:
+                    function(ws, cell)
+
+        return self.xlsx
+
+
+def _set(cell, value) -> None:
+    """Writes value to cell if it isn't the cell's current value object."""
+    if value is not cell.value:
+        cell.value = value
@@ -1,41 +1,159 @@
+from array import array
+from bisect import bisect_right
 from pathlib import Path
 
-try:
-    import pandas as pd
-except ImportError:
-    pd = False
-
 import openpyxl
-from openpyxl.utils import get_column_letter
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.utils import column_index_from_string, get_column_letter
+
+# xlrd is only imported when an .xls file is converted (see _load_xlrd)
+xlrd = None
+
+
+def _load_xlrd():
+    """Imports xlrd on first use. Returns the module, or False if it
+    isn't installed.
+    """
+    global xlrd
+    if xlrd is None:
+        try:
+            import xlrd as module
+        except ImportError:
+            module = False
+        xlrd = module
+
+    return xlrd
 
 
 def _convert_xls(obj, filepath=None, sheetname=None):
-    """Converts .xls data to Xlsx object."""
-    if not pd:
+    """Converts .xls data to Xlsx object. Sheets are read directly with
+    xlrd and their rows appended to a new openpyxl Workbook one at a
+    time, keeping numbers (integral floats as ints), dates and booleans
+    as native values. sheetname can be a sheet name, a list of sheet
+    names, or None to convert every sheet. The first converted sheet is
+    set as the active sheet (*.ws).
+    """
+    if not _load_xlrd():
         input(".xls support requirements missing. Check requirements.txt")
         exit("Exiting...")
 
-    # Convert xls to xlsx data using Pandas/Xlrd
-    if not filepath and sheetname:
-        input("Error converting from xls.\nBe sure to include the sheetname "
-              "when passing your filepath.")
-        exit("Exiting...")
-
-    # Read data from xls and create xlsx object
-    df = pd.read_excel(filepath, sheet_name=sheetname)
+    sheetnames = [sheetname] if isinstance(sheetname, str) else sheetname
     obj.path = Path(filepath)
     obj.wb = openpyxl.Workbook()
+    obj.wb.remove(obj.wb.active)
+
+    # Load sheets one at a time and release each once it's copied
+    book = xlrd.open_workbook(filepath, on_demand=True)
+    try:
+        for name in sheetnames or book.sheet_names():
+            _copy_xls_sheet(
+                book.sheet_by_name(name), obj.wb.create_sheet(name), book.datemode
+            )
+            book.unload_sheet(name)
+    finally:
+        book.release_resources()
+
+    obj.wb.active = 0
     obj.ws = obj.wb.active
-    obj.ws.title = sheetname
 
-    # Copy row data from xls to new xlsx object
-    for row in dataframe_to_rows(df):
-        obj.ws.append(row)
 
-    # Remove index row/colum created by Pandas
-    obj.ws.delete_cols(1, 1)
-    obj.ws.delete_rows(1, 1)
+def _copy_xls_sheet(sheet, ws, datemode: int) -> None:
+    """Appends each row of an xlrd sheet to an openpyxl worksheet,
+    converting xlrd's cell types to native Python values.
+    """
+    for row in range(sheet.nrows):
+        ws.append(
+            [
+                _xls_value(cell_type, value, datemode)
+                for cell_type, value in zip(sheet.row_types(row), sheet.row_values(row))
+            ]
+        )
+
+
+def _xls_value(cell_type: int, value, datemode: int):
+    """Converts an xlrd cell value to the matching Python value."""
+    if cell_type == xlrd.XL_CELL_NUMBER:
+        return int(value) if value.is_integer() else value
+    if cell_type == xlrd.XL_CELL_TEXT:
+        return value
+    if cell_type == xlrd.XL_CELL_DATE:
+        converted = xlrd.xldate.xldate_as_datetime(value, datemode)
+        # Time only values have no date part
+        return converted.time() if value < 1 else converted
+    if cell_type == xlrd.XL_CELL_BOOLEAN:
+        return bool(value)
+
+    # Empty, blank and error cells
+    return None
+
+
+def _column_span(*columns: str) -> tuple:
+    """Converts the passed column letters to the smallest span of column
+    numbers containing all of them, for use with iter_rows(min_col=,
+    max_col=). Also returns the position of each passed column within
+    a row read from that span.
+    ex: ("C", "E") -> (3, 5, [0, 2])
+
+    Returns:
+        tuple: (min column number, max column number, [row positions])
+    """
+    numbers = [column_index_from_string(column.upper()) for column in columns]
+    mincol, maxcol = min(numbers), max(numbers)
+
+    return mincol, maxcol, [number - mincol for number in numbers]
+
+
+def _delete_rows_bulk(ws, rows) -> None:
+    """Deletes all of the passed row numbers from a worksheet in a single
+    pass. Each remaining Cell object below a deleted row is moved up by
+    the number of deleted rows above it, keeping its value and style, and
+    row dimensions (heights, etc.) are moved with their rows.
+    (openpyxl's delete_rows shifts every cell below the deleted row on
+    each call, which is quadratic when deleting many rows one at a time.)
+
+    Args:
+        ws (Worksheet): Worksheet to delete rows from.
+        rows (iterable): Row numbers to delete.
+    """
+    deleted = set(rows)
+    if not deleted:
+        return
+    # Rows move up by the number of deleted rows above them
+    ordered = sorted(deleted)
+    first = ordered[0]
+
+    moved = {}
+    for (row, column), cell in ws._cells.items():
+        if row < first:
+            moved[(row, column)] = cell
+        elif row not in deleted:
+            cell.row = row - bisect_right(ordered, row)
+            moved[(cell.row, column)] = cell
+    ws._cells.clear()
+    ws._cells.update(moved)
+    ws._current_row = ws.max_row if ws._cells else 0
+
+    for row in sorted(row for row in ws.row_dimensions if row >= first):
+        dimension = ws.row_dimensions.pop(row)
+        if row not in deleted:
+            dimension.index = row - bisect_right(ordered, row)
+            ws.row_dimensions[dimension.index] = dimension
+
+
+def _pack_column(values) -> object:
+    """Packs a column of cell values into a compact array.array if they
+    are all ints ('q') or all numbers ('d'), otherwise returns them as a
+    tuple.
+    """
+    types = set(map(type, values))
+    try:
+        if types == {int}:
+            return array("q", values)
+        if types and types <= {int, float}:
+            return array("d", values)
+    except OverflowError:
+        pass
+
+    return tuple(values)
 
 
 def generate_columns_dictionary(key_list: list) -> dict:
@@ -3,23 +3,47 @@
 Writes nested dictionary data to an Xlsx object.
 
 """
-# TODO: Add tests
+from collections.abc import Mapping
+
+from openpyxl.cell import WriteOnlyCell
+
+from .styles import get_font
 
 
 def _write_dictionary_to_sheet(
-    xlsx, data_dict: dict, header_row: int = None, start_row: int = None
+    xlsx,
+    data_dict,
+    header_row: int = None,
+    start_row: int = None,
+    bold: bool = False,
+    headers: list = None,
 ) -> None:
     """Receives an Xlsx object and a nested dictionary:
     {"Row1": {"Key/Header": Value, "Key/Header": Value,},}
-    Generates a list of keys to use as headers. Writes the headers and
-    row data to the Xlsx object. If no header_row is passed, the default
-    will be row 1 and the default start_row will be the header_row+1.
+    or an iterable/generator of (key, row_dict) pairs. Generates a list
+    of keys to use as headers. Writes the headers and row data to the
+    Xlsx object. If no header_row is passed, the default will be row 1
+    and the default start_row will be the header_row+1.
+    Write-only Xlsx objects have the rows appended in order instead.
+
+    Each header's column number is looked up once, so writing takes
+    linear time in the number of cells. Passing a generator writes each
+    row as it is produced, so the data never needs to be held in memory
+    as a nested dictionary. When the headers are not passed for a
+    generator, new keys are given the next free column as they are found
+    (write-only objects use the keys of the first row instead, and raise
+    ValueError if the first row is empty or for any key found after the
+    header row is written).
 
         Args:
             xlsx (Xlsx): Xlsx object to write data to.
-            data_dict (dict): Nested dictionary with data to write to Xlsx.
+            data_dict (dict/iterable): Nested dictionary, or iterable of
+            (key, row_dict) pairs, with data to write to Xlsx.
             header_row (int, optional): Row number to write headers. Defaults to None.
             start_row (int, optional): Row number to start writing data. Defaults to None.
+            bold (bool, optional): Option to bold the headers. Defaults to False.
+            headers (list, optional): Ordered list of headers to write.
+            Defaults to None (headers are read from the data).
     """
 
     # Sets header and start rows if either is not passed, and
@@ -29,27 +53,94 @@ def _write_dictionary_to_sheet(
     if not start_row or (start_row == header_row):
         start_row = header_row + 1
 
-    # Adds all keys to a single list to be used as headers.
-    # (looks at all dictionaries for keys in case some keys
-    # aren't present in every nested dictionary.)
-    keys = []
-    for row_data in data_dict.values():
-        for key in row_data:
-            if key not in keys:
-                keys.append(key)
-
-    # Writes keys/headers to xlsx sheet object in the specified row.
-    for column_number, header in enumerate(keys, 1):
-        xlsx.ws.cell(row=header_row, column=column_number, value=header)
-
-    # Writes matching row data to each cell in the xlsx sheet object
-    # by using the column headers to search for the value's key.
-    for row_number, row_data in enumerate(data_dict.values(), start=start_row):
-        for column_number, _key in enumerate(row_data, 1):
-            xlsx.ws.cell(
-                row=row_number,
-                column=column_number,
-                value=row_data.get(
-                    xlsx.ws.cell(row=header_row, column=column_number).value
-                ),
+    if isinstance(data_dict, Mapping):
+        rows = iter(data_dict.values())
+        # Adds all keys to a single ordered list to be used as headers.
+        # (looks at all dictionaries for keys in case some keys
+        # aren't present in every nested dictionary.)
+        if headers is None:
+            headers = list(
+                dict.fromkeys(
+                    key for row_data in data_dict.values() for key in row_data
+                )
             )
+    else:
+        rows = (row_data for _key, row_data in data_dict)
+
+    xlsx._invalidate_indexes()
+    if xlsx.mode == "w":
+        _append_dictionary_rows(xlsx, rows, headers, header_row, start_row, bold)
+        return
+
+    # {header: column number} index used to place every value.
+    columns = {}
+    for header in headers or []:
+        _add_header(xlsx, columns, header, header_row, bold)
+
+    # Writes each value to the column matching its key, adding any
+    # unseen key as a new header.
+    for row_number, row_data in enumerate(rows, start=start_row):
+        for key, value in row_data.items():
+            column_number = columns.get(key)
+            if column_number is None:
+                column_number = _add_header(xlsx, columns, key, header_row, bold)
+            xlsx.ws.cell(row=row_number, column=column_number, value=value)
+
+
+def _add_header(xlsx, columns: dict, header, header_row: int, bold: bool) -> int:
+    """Writes a header to the next free column of the header row, adds it
+    to the columns index, and returns its column number.
+    """
+    column_number = columns.setdefault(header, len(columns) + 1)
+    cell = xlsx.ws.cell(row=header_row, column=column_number, value=header)
+    if bold:
+        cell.font = get_font(bold=True)
+
+    return column_number
+
+
+def _append_dictionary_rows(
+    xlsx, rows, headers: list, header_row: int, start_row: int, bold: bool
+) -> None:
+    """Appends the headers and row data to a write-only Xlsx object
+    in order, padding with empty rows up to header_row and start_row.
+    """
+    if headers is None:
+        # Headers must be written before any data, so use the keys of
+        # the first row.
+        first_row = next(rows, None)
+        if first_row is not None:
+            if not first_row:
+                raise ValueError(
+                    "The headers can't be read from an empty first row. "
+                    "Pass headers= to write this data in write-only mode."
+                )
+            rows = _chain_first(first_row, rows)
+        headers = list(first_row or ())
+
+    xlsx._advance_to_row(header_row)
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(xlsx.ws, value=header)
+        if bold:
+            cell.font = get_font(bold=True)
+        header_cells.append(cell)
+    xlsx._append_row(header_cells)
+
+    columns = set(headers)
+    xlsx._advance_to_row(start_row)
+    for row_data in rows:
+        for key in row_data:
+            if key not in columns:
+                raise ValueError(
+                    f"Key '{key}' is not in the headers that were already "
+                    "written. Pass headers= to write this data in "
+                    "write-only mode."
+                )
+        xlsx._append_row([row_data.get(header) for header in headers])
+
+
+def _chain_first(first_row: dict, rows):
+    """Yields first_row followed by the remaining rows."""
+    yield first_row
+    yield from rows
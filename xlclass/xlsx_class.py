@@ -1,45 +1,125 @@
-import csv
 import datetime
+import functools
+import io
 import operator
+from itertools import islice, zip_longest
 from pathlib import Path
 
 import openpyxl
-from openpyxl.styles import Border, Font, PatternFill, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import column_index_from_string, get_column_letter
 
 from .utils import (
+    _column_span,
     _convert_xls,
+    _delete_rows_bulk,
+    _pack_column,
     _generate_source_target_columns_dictionary,
     generate_columns_dictionary,
 )
 
+from .cleaning import _clean
+from .coerce import DATE_FORMAT, DATE_NUMBER_FORMAT, _coerce
+from .column_index import _ColumnIndex
+from .copy_sheet_data import _copy_sheet_data
+from .csv_data import _copy_csv_data, _write_csv
+from .matching import _finder, _replacer, _skip_set
+from .profiling import (
+    _enable_profiling,
+    _profile_option,
+    _profiled_call,
+    _summarize,
+)
+from .records import Record
+from .sort_rows import _sort_rows
+from .styles import (
+    COLOR_CODES,
+    _add_highlight_rule,
+    _add_number_format_rule,
+    _apply_styles,
+    _excel_string,
+    _format_column,
+    _row_cells,
+    get_border,
+    get_fill,
+    get_font,
+)
+from .transform import (
+    CURRENCY_FORMAT,
+    Transform,
+    _find_replace_value,
+    _move_value,
+    _number_value,
+    _reverse_text_value,
+)
 from .write_dictionary_to_sheet import _write_dictionary_to_sheet
 
-# Color dict for background fill
-COLORS = {
-    "red": PatternFill(fgColor="FF0000", fill_type="solid"),
-    "green": PatternFill(fgColor="00b050", fill_type="solid"),
-    "orange": PatternFill(fgColor="FFC000", fill_type="solid"),
-    "yellow": PatternFill(fgColor="FFFF00", fill_type="solid"),
-    "gray": PatternFill(fgColor="C0C0C0", fill_type="solid"),
+# Descriptions of the supported load modes for error messages
+MODES = {
+    "rw": "read/write",
+    "r": "read-only",
+    "w": "write-only",
 }
 
 
+def _requires_mode(*modes):
+    """Decorator for Xlsx methods that are only available when the object
+    was opened in one of the passed modes. Raises io.UnsupportedOperation
+    when the method is called on an object opened in any other mode.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.mode not in modes:
+                raise io.UnsupportedOperation(
+                    f"Xlsx.{method.__name__}() is not available in "
+                    f"{MODES[self.mode]} mode."
+                )
+            return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# Color dict for background fill (hex colors can also be passed to the
+# methods taking a fillcolor. ex: 'FF0000')
+COLORS = {name: get_fill(name) for name in COLOR_CODES}
+
+
 class Xlsx:
     """Class for working with Excel *.xlsx files using Openpyxl.
     Generates an Xlsx object with Openpyxl Workbook/Worksheet objects
     as attributes for use with the enclosed methods.
     """
 
-    def __init__(self, filepath: str = None, sheetname: str = None) -> None:
+    def __init__(
+        self,
+        filepath: str = None,
+        sheetname: str = None,
+        mode: str = "rw",
+        profile=None,
+    ) -> None:
         """Initialize main attributes for Xlsx objects if Path points to
         an existing Excel file. Creates a blank Workbook/Worksheet
         object if no filepath is passed. If multiple sheets are present
         in passed Excel file, the name of the sheet you want to work
         with can be passed as a string to 'sheetname' or you can select
         needed sheet from a menu. If the Excel file that is passed is an
-        *.xls file, sheetname is required and Pandas is used to read the
-        sheet data and a new unformatted Xlsx object is created
-        containing that data.
+        *.xls file, xlrd is used to read the sheet data and a new
+        unformatted Xlsx object is created containing that data. For
+        *.xls files, sheetname can also be a list of sheet names, or
+        None to convert every sheet (the first one is set as *.ws).
+
+        Passing mode="r" opens an *.xlsx file with openpyxl's read-only
+        (streaming) worksheets. Rows are parsed from the file on demand
+        instead of loading every cell into memory, so large files open
+        quickly. Only the read-side methods (generate_list,
+        generate_dictionary, get_matching_value, etc.) are available in
+        this mode. Methods that modify the sheet raise
+        io.UnsupportedOperation. Call close() when finished to release
+        the file handle.
 
         Attrs:
             *.path (pathlib.Path, optional): Filepath information.
@@ -47,21 +127,54 @@ class Xlsx:
             *.wb (openpyxl.Workbook): Workbook object for Excel file.
             *.ws (openpyxl.Workbook.worksheet): Active sheet for
             Excel file.
+            *.mode (str): Mode the object was opened in. 'rw', 'r' or
+            'w' (see create_streaming()).
 
         Args:
             filepath (str/pathlib.Path, optional): str/Path object
             representing *.xlsx input file.
             sheetname (str, optional): Name representing which sheet you
             want to work with. ex: 'Invoice'
+            mode (str, optional): 'rw' to load the full workbook or 'r'
+            to open it read-only. Defaults to 'rw'.
+            profile (bool/callable, optional): Option to record the time,
+            rows scanned, cells read/written and peak memory of loading
+            and of each method call (see stats()). A function passed is
+            also called with each call's CallStats. Defaults to None
+            (enabled if the XLCLASS_PROFILE environment variable is set).
         """
+        if mode not in ("rw", "r"):
+            raise ValueError(
+                f"Invalid mode '{mode}'. Use 'rw' or 'r'. (See "
+                "Xlsx.create_streaming() for write-only objects.)"
+            )
+        self.mode = mode
+        self._indexes = {}
+
+        profile = _profile_option(profile)
+        if profile:
+            _enable_profiling(self, profile)
+            _profiled_call(self, "load", self._load, filepath, sheetname)
+        else:
+            self._load(filepath, sheetname)
+
+    def _load(self, filepath: str = None, sheetname: str = None) -> None:
+        """Loads the workbook (or creates a new one) and sets the *.path,
+        *.wb and *.ws attributes. (See __init__.)
+        """
+        mode = self.mode
         if filepath:
-            # Convert xls to xlsx data using Pandas/Xlrd
+            # Convert xls to xlsx data using Xlrd
             if str(filepath).endswith(".xls"):
+                # Converted data is always held in memory
+                self.mode = "rw"
                 _convert_xls(self, filepath, sheetname)
 
             elif str(filepath).endswith(".xlsx"):
                 self.path = Path(filepath)
-                self.wb = openpyxl.load_workbook(filepath)
+                self.wb = openpyxl.load_workbook(
+                    filepath, read_only=(mode == "r")
+                )
 
                 # Set first sheet as active if only one is present
                 if len(self.wb.sheetnames) == 1:
@@ -97,10 +210,98 @@ class Xlsx:
         else:
             # If not file is passed, create a new object and set
             # active worksheet.
+            self.mode = "rw"
             self.path = None
             self.wb = openpyxl.Workbook()
             self.ws = self.wb.active
 
+    @classmethod
+    def create_streaming(cls, filepath: str, sheetname: str = None, profile=None):
+        """Creates a new write-only Xlsx object using openpyxl's
+        write-only Workbook. Rows are appended straight to the output
+        file stream instead of being held in memory as Cell objects, so
+        very large reports can be written with flat memory use.
+
+        Rows can only be added in order, from the top of the sheet down,
+        using copy_csv_data, write_dictionary_to_sheet and name_headers.
+        Column widths must be set with set_cell_size before the first row
+        is written. save() can only be called once and methods that read
+        or edit existing cells raise io.UnsupportedOperation.
+
+        Args:
+            filepath (str/pathlib.Path): Output file location (including
+            filename) used by save().
+            sheetname (str, optional): Title for the worksheet. Defaults
+            to None (openpyxl default title).
+            profile (bool/callable, optional): Same as Xlsx(). Defaults
+            to None.
+
+        Returns:
+            Xlsx: New write-only Xlsx object.
+        """
+        xl = cls.__new__(cls)
+        xl.mode = "w"
+        xl.path = Path(filepath)
+        xl.wb = openpyxl.Workbook(write_only=True)
+        xl.ws = xl.wb.create_sheet(sheetname)
+        xl._rows_written = 0
+        xl._indexes = {}
+        profile = _profile_option(profile)
+        if profile:
+            _enable_profiling(xl, profile)
+
+        return xl
+
+    @classmethod
+    async def aopen(
+        cls,
+        filepath: str = None,
+        sheetname: str = None,
+        mode: str = "rw",
+        executor=None,
+    ):
+        """Creates an Xlsx object without blocking the asyncio event
+        loop. The workbook is loaded in a bounded pool of threads (see
+        xlclass.aio.set_max_workers), so only a limited number of
+        workbooks are parsed at once.
+
+            xl = await Xlsx.aopen("report.xlsx")
+
+        Args:
+            filepath (str/pathlib.Path, optional): Same as Xlsx().
+            sheetname (str, optional): Same as Xlsx().
+            mode (str, optional): Same as Xlsx(). Defaults to 'rw'.
+            executor (concurrent.futures.Executor, optional): Executor to
+                load the workbook in. Defaults to None (shared pool).
+
+        Returns:
+            Xlsx: New Xlsx object.
+        """
+        from .aio import _aopen
+
+        return await _aopen(cls, filepath, sheetname, mode, executor)
+
+    def _append_row(self, values) -> None:
+        """Appends a row of values (or cells) to the bottom of the sheet,
+        keeping count of the rows written to write-only sheets.
+        """
+        self.ws.append(values)
+        if self.mode == "w":
+            self._rows_written += 1
+
+    def _advance_to_row(self, row: int) -> None:
+        """Appends empty rows to a write-only sheet so that the next
+        appended row is written at the passed row number.
+        """
+        if row <= self._rows_written:
+            raise ValueError(
+                f"Row {row} has already been written. Rows can only be "
+                "added in order in write-only mode."
+            )
+        while self._rows_written < row - 1:
+            self._append_row([])
+
+    @_requires_mode("rw", "w")
     def save(self, savepath: str = None) -> None:
         """Duplicates openpyxl's save function so it can be called on the
         object without needing the .wb attribute, etc. Saves the Excel
@@ -120,6 +321,130 @@ class Xlsx:
         else:
             input("\n No savepath found...")
 
+    @_requires_mode("rw", "w")
+    def asave(self, savepath: str = None, snapshot: bool = False, executor=None):
+        """Saves the workbook without blocking the asyncio event loop,
+        in the bounded pool of threads used by aopen. Returns a future to
+        await. Without snapshot, the object must not be changed until the
+        save finishes. With snapshot, a copy of the workbook (much faster
+        than saving) is taken before asave returns, and the copy is
+        written while the object is free to change.
+
+            saving = xl.asave("report.xlsx", snapshot=True)
+            xl.find_replace("B", {"Red": "Blue"})
+            await saving
+
+        Args:
+            savepath (str or pathlib.Path, optional): Output file
+                location. Uses original if not specified. Defaults to None.
+            snapshot (bool, optional): Option to save a copy of the
+                workbook as it is when called ('rw' mode only). Defaults
+                to False.
+            executor (concurrent.futures.Executor, optional): Executor to
+                save the workbook in. Defaults to None (shared pool).
+
+        Returns:
+            asyncio.Future: Completes when the file is written.
+        """
+        from .aio import _asave
+
+        return _asave(self, savepath, snapshot, executor)
+
+    def close(self) -> None:
+        """Closes the workbook. Releases the open file handle kept by
+        objects opened in read-only mode. Safe to call in any mode.
+        """
+        self.wb.close()
+
+    def stats(self, by_method: bool = False):
+        """Returns the measurements recorded for a profiled object (see
+        the profile option of Xlsx()), or an empty list/dict if it isn't
+        profiled.
+
+        Args:
+            by_method (bool, optional): Option to return the totals for
+                each method instead of each call. Defaults to False.
+
+        Returns:
+            list/dict: CallStats for each call, in order (with
+            .method, .seconds, .rows_scanned, .cells_read,
+            .cells_written and .peak_bytes), or {method: {totals}}.
+        """
+        records = getattr(self, "_profile_stats", [])
+        if by_method:
+            return _summarize(records)
+
+        return list(records)
+
+    @_requires_mode("rw", "r")
+    def build_index(self, col: str, mode: str = "exact", columns: list = None):
+        """Builds a lookup index for a column. While the index exists,
+        get_matching_value and set_matching_value use it for searches of
+        that column instead of scanning every cell, making repeated
+        lookups constant time (exact) or logarithmic (substring-prefix).
+        The index is dropped automatically by any method that writes to
+        the column. Changes made directly to *.ws are not tracked, so
+        call build_index again (or drop_index) after editing cells
+        yourself.
+
+        An index changes how those methods match: without one they match
+        cells containing the search value anywhere, with one they only
+        match cells equal to it (exact) or starting with it
+        (substring-prefix). ex: 'NE' matches 'SNES' only without an
+        index.
+
+        In read-only mode the index also keeps the values of every
+        indexed row, so lookups don't re-parse the file. That's the whole
+        row unless columns is passed, which can use a lot of memory on
+        wide sheets.
+
+        Args:
+            col (str): Column letter to index. ex: 'A'
+            mode (str, optional): 'exact' to match cells equal to the
+            search value, or 'substring-prefix' to match cells starting
+            with the search value. Defaults to 'exact'.
+            columns (list, optional): Read-only mode: the column letters
+            whose values to keep, usually the retcol of later lookups.
+            Other columns are read from the file on each lookup. Defaults
+            to None (the whole row).
+
+        Returns:
+            self: Xlsx object.
+        """
+        self._indexes[col.upper()] = _ColumnIndex(
+            self.ws, col, mode, keep_rows=(self.mode == "r"), columns=columns
+        )
+
+        return self
+
+    def drop_index(self, col: str = None):
+        """Removes the lookup index for a column, or all indexes if no
+        column is passed.
+
+        Args:
+            col (str, optional): Column letter of the index to remove.
+            Defaults to None.
+
+        Returns:
+            self: Xlsx object.
+        """
+        if col:
+            self._invalidate_indexes(col)
+        else:
+            self._invalidate_indexes()
+
+        return self
+
+    def _invalidate_indexes(self, *cols: str) -> None:
+        """Drops the indexes of the passed columns (all indexes if no
+        columns are passed) after their cells have been changed.
+        """
+        if not cols:
+            self._indexes.clear()
+        for col in cols:
+            self._indexes.pop(col.upper(), None)
+
+    @_requires_mode("rw", "r")
     def generate_headers_attribute(self, header_row: int = 1):
         """Uses specified header row number to generate a *.headers
         attribute containing a dictionary of header values and their
@@ -132,47 +457,61 @@ class Xlsx:
         Returns:
             self: Xlsx object (that includes *.headers attribute)
         """
-        # Skip to specified header row, stop at next row
-        for row, row_data in enumerate(self.ws.iter_rows(), 1):
-            if row < header_row:
-                continue
-            if row == header_row + 1:
-                break
-            # Generate a list of header values
-            header_values = [cell.value for cell in row_data]
+        # Read only the header row
+        header_values = []
+        for row_data in self.ws.iter_rows(
+            min_row=header_row, max_row=header_row, values_only=True
+        ):
+            header_values = list(row_data)
         # Generate the dictionary and add to *.headers attribute
         self.headers = generate_columns_dictionary(key_list=header_values)
 
         return self
 
-    def copy_sheet_data(self, source: object, columns: dict):
+    @_requires_mode("rw")
+    def copy_sheet_data(
+        self, source: object, columns: dict, rows=None, styles: bool = False
+    ):
         """Copy cell values from source Excel Worksheet to target (self)
         Excel Worksheet using a passed dictionary of column letters.
+        Every row up to the source sheet's max_row is copied, and each
+        source column is read once. Read-only sources can be copied.
 
         Args:
             source (Xlsx): Input Xlsx Excel file object to copy values from.
             columns (dict{str: str}): Dictionary of column letters
                 representing the source and target column letters to
                 copy the values. ex: {'A': 'C', 'D': 'B'}
+            rows (set/callable, optional): Source row numbers to copy, or
+                a function receiving each source row's tuple of values
+                and returning True to copy it. The copied rows are written
+                to consecutive rows starting at row 1. Defaults to None
+                (copy all rows to the same row numbers).
+            styles (bool, optional): Option to also copy the fonts, fills,
+                borders, alignment, protection and number formats of the
+                copied cells. Defaults to False.
 
         Returns:
             self: Xlsx object.
         """
-        for row, _cell in enumerate(source.ws["A"], 1):
-            for scol, tcol in columns.items():
-                self.ws[f"{tcol.upper()}{row}"] = source.ws[
-                    f"{scol.upper()}{row}"
-                ].value
+        self._invalidate_indexes(*columns.values())
+        _copy_sheet_data(self, source, columns, rows=rows, styles=styles)
 
         return self
 
+    @_requires_mode("rw")
     def copy_sheet_data_by_headers(
-        self, source: object, source_dict: dict, keep_list: list
+        self,
+        source: object,
+        source_dict: dict,
+        keep_list: list,
+        rows=None,
+        styles: bool = False,
     ):
         """Copy cell values from source Excel Worksheet to target (self)
         Excel worksheet using a passed dictionary of {header: column}
         matching the source worksheet, and a list of headers corresponding
-        to the columns that need to be copied.
+        to the columns that need to be copied. (See copy_sheet_data.)
 
         Args:
             source (Xlsx): Input Xlsx Excel file object to copy values from.
@@ -180,6 +519,11 @@ class Xlsx:
             columns matching the source Excel file object.
             keep_list (list): Ordered list of strings matching the header
             values that you want to keep/copy into the target file object.
+            rows (set/callable, optional): Source row numbers to copy, or
+            a function receiving each source row's tuple of values and
+            returning True to copy it. Defaults to None (all rows).
+            styles (bool, optional): Option to also copy cell styles.
+            Defaults to False.
 
         Returns:
             self: Xlsx object.
@@ -189,29 +533,76 @@ class Xlsx:
             source_dict=source_dict, keep_list=keep_list
         )
         # Copy sheet data using columns generated above
-        self.copy_sheet_data(source=source, columns=source_target)
+        self.copy_sheet_data(
+            source=source, columns=source_target, rows=rows, styles=styles
+        )
 
         return self
 
-    def copy_csv_data(self, source_csv: str):
+    @_requires_mode("rw", "w")
+    def copy_csv_data(
+        self,
+        source_csv: str,
+        encoding: str = None,
+        dialect="excel",
+        columns: list = None,
+        limit: int = None,
+        infer_types: bool = False,
+        hdrrows: int = 1,
+        chunk_size: int = 10_000,
+    ):
         """Copy all values from source csv file to target Excel Worksheet.
+        Rows are appended below any existing data, chunk_size rows at a
+        time, so write-only objects can be used as the target for large
+        files.
 
         Args:
             source_csv (str/pathlib.Path): Path object representing a csv file.
+            encoding (str, optional): File encoding. ex: 'utf-8-sig'
+                Defaults to None (platform default).
+            dialect (str/csv.Dialect, optional): csv dialect or dialect
+                name, or 'sniff' to detect the delimiter and quoting from
+                the start of the file. Defaults to 'excel'.
+            columns (list, optional): Column letters of the csv columns to
+                copy, in the order to write them. ex: ['C', 'A']
+                Defaults to None (all columns).
+            limit (int, optional): Maximum number of csv rows (including
+                header rows) to copy. Defaults to None (all rows).
+            infer_types (bool, optional): Convert each column's values to
+                int, float or datetime (MM/DD/YYYY) when every data value
+                in the first chunk fits that type. From the first later
+                value that doesn't fit, the rest of the column is copied
+                as str. Defaults to False (all values are copied as str).
+            hdrrows (int, optional): Number of header rows left out of
+                type inference. Defaults to 1.
+            chunk_size (int, optional): Number of rows read at a time.
+                Defaults to 10_000.
 
         Returns:
             self: Xlsx object.
         """
-        with open(source_csv, "r") as f:
-            reader = csv.reader(f)
-            [self.ws.append(row) for row in reader]
+        self._invalidate_indexes()
+        _copy_csv_data(
+            self,
+            source_csv,
+            encoding=encoding,
+            dialect=dialect,
+            columns=columns,
+            limit=limit,
+            infer_types=infer_types,
+            hdrrows=hdrrows,
+            chunk_size=chunk_size,
+        )
 
         return self
 
+    @_requires_mode("rw")
     def sort_and_replace(self, sortcol: str, startrow: int = 1):
-        """Sort and replace cell values based on values of a specific
-        column. Use this BEFORE any cell formatting, etc as it DELETES
-        the values and then replaces them after sorting.
+        """Sort row data (case-insensitive) based on the values of a
+        specific column. Rows are reordered in place, keeping their
+        values and formatting. Empty cells sort as they always have
+        here, by their text ('' first, None as 'none'), not last as in
+        sort_rows. (See sort_rows for multiple or typed sort keys.)
 
         Args:
             sortcol (str): Column letter containing the values to use as
@@ -222,22 +613,66 @@ class Xlsx:
         Returns:
             self: Xlsx object.
         """
-        sortme = []
-        for row, rowdata in enumerate(self.ws.iter_rows(), 1):
-            if row >= startrow:
-                sortme.append(
-                    [str(self.ws[f"{sortcol.upper()}{row}"].value).lower(), rowdata]
-                )
+        self._invalidate_indexes()
+        _sort_rows(self, [(sortcol, "text")], startrow=startrow, empty_last=False)
 
-        self.ws.delete_rows(startrow, self.ws.max_row)
+        return self
 
-        for _sortval, rowdata in sorted(sortme, key=operator.itemgetter(0)):
-            self.ws.append(rowdata)
+    @_requires_mode("rw", "r")
+    def sort_rows(
+        self,
+        keys: list,
+        startrow: int = 1,
+        stoprow: int = None,
+        chunk_size: int = None,
+        target: object = None,
+    ):
+        """Stable sort of row data on one or more key columns, each with
+        its own type and direction. Empty key cells sort last.
+        ex: xl.sort_rows([("C", "numeric", "desc"), ("B", "text")], 2)
+
+        Rows are reordered in place (keeping values, formatting and row
+        heights) unless a target Xlsx object is passed. With a target,
+        the sheet is copied to the target (usually a write-only object
+        from Xlsx.create_streaming) with the rows sorted, which also
+        works for read-only objects. Passing chunk_size limits how many
+        rows are sorted in memory at once. Larger sorts are done in
+        chunks written to temporary files and merged.
+
+        Args:
+            keys (list): Column letters or (column, type, direction)
+                tuples. type is 'text' (case-insensitive), 'numeric' or
+                'date' and direction is 'asc' or 'desc'. Defaults are
+                'text' and 'asc'.
+            startrow (int, optional): First row to sort. Defaults to 1.
+            stoprow (int, optional): Last row to sort. Defaults to None
+                (last row of the sheet).
+            chunk_size (int, optional): Maximum number of rows sorted in
+                memory at once. Defaults to None (no limit).
+            target (Xlsx, optional): Xlsx object to write the sorted
+                sheet to. Defaults to None (sort in place).
+
+        Returns:
+            self: Xlsx object.
+        """
+        if target is None and self.mode != "rw":
+            raise io.UnsupportedOperation(
+                "Read-only objects can only be sorted to a target Xlsx object."
+            )
+        if target is None:
+            self._invalidate_indexes()
+        _sort_rows(
+            self, keys, startrow=startrow, stoprow=stoprow,
+            chunk_size=chunk_size, target=target,
+        )
 
         return self
 
+    @_requires_mode("rw", "w")
     def name_headers(self, headers: dict, hdrrow=1, bold: bool = False):
-        """Cycle through header row and fill cells with values.
+        """Cycle through header row and fill cells with values. On
+        write-only objects the headers are appended as the next row, so
+        hdrrow can't be a row that has already been written.
 
         Args:
             headers (dict{str:str}): Str pairs of columns and header
@@ -250,19 +685,38 @@ class Xlsx:
         Returns:
             self: Xlsx object.
         """
+        self._invalidate_indexes(*headers)
+        if self.mode == "w":
+            # Write the header row as the next row of the stream
+            self._advance_to_row(hdrrow)
+            row = [None] * max(
+                column_index_from_string(col.upper()) for col in headers
+            )
+            for col, name in headers.items():
+                cell = WriteOnlyCell(self.ws, value=name)
+                if bold:
+                    cell.font = get_font(bold=True)
+                row[column_index_from_string(col.upper()) - 1] = cell
+            self._append_row(row)
+            return self
+
         for col, name in headers.items():
             self.ws[f"{col.upper()}{hdrrow}"] = name
         if bold:
-            for each in self.ws[f"{hdrrow}:{hdrrow}"]:
-                each.font = Font(bold=True)
+            _apply_styles(
+                self.ws, self.ws[f"{hdrrow}:{hdrrow}"], font=get_font(bold=True)
+            )
 
         return self
 
+    @_requires_mode("rw")
     def set_matching_value(
         self, srchcol: str, srchval: str, trgtcol: str, setval: str, startrow: int = 1
     ):
         """Search column for a value and set a corresponding value in
-        another column in the same row.
+        another column in the same row. Matches cells containing srchval,
+        or, if the column has a lookup index (see build_index), cells
+        equal to it (exact) or starting with it (substring-prefix).
 
         Args:
             srchcol (str): Column letter to search for a value. ex: 'A'
@@ -276,15 +730,24 @@ class Xlsx:
         Returns:
             self: Xlsx object.
         """
-        for row, cell in enumerate(self.ws[srchcol.upper()], 1):
-            if row >= startrow and cell.value:
-                if srchval in str(cell.value):
+        index = self._indexes.get(srchcol.upper())
+        if index:
+            for row in index.rows(srchval):
+                if row >= startrow:
                     self.ws[f"{trgtcol.upper()}{row}"] = setval
+        else:
+            for row, cell in enumerate(self.ws[srchcol.upper()], 1):
+                if row >= startrow and cell.value:
+                    if srchval in str(cell.value):
+                        self.ws[f"{trgtcol.upper()}{row}"] = setval
+        self._invalidate_indexes(trgtcol)
 
         return self
 
+    @_requires_mode("rw")
     def find_remove_row(self, col: str, srch: str, startrow: int = 1):
-        """Remove row based on a specific value found in a column.
+        """Remove rows based on a specific value found in a column. All
+        matching rows are removed in a single pass (see remove_rows).
 
         Args:
             col (str): Column letter to search for the needed value.
@@ -295,50 +758,112 @@ class Xlsx:
         Returns:
             self: Xlsx object.
         """
-        row = startrow
-        while row <= self.ws.max_row:
-            if self.ws[f"{col.upper()}{row}"].value:
-                if srch in str(self.ws[f"{col.upper()}{row}"].value):
-                    self.ws.delete_rows(row, 1)
-                else:
-                    row += 1
-            else:
-                row += 1
+        self._invalidate_indexes()
+        colnum = column_index_from_string(col.upper())
+        matches = [
+            row
+            for row, (value,) in enumerate(
+                self.ws.iter_rows(
+                    min_row=startrow, min_col=colnum, max_col=colnum,
+                    values_only=True,
+                ),
+                startrow,
+            )
+            if value and srch in str(value)
+        ]
+        _delete_rows_bulk(self.ws, matches)
 
         return self
 
+    @_requires_mode("rw")
+    def remove_rows(self, rows, startrow: int = 1):
+        """Removes rows from the sheet in a single pass. All matching rows
+        are collected first, and then the rows below them are moved up
+        once, keeping their values, styles and row heights. Pass either
+        a collection of row numbers, or a function that receives each
+        row's tuple of values (from startrow down) and returns True for
+        rows to remove.
+        ex: xl.remove_rows(lambda values: values[1] == "Switch")
+
+        Args:
+            rows (iterable/callable): Row numbers to remove, or a
+                function used to select the rows to remove.
+            startrow (int, optional): Starting row number passed to the
+                function when selecting rows. Defaults to 1.
+
+        Returns:
+            self: Xlsx object.
+        """
+        self._invalidate_indexes()
+        if callable(rows):
+            predicate = rows
+            rows = [
+                row
+                for row, values in enumerate(
+                    self.ws.iter_rows(min_row=startrow, values_only=True),
+                    startrow,
+                )
+                if predicate(values)
+            ]
+        _delete_rows_bulk(self.ws, rows)
+
+        return self
+
+    @_requires_mode("rw")
     def find_replace(
-        self, col: str, fndrplc: dict, skip: list = None, startrow: int = 1
+        self,
+        col: str,
+        fndrplc: dict,
+        skip: list = None,
+        startrow: int = 1,
+        ignore_case: bool = False,
+        whole_word: bool = False,
     ):
         """Search column for a string value and replace it the value is
-        not listed in 'skip'.
+        not listed in 'skip'. Every find string is searched for in one
+        pass over each cell, so replaced text isn't searched again, and
+        where several finds match at the same place the first one in
+        fndrplc is used.
 
         Args:
             col (str): Column letter to search for the needed values.
             fndrplc (dict{str: str}): Dictionary of pairs to find and
                 replace. ex: {'find': 'replace'}.
             skip (list(str), optional): List of values to ignore when
-                replacing. Defaults to None.
+                replacing (compared in lowercase). Defaults to None.
             startrow (int, optional): Starting row number where values
                 begin. Defaults to 1.
+            ignore_case (bool, optional): Option to find the strings in
+                any case. Defaults to False.
+            whole_word (bool, optional): Option to only find the strings
+                when they aren't part of a longer word. Defaults to False.
 
         Returns:
             self: Xlsx object.
         """
-        if not skip:
-            skip = []
+        self._invalidate_indexes(col)
+        replacer = _replacer(fndrplc, ignore_case, whole_word)
+        if replacer is None:
+            return self
+        skip = _skip_set(skip)
         for row, cell in enumerate(self.ws[col.upper()], 1):
             if row >= startrow:
-                if cell.value and str(cell.value).lower() not in skip:
-                    for find, replace in fndrplc.items():
-                        if find in str(cell.value):
-                            self.ws[f"{col.upper()}{row}"] = str(cell.value).replace(
-                                find, replace
-                            )
+                value = _find_replace_value(cell.value, replacer, skip)
+                if value is not cell.value:
+                    cell.value = value
 
         return self
 
-    def move_values(self, scol: str, tcol: str, vals: list, startrow: int = 1):
+    @_requires_mode("rw")
+    def move_values(
+        self,
+        scol: str,
+        tcol: str,
+        vals: list,
+        startrow: int = 1,
+        ignore_case: bool = False,
+        whole_word: bool = False,
+    ):
         """Search source column for passed list of values and
         move them to target column.
 
@@ -347,24 +872,34 @@ class Xlsx:
                 ex: 'A'
             tcol (str): Target column letter to move located values to.
                 ex: 'B'
-            vals (list(str)): List of str values to move.
+            vals (list(str)): List of str values to move. Only the first
+                one (in list order) found in a cell is moved.
                 ex: ('name', '20')
             startrow (int, optional): Starting row number where values
                 begin. Defaults to 1.
+            ignore_case (bool, optional): Option to find the values in
+                any case. Defaults to False.
+            whole_word (bool, optional): Option to only find the values
+                when they aren't part of a longer word. Defaults to False.
 
         Returns:
             self: Xlsx object.
         """
+        self._invalidate_indexes(scol, tcol)
+        finder = _finder(vals, ignore_case, whole_word)
+        if finder is None:
+            return self
+        tcol_number = column_index_from_string(tcol.upper())
         for row, cell in enumerate(self.ws[scol.upper()], 1):
-            if cell.value and row >= startrow:
-                for item in vals:
-                    if item in str(cell.value):
-                        self.ws[f"{tcol.upper()}{row}"] = item
-                        self.ws[f"{scol.upper()}{row}"] = cell.value.replace(item, "")
-                        break
+            if row >= startrow:
+                moved = _move_value(cell.value, finder)
+                if moved is not None:
+                    self.ws.cell(row=row, column=tcol_number).value = moved[1]
+                    cell.value = moved[0]
 
         return self
 
+    @_requires_mode("rw")
     def reverse_text(self, datacol: str = "A", startrow: int = 1, separator: str = ","):
         """Get values from specified column, split them on specified separator,
         reverse the value's order and write them back to the cell minus the
@@ -382,62 +917,102 @@ class Xlsx:
         Returns:
             self: Xlsx object
         """
+        self._invalidate_indexes(datacol)
         for row, cell in enumerate(self.ws[datacol.upper()], 1):
-            if row < startrow or not cell.value or separator not in cell.value:
+            if row < startrow:
                 continue
-
             # Swap info and write back to cell
-            split_value = str(cell.value).split(separator)
-
-            self.ws[
-                f"{datacol.upper()}{row}"
-            ] = f"{split_value[1].strip()} {split_value[0].strip()}"
+            value = _reverse_text_value(cell.value, separator)
+            if value is not cell.value:
+                cell.value = value
 
         return self
 
+    @_requires_mode("rw")
+    def clean(
+        self, spec: dict, startrow: int = 1, stoprow: int = None, skip: list = None
+    ):
+        """Runs named cleaners over one or more columns in a single pass
+        and writes the cleaned values back to the cells (as str values).
+
+        Cleaners:
+            'digits': Remove everything but digits.
+            'alnum': Remove everything but letters and digits.
+            'whitespace': Collapse whitespace to single spaces and strip
+                the ends.
+            'strip:<chars>': Remove each of <chars>. ex: 'strip:$,'
+
+        Args:
+            spec (dict): {column letter: cleaner name or list of names run
+                in order}. ex: {'E': 'digits', 'B': ['whitespace', 'strip:*']}
+            startrow (int, optional): Excel row where values begin.
+                Defaults to 1.
+            stoprow (int, optional): Last Excel row to clean. Defaults to
+                None (last row of the sheet).
+            skip (list, optional): List of string values to leave as they
+                are (compared in lowercase). Defaults to None.
+
+        Returns:
+            self: Xlsx object
+        """
+        return _clean(self, spec, startrow, stoprow, skip)
+
+    @_requires_mode("rw")
     def remove_non_numbers(
-        self, datacol: str, startrow: int = 1, stoprow: int = None, skip: list = []
+        self, datacol: str, startrow: int = 1, stoprow: int = None, skip: list = None
     ):
         """Get values from a specified column that should contain only
         numbers. Remove any characters that are non-numbers and write
         the new values back to the cells (as a string value). If a list is
         passed to skip, check this list first before processing and skip
-        the cell if it matches an entry in the list.
+        the cell if it matches an entry in the list. Same as
+        clean({datacol: 'digits'}), except stoprow isn't changed.
 
         Args:
             datacol (str): Excel column with values to clean.
             startrow (int): Excel row where values begin.
-            stoprow (int, optional): Excel row to stop cleaning values.
-            Defaults to None.
+            stoprow (int, optional): Excel row to stop cleaning values
+            (not changed). Defaults to None.
             skip (list, optional): List of string values to skip if
-            found in the specified cells. Defaults to an empty list.
+            found in the specified cells. Defaults to None.
 
         Returns:
             self: Xlsx object
         """
-        for row, cell in enumerate(self.ws[f"{datacol.upper()}"], 1):
-            if stoprow and row == stoprow:
-                break
-            if row < startrow or not cell.value:
-                continue
-            if str(cell.value).lower() in skip:
-                continue
-            # Read and clean the data leaving only numbers
-            new_value = cell.value
-            for char in str(cell.value):
-                if char.isnumeric():
-                    continue
-                new_value = str(cell.value).replace(char, "")
-            # Replace cell value with new version
-            self.ws[f"{datacol.upper()}{row}"] = new_value
+        return _clean(
+            self, {datacol: "digits"}, startrow, stoprow - 1 if stoprow else None, skip
+        )
 
-        return self
+    @_requires_mode("rw")
+    def transform(self):
+        """Starts a plan of column cleaning steps that are run together in
+        a single pass over the rows, instead of one pass (and one lookup
+        of each cell) per method. Each step takes the same arguments as
+        the matching method and gives the same result as calling the
+        methods in the same order:
+
+            xl.transform().find_replace("B", {"N/A": ""}).digits_only(
+                "C", startrow=2
+            ).to_int("C", startrow=2).format_currency("E", startrow=2).run()
 
+        Steps: find_replace, digits_only (remove_non_numbers), to_int and
+        to_float (number_type_fix), reverse_text, move_values and
+        format_currency.
+
+        Returns:
+            Transform: Plan to add steps to. Call .run() to apply them
+            (returns the Xlsx object).
+        """
+        return Transform(self)
+
+    @_requires_mode("rw", "r")
     def get_matching_value(
         self, srchcol: str, srchval: str, retcol: str, startrow: int = 1
     ) -> str:
         """Search column for a value and return the corresponding value
-        from another column in the same row.
+        from another column in the same row. Matches cells containing
+        srchval, or, if the column has a lookup index (see build_index),
+        cells equal to it (exact) or starting with it (substring-prefix).
 
         Args:
             srchcol (str): Column letter to search for a value. ex: 'A'
@@ -451,13 +1026,22 @@ class Xlsx:
             str: Value from corresponding cell in the same row as search
                 value. Returns False if value search value is not found.
         """
-        for row, cell in enumerate(self.ws[srchcol.upper()], 1):
-            if row >= startrow and cell.value:
-                if srchval in str(cell.value):
-                    return self.ws[f"{retcol.upper()}{row}"].value
+        index = self._indexes.get(srchcol.upper())
+        if index:
+            row = index.first_row(srchval, startrow)
+            return False if row is None else index.value(self.ws, row, retcol)
+
+        mincol, maxcol, (srchidx, retidx) = _column_span(srchcol, retcol)
+        for row_data in self.ws.iter_rows(
+            min_row=startrow, min_col=mincol, max_col=maxcol, values_only=True
+        ):
+            value = row_data[srchidx]
+            if value and srchval in str(value):
+                return row_data[retidx]
 
         return False
 
+    @_requires_mode("rw", "r")
     def search_matching_value(self, header_srch_value: str, row_srch_value: str) -> str:
         """Searches cells by row for header search value and row search
         value, and returns corresponding cell value matching both as
@@ -473,21 +1057,22 @@ class Xlsx:
         """
         search_column, search_row = 0, 0
 
-        for row in self.ws.iter_rows():
-            for cell_number, cell_data in enumerate(row, 1):
-                if str(cell_data.value) == header_srch_value:
+        for row in self.ws.iter_rows(values_only=True):
+            for cell_number, value in enumerate(row, 1):
+                if str(value) == header_srch_value:
                     search_column += cell_number
 
-                if str(cell_data.value) == row_srch_value:
+                if str(value) == row_srch_value:
                     search_row = True
 
                 if search_row:
                     if cell_number == search_column:
-                        return str(cell_data.value)
+                        return str(value)
 
         # In case search isn't located.
         return False
 
+    @_requires_mode("rw")
     def verify_length(
         self,
         col: str,
@@ -496,9 +1081,14 @@ class Xlsx:
         skip: list = None,
         startrow: int = 1,
         stoprow: int = None,
+        conditional: bool = False,
     ):
         """Cycle through values in a column to verify their length marking
-        cells of an incorrect length with a background fill color.
+        cells of an incorrect length with a background fill color. With
+        conditional=True, a single conditional formatting rule
+        (LEN(cell)<>length) is added to the column range instead, so
+        Excel highlights the cells and no cells are visited or restyled.
+        Empty cells and cells holding 0 are never highlighted.
 
         Args:
             col (str): Column to search for values. ex: 'B'
@@ -506,37 +1096,67 @@ class Xlsx:
             fillcolor (str): Background fill color selection from COLORS
             dict.
             skip (list(str), optional): List of string values to skip
-            when evaluating. Defaults to None.
+            when evaluating (in any case). Defaults to None.
             startrow (int, optional): Starting row number where values
             begin. Defaults to 1.
             stoprow (int, optional): Ending row number where values end.
             Defaults to None.
+            conditional (bool, optional): Option to highlight with a
+            conditional formatting rule. Defaults to False.
 
         Returns:
             self: Xlsx object.
         """
         if not stoprow:
             stoprow = self.ws.max_row
-        if not skip:
-            skip = []
-        if COLORS.get(fillcolor.lower()):
-            for row, cell in enumerate(self.ws[col.upper()], 1):
-                if startrow <= row <= stoprow:
-                    if cell.value and str(cell.value).lower() not in skip:
-                        if len(str(cell.value)) != length:
-                            self.ws[f"{col.upper()}{row}"].fill = COLORS.get(
-                                fillcolor.lower()
-                            )
+        # Both modes compare the cell values in lowercase
+        skip = _skip_set(skip)
+        fill = get_fill(fillcolor)
+        if fill and conditional:
+            cell = f"{col.upper()}{startrow}"
+            # Like the per-cell check, empty cells and zeros are skipped
+            conditions = [f"LEN({cell})>0", f"{cell}<>0", f"LEN({cell})<>{length}"]
+            conditions += [
+                f"LOWER({cell})<>{_excel_string(value)}" for value in sorted(skip)
+            ]
+            _add_highlight_rule(
+                self.ws,
+                f"{cell}:{col.upper()}{stoprow}",
+                f"AND({','.join(conditions)})",
+                fillcolor,
+            )
+        elif fill:
+            _apply_styles(
+                self.ws,
+                (
+                    cell
+                    for row, cell in enumerate(self.ws[col.upper()], 1)
+                    if startrow <= row <= stoprow
+                    and cell.value
+                    and str(cell.value).lower() not in skip
+                    and len(str(cell.value)) != length
+                ),
+                fill=fill,
+            )
         else:
             print(f" Color '{fillcolor}' not available.")
 
         return self
 
+    @_requires_mode("rw")
     def find_and_highlight_rows(
-        self, col: str, srch: str, fillcolor: str = "red", startrow: int = 1
+        self,
+        col: str,
+        srch: str,
+        fillcolor: str = "red",
+        startrow: int = 1,
+        conditional: bool = False,
     ):
         """Search row for specified str value and fill entire row
-        with specified background fill color when found.
+        with specified background fill color when found. With
+        conditional=True, a single conditional formatting rule (a
+        case-insensitive text-contains test on the column) is added
+        over the rows instead, so no cells are visited or restyled.
 
         Args:
             col (str): Column to search for value. ex: 'B'
@@ -545,21 +1165,89 @@ class Xlsx:
                 dict.
             startrow (int, optional): Starting row number where values
                 begin. Defaults to 1.
+            conditional (bool, optional): Option to highlight with a
+                conditional formatting rule. Defaults to False.
 
         Returns:
             self: Xlsx object.
         """
-        if COLORS.get(fillcolor.lower()):
-            for row, cell in enumerate(self.ws[col.upper()], 1):
-                if row >= startrow:
-                    if cell.value and srch.lower() in str(cell.value).lower():
-                        for each in self.ws[f"{row}:{row}"]:
-                            each.fill = COLORS.get(fillcolor.lower())
+        fill = get_fill(fillcolor)
+        if fill and conditional:
+            # SEARCH is case-insensitive and treats ~ * ? as wildcards
+            pattern = srch.replace("~", "~~").replace("*", "~*").replace("?", "~?")
+            _add_highlight_rule(
+                self.ws,
+                f"A{startrow}:{get_column_letter(self.ws.max_column)}"
+                f"{max(self.ws.max_row, startrow)}",
+                f"ISNUMBER(SEARCH({_excel_string(pattern)},${col.upper()}{startrow}))",
+                fillcolor,
+            )
+        elif fill:
+            rows = [
+                row
+                for row, cell in enumerate(self.ws[col.upper()], 1)
+                if row >= startrow
+                and cell.value
+                and srch.lower() in str(cell.value).lower()
+            ]
+            _apply_styles(
+                self.ws,
+                (each for row in rows for each in self.ws[f"{row}:{row}"]),
+                fill=fill,
+            )
         else:
             print(f" Color '{fillcolor}' not available.")
 
         return self
 
+    @_requires_mode("rw")
+    def coerce(
+        self,
+        spec: dict,
+        startrow: int = 1,
+        stoprow: int = None,
+        report: bool = False,
+        highlight: str = None,
+    ):
+        """Converts the values of one or more columns to the passed types
+        in a single pass. Values that can't be converted are left as they
+        are and recorded, instead of stopping the conversion. Empty cells
+        are skipped. Parsed date strings are cached, so repeated dates
+        are only parsed once.
+
+        Args:
+            spec (dict): {column letter: type}, where type is int, float,
+                str, 'date' (MM/DD/YYYY strs) or 'date:<strptime format>',
+                or a function taking the cell value.
+                ex: {'C': int, 'D': float, 'E': 'date:%Y-%m-%d'}
+            startrow (int, optional): Starting row number where values
+                begin. Defaults to 1.
+            stoprow (int, optional): Last row number to convert. Defaults
+                to None (last row of the sheet).
+            report (bool, optional): Option to return the list of values
+                that couldn't be converted instead of the Xlsx object.
+                Defaults to False.
+            highlight (str, optional): Background fill color from COLORS
+                to set on cells that couldn't be converted. Defaults to None.
+
+        Returns:
+            self: Xlsx object, or list(CoerceFailure) with report=True.
+        """
+        failures = _coerce(self, spec, startrow, stoprow)
+        if highlight and failures:
+            fill = get_fill(highlight)
+            if fill:
+                _apply_styles(
+                    self.ws,
+                    (self.ws[failure.coordinate] for failure in failures),
+                    fill=fill,
+                )
+            else:
+                print(f" Color '{highlight}' not available.")
+
+        return failures if report else self
+
+    @_requires_mode("rw")
     def number_type_fix(self, col: str, numtype: str, startrow: int = 1):
         """Quick fix for cells that contain numbers formatted as
         text/str data. Cycle through cells replacing str formatted
@@ -575,33 +1263,46 @@ class Xlsx:
         Returns:
             self: Xlsx object.
         """
+        self._invalidate_indexes(col)
         for row, cell in enumerate(self.ws[col.upper()], 1):
-            if cell.value and row >= startrow:
-                if numtype.lower() == "i":
-                    self.ws[f"{col.upper()}{row}"] = int(cell.value)
-                if numtype.lower() == "f":
-                    self.ws[f"{col.upper()}{row}"] = float(cell.value)
+            if row >= startrow:
+                value = _number_value(cell.value, numtype)
+                if value is not cell.value:
+                    cell.value = value
 
         return self
 
-    def format_date(self, col: str, startrow: int = 1):
+    @_requires_mode("rw")
+    def format_date(self, col: str, startrow: int = 1, keep_dates: bool = False):
         """Format str date value to (MM/DD/YYYY).
 
         Args:
             col (str): Column containing date values.
             startrow (int, optional): Starting row number where values
                 begin. Defaults to 1.
+            keep_dates (bool, optional): Option to keep the date values
+                and only display them as MM/DD/YYYY, with a column number
+                format (see set_number_format with by_column) instead of
+                writing str values. Defaults to False.
 
         Returns:
             self: Xlsx object.
         """
+        if keep_dates:
+            return self.set_number_format(
+                col, DATE_NUMBER_FORMAT, startrow, by_column=True
+            )
+        self._invalidate_indexes(col)
         for row, cell in enumerate(self.ws[col.upper()], 1):
             if row >= startrow and cell.value:
-                self.ws[f"{col.upper()}{row}"] = cell.value.strftime("%m/%d/%Y")
+                self.ws[f"{col.upper()}{row}"] = cell.value.strftime(DATE_FORMAT)
 
         return self
 
-    def format_currency(self, col: str, startrow: int = 1, stoprow: int = None):
+    @_requires_mode("rw")
+    def format_currency(
+        self, col: str, startrow: int = 1, stoprow: int = None, by_column: bool = False
+    ):
         """Format str currency value to ($0,000.00).
 
         Args:
@@ -610,25 +1311,76 @@ class Xlsx:
             begin. Defaults to 1.
             stoprow (int, optional): Ending row where values stop.
             Defaults to None.
+            by_column (bool, optional): Option to set the format once for
+            the column instead of on each cell (see set_number_format).
+            Defaults to False.
 
         Returns:
             self: Xlsx object.
         """
+        if by_column:
+            return self.set_number_format(
+                col, CURRENCY_FORMAT, startrow, stoprow, by_column=True
+            )
         if not stoprow:
             stoprow = self.ws.max_row
 
         for row, cell in enumerate(self.ws[col.upper()], 1):
             if startrow <= row <= stoprow and cell.value:
-                cell.number_format = "$#,###.00"
+                cell.number_format = CURRENCY_FORMAT
 
         return self
 
+    @_requires_mode("rw")
+    def set_number_format(
+        self,
+        col: str,
+        number_format: str,
+        startrow: int = 1,
+        stoprow: int = None,
+        by_column: bool = False,
+    ):
+        """Set an Excel number format on a column, so the values are
+        displayed with it without being changed. The format is added to
+        the workbook once, and written as an id to each cell with a
+        value, since a cell's own style overrides its column's style.
+
+        With by_column=True, no cells are visited: a single conditional
+        formatting rule displays the column's cells (from startrow to
+        stoprow, or to the end of the sheet, including cells added later)
+        with the format. The cells keep their own number_format, which
+        is what openpyxl reads back, and column widths aren't changed.
+
+        Args:
+            col (str): Column letter to format. ex: 'E'
+            number_format (str): Excel number format.
+                ex: '$#,###.00', 'mm/dd/yyyy'
+            startrow (int, optional): Starting row number where values
+                begin. Defaults to 1.
+            stoprow (int, optional): Last row number to format. Defaults
+                to None (whole column).
+            by_column (bool, optional): Option to format the column with
+                a conditional formatting rule instead of each cell.
+                Defaults to False.
+
+        Returns:
+            self: Xlsx object.
+        """
+        if by_column:
+            _add_number_format_rule(self.ws, col, number_format, startrow, stoprow)
+        else:
+            _format_column(self.ws, col, number_format, startrow, stoprow or None)
+
+        return self
+
+    @_requires_mode("rw", "w")
     def set_cell_size(self, pairs: dict):
         """Selects rows and columns and adjusts their sizes using a
         dictionary of pairs of rows or columns along with corresponding
         height or width to adjust the size of cells from each pair. If
         dict key is type: str, adjusts column width. If dict key is
-        type: int, adjusts row height.
+        type: int, adjusts row height. On write-only objects, column
+        widths must be set before the first row is written.
 
         Args:
             pairs (dict): Dictionary of column/row keys with target size
@@ -638,6 +1390,11 @@ class Xlsx:
             self: Xlsx object.
         """
         for target, size in pairs.items():
+            if type(target) == str and self.mode == "w" and self._rows_written:
+                raise io.UnsupportedOperation(
+                    "Column widths must be set before any rows are written "
+                    "in write-only mode."
+                )
             if type(target) == str:
                 self.ws.column_dimensions[target.upper()].width = size
             elif type(target) == int:
@@ -648,6 +1405,7 @@ class Xlsx:
 
         return self
 
+    @_requires_mode("rw")
     def set_bold_rows(self, startrow: int = 1, stoprow: int = 0):
         """Sets all cells in specified rows to bold beginning at startrow
         and ending just before stoprow (if passed). Sets all cells below
@@ -663,27 +1421,25 @@ class Xlsx:
         Returns:
             self: Xlsx object.
         """
-        for row_number, row in enumerate(self.ws.iter_rows(), 1):
-            if row_number < startrow:
-                continue
-            if stoprow and row_number == stoprow:
-                break
-            for cell in row:
-                cell.font = Font(bold=True)
+        _apply_styles(
+            self.ws, _row_cells(self.ws, startrow, stoprow), font=get_font(bold=True)
+        )
 
         return self
 
+    @_requires_mode("rw")
     def highlight_rows(
         self,
         startrow: int = 1,
         stoprow: int = 0,
         fillcolor: str = "gray",
         alternate: bool = False,
+        conditional: bool = False,
     ):
         """Highlights specified rows (optionally alternating) using passed
-        color (from xlclass.COLORS dict) starting at startrow and ending
-        just before stoprow. Highlights all remaining rows if stoprow is
-        not passed.
+        color (from xlclass.COLORS dict, or a hex color) starting at
+        startrow and ending just before stoprow. Highlights all remaining
+        rows if stoprow is not passed.
 
         Args:
             startrow (int, optional): Row number where highlighting should
@@ -694,30 +1450,43 @@ class Xlsx:
             dictionary to be used as fill color. Defaults to 'gray'.
             alternate (bool, optional): Option to alternate rows to
             highlight. Defaults to False.
+            conditional (bool, optional): Option to highlight with a
+            single conditional formatting rule (a banding formula when
+            alternating) instead of filling each cell. Defaults to False.
 
         Returns:
             self: Xlsx object.
         """
-        if not COLORS.get(fillcolor.lower()):
+        fill = get_fill(fillcolor)
+        if not fill:
             print(f"Color: '{fillcolor}' not available.")
             return self
 
-        highlight_row = startrow
-        for row_number, row in enumerate(self.ws.iter_rows(), 1):
-            if row_number < startrow:
-                continue
-            if row_number == stoprow:
-                break
-            if row_number == highlight_row:
-                for cell in row:
-                    cell.fill = COLORS.get(fillcolor.lower())
-                if not alternate:
-                    highlight_row += 1
-                else:
-                    highlight_row += 2
+        if conditional:
+            lastrow = stoprow - 1 if stoprow else max(self.ws.max_row, startrow)
+            if lastrow >= startrow:
+                _add_highlight_rule(
+                    self.ws,
+                    f"A{startrow}:{get_column_letter(self.ws.max_column)}{lastrow}",
+                    f"MOD(ROW()-{startrow},2)=0" if alternate else "TRUE",
+                    fillcolor,
+                )
+            return self
+
+        step = 2 if alternate else 1
+        _apply_styles(
+            self.ws,
+            (
+                cell
+                for cell in _row_cells(self.ws, startrow, stoprow)
+                if (cell.row - startrow) % step == 0
+            ),
+            fill=fill,
+        )
 
         return self
 
+    @_requires_mode("rw")
     def set_sheet_font_style(self, fontname: str = "Arial", size: int = 8):
         """Sets all cells to specified font name and size.
         *Overrides any other font style settings in selected cells.
@@ -729,12 +1498,13 @@ class Xlsx:
         Returns:
             self: Xlsx object.
         """
-        for row in self.ws.iter_rows():
-            for cell in row:
-                cell.font = Font(name=fontname, size=str(size))
+        _apply_styles(
+            self.ws, _row_cells(self.ws), font=get_font(name=fontname, size=size)
+        )
 
         return self
 
+    @_requires_mode("rw")
     def add_cell_borders(self, startrow: int = 1, stoprow: int = 0):
         """Set thin cell borders around all populated cells beginning at
         startrow and ending at stoprow. If no stoprow is passed, borders
@@ -749,21 +1519,59 @@ class Xlsx:
         Returns:
             self: Xlsx object
         """
-        for row_num, row_data in enumerate(self.ws.iter_rows(), 1):
-            if row_num < startrow:
-                continue
-            if stoprow and row_num == stoprow:
-                break
-            for cell in row_data:
-                cell.border = Border(
-                    left=Side(style="thin"),
-                    right=Side(style="thin"),
-                    top=Side(style="thin"),
-                    bottom=Side(style="thin"),
-                )
+        _apply_styles(
+            self.ws, _row_cells(self.ws, startrow, stoprow), border=get_border("thin")
+        )
+
+        return self
+
+    @_requires_mode("rw")
+    def apply_styles(
+        self,
+        startrow: int = 1,
+        stoprow: int = 0,
+        font: object = None,
+        fill: object = None,
+        border: object = None,
+    ):
+        """Applies a font, background fill and/or border to all populated
+        cells beginning at startrow and ending just before stoprow (all
+        remaining rows if stoprow isn't passed). Each style is registered
+        with the workbook once and shared by every cell in the range.
+
+        Args:
+            startrow (int, optional): Row number where styling should
+            begin. Defaults to 1.
+            stoprow (int, optional): Row number (not included) where
+            styling should end. Defaults to 0.
+            font (openpyxl.styles.Font, optional): Font to set. ex:
+            xlclass.styles.get_font(bold=True) Defaults to None.
+            fill (str/openpyxl.styles.PatternFill, optional): COLORS name,
+            hex color ('FF0000') or fill to set. Defaults to None.
+            border (str/openpyxl.styles.Border, optional): Side style
+            ('thin', 'thick', etc.) or border to set. Defaults to None.
+
+        Returns:
+            self: Xlsx object.
+        """
+        if isinstance(fill, str):
+            if not get_fill(fill):
+                print(f"Color: '{fill}' not available.")
+                return self
+            fill = get_fill(fill)
+        if isinstance(border, str):
+            border = get_border(border)
+        _apply_styles(
+            self.ws,
+            _row_cells(self.ws, startrow, stoprow),
+            font=font,
+            fill=fill,
+            border=border,
+        )
 
         return self
 
+    @_requires_mode("rw", "r")
     def generate_dictionary(
         self,
         datacols: list,
@@ -796,26 +1604,92 @@ class Xlsx:
             dict: Dictionary generated from the data in the spreadsheet.
                 {key: {header: value}}
         """
-        data = {}
-        keycolumn = keycol if keycol else "A"
-        datastart = hdrrow + 1 if not datastartrow else datastartrow
+        return {
+            record.key: record.as_dict()
+            for record in self.iter_records(datacols, keycol, hdrrow, datastartrow)
+        }
 
-        for row, cell in enumerate(self.ws[keycolumn.upper()], 1):
-            keys = cell.value if keycol else f"{row:0>4}"
-            if row >= datastart and keys:
-                data[keys] = {
-                    self.ws[f"{ea.upper()}{hdrrow}"]
-                    .value: self.ws[f"{ea.upper()}{row}"]
-                    .value
-                    for ea in datacols
-                }
+    @_requires_mode("rw", "r")
+    def iter_records(
+        self,
+        datacols: list = None,
+        keycol: str = None,
+        hdrrow: int = 1,
+        datastartrow: int = None,
+    ):
+        """Reads the header row once and then streams the data rows,
+        yielding one lightweight Record for each row. Only the span of
+        columns containing datacols/keycol is read from the sheet. Rows
+        without a value in *keycol* are skipped. If *keycol* is not
+        specified, a 4-digit string of the row number is used for each
+        key. ex: '0005'. Raises ValueError if hdrrow is past the end of
+        the sheet. Columns without a header get None as their header.
 
-        return data
+        Args:
+            datacols (list, optional): List of string column letters
+                where needed data is located. Defaults to None (all
+                columns).
+            keycol (str, optional): Column letter where the data that
+                will be used as the record keys is located. Defaults to
+                None.
+            hdrrow (int, optional) Row number containing the headers in
+                the spreadsheet. Defaults to 1.
+            datastartrow (int, optional) Row number where the needed
+                data starts. If not specified, data will be read from
+                header row + 1. Defaults to None.
 
+        Yields:
+            Record: record.key, record.row, record.values and
+                record["Header"] access to each row's values.
+        """
+        datastart = hdrrow + 1 if not datastartrow else datastartrow
+        if datacols:
+            mincol, maxcol, indexes = _column_span(keycol or "A", *datacols)
+            keyidx, dataidxs = indexes[0], indexes[1:]
+        else:
+            keyidx = column_index_from_string((keycol or "A").upper()) - 1
+            mincol, maxcol = 1, max(keyidx + 1, self.ws.max_column or 0)
+            dataidxs = None
+
+        # Read the header row once
+        if hdrrow > (self.ws.max_row or hdrrow):
+            raise ValueError(f"Header row {hdrrow} is below the last row of the sheet.")
+        header_row = None
+        for row_data in self.ws.iter_rows(
+            min_row=hdrrow, max_row=hdrrow, min_col=mincol, max_col=maxcol,
+            values_only=True,
+        ):
+            header_row = row_data
+        if header_row is None:
+            raise ValueError(f"Header row {hdrrow} couldn't be read from the sheet.")
+        # Columns missing from the end of the header row have no header
+        header_row += (None,) * (maxcol - mincol + 1 - len(header_row))
+        if dataidxs is None:
+            dataidxs = range(len(header_row))
+            maxcol = max(maxcol, len(header_row))
+        headers = tuple(header_row[idx] for idx in dataidxs)
+        positions = {header: position for position, header in enumerate(headers)}
+
+        for row, row_data in enumerate(
+            self.ws.iter_rows(
+                min_row=datastart, min_col=mincol, max_col=maxcol,
+                values_only=True,
+            ),
+            datastart,
+        ):
+            key = row_data[keyidx] if keycol else f"{row:0>4}"
+            if key:
+                yield Record(
+                    key, row, tuple(row_data[idx] for idx in dataidxs),
+                    headers, positions,
+                )
+
+    @_requires_mode("rw", "r")
     def generate_list(self, startrow: int = 1, stoprow: int = None) -> list:
         """Generates a list of lists containing all cell values from
         startrow to stoprow (inclusive). (Use _list.pop(0) on returned
-        list to get a separate headers list if present/needed.)
+        list to get a separate headers list if present/needed.) See
+        iter_rows_chunked to read large sheets in bounded memory.
 
         Args:
             startrow (int, optional): First row to pull data from to
@@ -827,28 +1701,220 @@ class Xlsx:
         Returns:
             list: List of lists containing the values read from cells.
         """
-        row_data = []
-        for row in self.ws.iter_rows(min_row=startrow, max_row=stoprow):
-            row_data.append([cell.value for cell in row])
+        return [
+            list(row)
+            for row in self.ws.iter_rows(
+                min_row=startrow, max_row=stoprow, values_only=True
+            )
+        ]
+
+    @_requires_mode("rw", "r")
+    def iter_rows_chunked(
+        self,
+        startrow: int = 1,
+        stoprow: int = None,
+        chunk_size: int = 10_000,
+        columns: list = None,
+        as_columns: bool = False,
+    ):
+        """Reads cell values from startrow to stoprow (inclusive) and
+        yields them in chunks of up to chunk_size rows, so large sheets
+        can be consumed with bounded memory. Values are read with
+        iter_rows(values_only=True), without building lists of Cells.
 
-        return row_data
+        Each chunk is a list of value tuples, one for each row. If
+        as_columns is True, each chunk is instead a dictionary of
+        {column letter: column values}, where all-int and all-float
+        columns are packed into compact array.array objects and other
+        columns are tuples.
 
+        Args:
+            startrow (int, optional): First row to read. Defaults to 1.
+            stoprow (int, optional): Last row to read. Defaults to None
+                (all rows after startrow).
+            chunk_size (int, optional): Maximum number of rows in each
+                chunk. Defaults to 10_000.
+            columns (list, optional): Column letters to read, in the
+                order they should be returned. ex: ['C', 'A'] Defaults
+                to None (all columns).
+            as_columns (bool, optional): Option to yield column arrays
+                instead of row tuples. Defaults to False.
+
+        Yields:
+            list/dict: Chunk of row tuples or {column: values} arrays.
+        """
+        letters = None
+        if columns:
+            mincol, maxcol, positions = _column_span(*columns)
+            letters = [column.upper() for column in columns]
+        else:
+            mincol, maxcol, positions = 1, None, None
+        rows = self.ws.iter_rows(
+            min_row=startrow, max_row=stoprow, min_col=mincol, max_col=maxcol,
+            values_only=True,
+        )
+        if positions and len(positions) > 1:
+            rows = map(operator.itemgetter(*positions), rows)
+        elif positions:
+            # A slice keeps single column rows as tuples
+            position = positions[0]
+            rows = map(operator.itemgetter(slice(position, position + 1)), rows)
+
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            if not as_columns:
+                yield chunk
+                continue
+            chunk_letters = letters or [
+                get_column_letter(number)
+                for number in range(1, max(map(len, chunk)) + 1)
+            ]
+            yield {
+                letter: _pack_column(values)
+                for letter, values in zip(chunk_letters, zip_longest(*chunk))
+            }
+
+    @_requires_mode("rw", "r")
+    def to_csv(
+        self,
+        path: str,
+        columns: list = None,
+        startrow: int = 1,
+        stoprow: int = None,
+        chunk_size: int = 10_000,
+        delimiter: str = ",",
+        date_format: str = DATE_FORMAT,
+        encoding: str = None,
+    ):
+        """Write cell values to a csv (or tsv) file. Rows are read and
+        written chunk_size rows at a time, so the sheet is never held in
+        memory, and read-only objects can be exported. Dates are written
+        in the same format as format_date (MM/DD/YYYY) by default.
+
+        Args:
+            path (str/pathlib.Path): Path of the csv file to write.
+            columns (list, optional): Column letters to write, in the
+                order to write them. ex: ['C', 'A'] Defaults to None (all
+                columns).
+            startrow (int, optional): First row to write. Defaults to 1.
+            stoprow (int, optional): Last row to write. Defaults to None
+                (all rows after startrow).
+            chunk_size (int, optional): Number of rows read at a time.
+                Defaults to 10_000.
+            delimiter (str, optional): Field delimiter. Pass '\\t' to
+                write a tsv file. Defaults to ','.
+            date_format (str, optional): strftime format for date values.
+                Defaults to DATE_FORMAT ('%m/%d/%Y').
+            encoding (str, optional): File encoding. Defaults to None
+                (platform default).
+
+        Returns:
+            self: Xlsx object.
+        """
+        _write_csv(
+            self,
+            path,
+            columns=columns,
+            startrow=startrow,
+            stoprow=stoprow,
+            chunk_size=chunk_size,
+            delimiter=delimiter,
+            date_format=date_format,
+            encoding=encoding,
+        )
+
+        return self
+
+    @_requires_mode("rw", "r")
+    def to_columns(
+        self,
+        columns: list,
+        dtypes: dict = None,
+        startrow: int = 1,
+        stoprow: int = None,
+    ) -> dict:
+        """Reads the passed columns in a single pass and returns them as
+        typed NumPy masked arrays, ready for vectorized math. Each
+        column's type is inferred from its values unless set in dtypes:
+        int (ints/int strings), float (numbers/number strings), datetime
+        (datetimes/dates/MM/DD/YYYY strings) or object (anything else),
+        following the same conversions as number_type_fix and
+        format_date. Empty cells are masked. (Requires NumPy.)
+
+        Args:
+            columns (list): Column letters to read. ex: ['C', 'E']
+            dtypes (dict, optional): {column: type} overrides, where
+                type is 'int', 'float', 'datetime' or 'object'.
+                Defaults to None.
+            startrow (int, optional): First row to read. Pass the row
+                below the headers to skip them. Defaults to 1.
+            stoprow (int, optional): Last row to read. Defaults to None.
+
+        Returns:
+            dict: {column letter: numpy.ma.MaskedArray}
+        """
+        from .columns import _to_columns
+
+        return _to_columns(self, columns, dtypes, startrow, stoprow)
+
+    @classmethod
+    def from_columns(cls, columns: dict, headers: dict = None, startrow: int = 1):
+        """Creates a new Xlsx object from a dictionary of column arrays
+        (as returned by to_columns). Arrays are converted to Python
+        values in bulk and written row by row. Masked values, NaN and
+        NaT are left as empty cells. (Requires NumPy.)
+
+        Args:
+            columns (dict): {column letter: numpy array or sequence}
+            headers (dict, optional): {column letter: header} to write
+                above the data. Defaults to None.
+            startrow (int, optional): First row to write (headers or
+                data). Defaults to 1.
+
+        Returns:
+            Xlsx: New Xlsx object containing the data.
+        """
+        from .columns import _from_columns
+
+        xl = cls()
+        _from_columns(xl, columns, headers, startrow)
+
+        return xl
+
+    @_requires_mode("rw", "w")
     def write_dictionary_to_sheet(
-        self, data_dict: dict, header_row: int = None, start_row: int = None
+        self,
+        data_dict: dict,
+        header_row: int = None,
+        start_row: int = None,
+        bold: bool = False,
+        headers: list = None,
     ):
         """Receives a nested dictionary:
         {"Row1": {"Key/Header": Value, "Key/Header": Value,},}
+        or an iterable/generator of ("Row1", {"Key/Header": Value}) pairs.
         Writes the headers and row data to the Xlsx object.
         If no header_row is passed, the default will be row 1
         and the default start_row will be the header_row+1.
 
             Args:
                 xlsx (Xlsx): Xlsx object to write data to.
-                data_dict (dict): Nested dictionary with data to write to Xlsx.
+                data_dict (dict/iterable): Nested dictionary, or iterable
+                of (key, row_dict) pairs, with data to write to Xlsx.
                 header_row (int, optional): Row number to write headers. Defaults to None.
                 start_row (int, optional): Row number to start writing data. Defaults to None.
+                bold (bool, optional): Option to bold the headers. Defaults to False.
+                headers (list, optional): Ordered list of headers to
+                write. Defaults to None (headers are read from the data).
         """
         _write_dictionary_to_sheet(
-            xlsx=self, data_dict=data_dict, header_row=header_row, start_row=start_row
+            xlsx=self,
+            data_dict=data_dict,
+            header_row=header_row,
+            start_row=start_row,
+            bold=bold,
+            headers=headers,
         )
         return self